@@ -0,0 +1,315 @@
+import numpy as np
+import pandas as pd
+
+from filters import filter_state_hash
+
+# Pseudo-question de la table des comptages : nombre de répondants de la cellule
+RESPONDENTS = "__respondents__"
+
+
+class Aggregator:
+    """
+    Agrégation en une passe de toutes les questions d'un jeu de données.
+
+    Chaque modalité (question à choix unique, option de question à réponses
+    multiples, couple de modalités d'un tableau croisé) reçoit un code global.
+    Les comptages d'un état des filtres se réduisent alors à un seul
+    np.bincount sur les codes des lignes retenues.
+    """
+
+    def __init__(self, df, columns, answers=None, crosstabs=()):
+        self.n_rows = len(df)
+        self.version = df.attrs.get("version")
+        self._slices = {}
+        size = 0
+
+        # Questions à choix unique et tableaux croisés : un code par ligne et par bloc
+        blocks = []
+        categoricals = {}
+        for column in columns:
+            values = df[column]
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype("category")
+            categoricals[column] = values
+            codes = values.cat.codes.to_numpy().astype(np.int64)
+            blocks.append(np.where(codes >= 0, codes + size, -1))
+            self._slices[column] = (size, values.cat.categories)
+            size += len(values.cat.categories)
+
+        for index, column in crosstabs:
+            rows_labels = categoricals[index].cat.categories
+            columns_labels = categoricals[column].cat.categories
+            codes_a = categoricals[index].cat.codes.to_numpy().astype(np.int64)
+            codes_b = categoricals[column].cat.codes.to_numpy().astype(np.int64)
+            pair = codes_a * len(columns_labels) + codes_b + size
+            blocks.append(np.where((codes_a >= 0) & (codes_b >= 0), pair, -1))
+            self._slices[(index, column)] = (size, (rows_labels, columns_labels))
+            size += len(rows_labels) * len(columns_labels)
+
+        if blocks:
+            self._row_codes = np.stack(blocks, axis=1)
+        else:
+            self._row_codes = np.empty((self.n_rows, 0), dtype=np.int64)
+
+        # Questions à réponses multiples : un code par sélection
+        respondents, option_codes = [], []
+        if answers is not None:
+            for question in answers.questions:
+                question_respondents, codes = answers.question_codes(question)
+                labels, local = np.unique(codes, return_inverse=True)
+                respondents.append(question_respondents)
+                option_codes.append(local.astype(np.int64) + size)
+                self._slices[question] = (size, answers.options[labels])
+                size += len(labels)
+        self._multi_respondents = np.concatenate(respondents or [np.empty(0, int)])
+        self._multi_codes = np.concatenate(option_codes or [np.empty(0, int)])
+        self.size = size
+
+    def __contains__(self, column):
+        return column in self._slices
+
+    def aggregate_by(self, groups, n_groups):
+        """
+        Comptages de toutes les modalités pour chaque groupe de lignes.
+
+        groups : numéro de groupe (0 à n_groups - 1) de chaque ligne.
+        Retourne une matrice (n_groups, size).
+        """
+        groups = np.asarray(groups, dtype=np.int64)
+        offsets = groups * self.size
+        single = (self._row_codes + offsets[:, np.newaxis])[self._row_codes >= 0]
+        multi = offsets[self._multi_respondents] + self._multi_codes
+        totals = np.bincount(
+            np.concatenate([single, multi]), minlength=n_groups * self.size
+        )
+        return totals.reshape(n_groups, self.size)
+
+    def count_table(self, dimensions):
+        """
+        Table longue des comptages par cellule des dimensions.
+
+        dimensions : DataFrame des colonnes de filtre, aligné sur les lignes.
+        Retourne une ligne par (cellule, question, option) non nulle, plus une
+        ligne RESPONDENTS par cellule portant son nombre de répondants.
+        """
+        columns = list(dimensions.columns)
+        groups = (
+            dimensions.groupby(columns, observed=True, dropna=False, sort=False)
+            .ngroup()
+            .to_numpy()
+        )
+        n_groups = int(groups.max()) + 1 if len(groups) else 0
+        _, first = np.unique(groups, return_index=True)
+        cells = dimensions.iloc[first].reset_index(drop=True)
+        for column in columns:
+            cells[column] = cells[column].astype(object)
+
+        matrix = self.aggregate_by(groups, n_groups)
+        frames = [
+            cells.assign(
+                question=RESPONDENTS,
+                option="",
+                count=np.bincount(groups, minlength=n_groups),
+            )
+        ]
+        for question, (start, labels) in self._slices.items():
+            if isinstance(question, tuple):
+                continue
+            cell, slot = np.nonzero(matrix[:, start : start + len(labels)])
+            frames.append(
+                cells.iloc[cell]
+                .reset_index(drop=True)
+                .assign(
+                    question=question,
+                    option=np.asarray(labels, dtype=object)[slot].astype(str),
+                    count=matrix[cell, start + slot],
+                )
+            )
+        table = pd.concat(frames, ignore_index=True)
+        table["count"] = table["count"].astype(np.int64)
+        return table
+
+    def aggregate(self, rows=None):
+        """
+        Compte toutes les modalités pour les positions rows (toutes si None).
+        """
+        if rows is None:
+            single = self._row_codes.ravel()
+            multi = self._multi_codes
+            n_respondents = self.n_rows
+        else:
+            rows = np.asarray(rows, dtype=np.int64)
+            single = self._row_codes[rows].ravel()
+            selected = np.zeros(self.n_rows, dtype=bool)
+            selected[rows] = True
+            multi = self._multi_codes[selected[self._multi_respondents]]
+            n_respondents = len(rows)
+
+        codes = np.concatenate([single, multi])
+        totals = np.bincount(codes[codes >= 0], minlength=self.size)
+        return AggregateCounts(
+            self, totals, n_respondents, filter_state_hash(rows, self.n_rows)
+        )
+
+
+class CountCube:
+    """
+    Cube de comptages précalculé sur les dimensions de filtre.
+
+    Chaque cellule (combinaison de valeurs des dimensions) porte le comptage de
+    toutes les modalités. Une sélection de la barre latérale se réduit à la
+    somme des cellules retenues : le coût ne dépend pas du nombre de répondants.
+    """
+
+    def __init__(self, table, dimensions, crosstabs=(), version=None):
+        self.dimensions = list(dimensions)
+        self.version = version
+        self._slices = {}
+
+        groups = (
+            table.groupby(self.dimensions, observed=True, dropna=False, sort=False)
+            .ngroup()
+            .to_numpy()
+        )
+        self.n_cells = int(groups.max()) + 1 if len(groups) else 0
+        _, first = np.unique(groups, return_index=True)
+        cells = table[self.dimensions].iloc[first].reset_index(drop=True)
+        self._cell_values = {
+            column: cells[column].to_numpy(dtype=object) for column in self.dimensions
+        }
+
+        # Emplacements (question, option), dans l'ordre d'apparition des questions
+        is_total = (table["question"] == RESPONDENTS).to_numpy()
+        self._respondents = np.bincount(
+            groups[is_total],
+            weights=table["count"].to_numpy()[is_total],
+            minlength=self.n_cells,
+        ).astype(np.int64)
+        counts = table.loc[~is_total]
+        slot_codes = np.empty(len(counts), dtype=np.int64)
+        size = 0
+        for question, positions in counts.groupby(
+            "question", sort=False
+        ).indices.items():
+            labels, local = np.unique(
+                counts["option"].to_numpy()[positions], return_inverse=True
+            )
+            slot_codes[positions] = local + size
+            self._slices[question] = (size, pd.Index(labels))
+            size += len(labels)
+
+        # Tableaux croisés de deux dimensions, déduits des répondants par cellule
+        crosstab_codes = []
+        for index, column in crosstabs:
+            rows_codes, rows_labels = pd.factorize(cells[index], sort=True)
+            columns_codes, columns_labels = pd.factorize(cells[column], sort=True)
+            pair = rows_codes * len(columns_labels) + columns_codes + size
+            crosstab_codes.append(
+                np.where((rows_codes >= 0) & (columns_codes >= 0), pair, -1)
+            )
+            self._slices[(index, column)] = (size, (rows_labels, columns_labels))
+            size += len(rows_labels) * len(columns_labels)
+        self.size = size
+
+        self._matrix = np.zeros((self.n_cells, size), dtype=np.int64)
+        np.add.at(
+            self._matrix,
+            (groups[~is_total], slot_codes),
+            counts["count"].to_numpy(dtype=np.int64),
+        )
+        cell_ids = np.arange(self.n_cells)
+        for codes in crosstab_codes:
+            valid = codes >= 0
+            self._matrix[cell_ids[valid], codes[valid]] += self._respondents[valid]
+
+    def __contains__(self, column):
+        return column in self._slices
+
+    def cell_mask(self, selections):
+        """
+        Masque des cellules retenues ; même convention que FilterEngine.packed_mask.
+        """
+        mask = np.ones(self.n_cells, dtype=bool)
+        for column, selected in selections.items():
+            if column in self._cell_values:
+                mask &= (
+                    pd.Series(self._cell_values[column]).isin(list(selected)).to_numpy()
+                )
+        return mask
+
+    def query(self, selections):
+        """
+        Comptages de toutes les questions pour une sélection {colonne: valeurs}.
+        """
+        mask = self.cell_mask(selections)
+        totals = self._matrix[mask].sum(axis=0)
+        filter_key = ("cube", filter_state_hash(np.flatnonzero(mask), self.n_cells))
+        return AggregateCounts(
+            self, totals, int(self._respondents[mask].sum()), filter_key
+        )
+
+
+class AggregateCounts:
+    """
+    Résultat compact d'une agrégation pour un état des filtres.
+    """
+
+    def __init__(self, aggregator, totals, n_respondents, filter_key):
+        self._aggregator = aggregator
+        self.totals = totals
+        self.n_respondents = n_respondents
+        self.version = aggregator.version
+        self.filter_key = filter_key
+
+    def __contains__(self, column):
+        return column in self._aggregator
+
+    def positions(self, column, labels):
+        """
+        Indices des modalités labels dans totals (-1 si la modalité n'est pas comptée).
+        """
+        if column not in self:
+            return np.full(len(labels), -1)
+        start, known = self._aggregator._slices[column]
+        index = pd.Index(known).get_indexer(labels)
+        return np.where(index >= 0, index + start, -1)
+
+    def slice(self, column):
+        """
+        (début, nombre de modalités) d'une question dans totals.
+        """
+        start, labels = self._aggregator._slices[column]
+        return start, len(labels)
+
+    def labels(self, column):
+        """
+        Modalités d'une question, dans l'ordre de totals.
+        """
+        return self._aggregator._slices[column][1]
+
+    def counts(self, column):
+        """
+        Comptages non nuls d'une question, triés par ordre décroissant.
+        """
+        start, labels = self._aggregator._slices[column]
+        counts = self.totals[start : start + len(labels)]
+        value_counts = pd.Series(counts, index=pd.Index(labels, name=column))
+        value_counts = value_counts.sort_values(ascending=False, kind="stable")
+        return value_counts[value_counts > 0]
+
+    def crosstab(self, index, columns):
+        """
+        Tableau croisé index x columns, sans lignes ni colonnes vides.
+        """
+        start, (rows_labels, columns_labels) = self._aggregator._slices[
+            (index, columns)
+        ]
+        size = len(rows_labels) * len(columns_labels)
+        table = pd.DataFrame(
+            self.totals[start : start + size].reshape(
+                len(rows_labels), len(columns_labels)
+            ),
+            index=pd.Index(rows_labels, name=index),
+            columns=pd.Index(columns_labels, name=columns),
+        )
+        return table.loc[table.sum(axis=1) > 0, table.sum(axis=0) > 0]
@@ -0,0 +1,172 @@
+"""
+Générateur de questionnaires synthétiques, fidèles au schéma des CSV réels.
+
+Chaque colonne est tirée selon sa distribution observée dans Data/. Les
+colonnes liées (établissement, classe / âge) sont tirées ensemble. Les
+réponses multiples sont recomposées à partir du catalogue des options, avec
+le nombre de choix et la fréquence de chaque option observés ; les options
+contenant une virgule sont parfois écrites entre guillemets.
+
+Usage : python benchmarks/generate_survey.py --rows 10000 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from multi_answers import split_answers
+from questionnaire import MULTI_CHOICE_OPTIONS
+
+SOURCE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data"
+)
+OUTPUT_DIR = os.path.join(SOURCE_DIR, "synthetic")
+
+SOURCES = {
+    "profs": {"file": "profs.csv", "index_col": 0},
+    "eleves": {"file": "eleves.csv", "index_col": None},
+}
+
+# Colonnes tirées ensemble (une ligne réelle par groupe) pour rester cohérentes
+JOINT_COLUMNS = {
+    "profs": [
+        "UAI",
+        "Nom_etab",
+        "Adresse",
+        "Code postal",
+        "Nom_commune",
+        "Contrat",
+        "Type_etab",
+        "Code_departement",
+        "Departement",
+        "Mail_etab",
+        "Telephone",
+        "latitude",
+        "longitude",
+    ],
+    "eleves": ["Classe", "Age"],
+}
+
+# Part des options contenant le séparateur écrites entre guillemets
+QUOTED_RATIO = 0.5
+
+
+def read_source(name):
+    """
+    Lit le CSV réel servant de modèle.
+    """
+    source = SOURCES[name]
+    return pd.read_csv(
+        os.path.join(SOURCE_DIR, source["file"]), index_col=source["index_col"]
+    )
+
+
+def sample_column(values, n_rows, rng):
+    """
+    Tire n_rows valeurs selon la distribution observée (valeurs manquantes comprises).
+    """
+    return values.to_numpy()[rng.integers(0, len(values), n_rows)]
+
+
+def sample_multi_answers(values, options, n_rows, rng, separator=","):
+    """
+    Recompose des réponses multiples réalistes.
+
+    Le nombre de choix par répondant et la fréquence des options suivent les
+    réponses observées ; les options sont tirées sans remise.
+    """
+    parts = split_answers(values, separator, options)
+    pool = pd.Index(list(options)).append(pd.Index(parts.unique())).unique()
+    weights = parts.value_counts().reindex(pool, fill_value=0).to_numpy() + 1.0
+    log_weights = np.log(weights / weights.sum())
+
+    # Nombre de choix par ligne, 0 pour une réponse manquante
+    n_choices = parts.groupby(level=0).size().reindex(values.index, fill_value=0)
+    k = sample_column(n_choices, n_rows, rng).clip(max=len(pool))
+    quoted = rng.random(n_rows) < QUOTED_RATIO
+
+    labels = pool.to_numpy(dtype=object)
+    needs_quotes = np.array([separator in label for label in labels])
+    result = np.full(n_rows, np.nan, dtype=object)
+    for size in np.unique(k[k > 0]):
+        rows = np.flatnonzero(k == size)
+        # Tirage pondéré sans remise : les size plus grandes clés de Gumbel
+        keys = log_weights + rng.gumbel(size=(len(rows), len(pool)))
+        chosen = np.argsort(-keys, axis=1)[:, :size]
+        combos, inverse = np.unique(
+            np.column_stack([chosen, quoted[rows]]), axis=0, return_inverse=True
+        )
+        strings = np.array(
+            [
+                f"{separator} ".join(
+                    f'"{labels[i]}"' if quote and needs_quotes[i] else labels[i]
+                    for i in combo[:-1]
+                )
+                for combo, quote in zip(combos, combos[:, -1])
+            ],
+            dtype=object,
+        )
+        result[rows] = strings[inverse.ravel()]
+    return result
+
+
+def generate(name, n_rows, seed=0):
+    """
+    Génère un DataFrame synthétique de n_rows lignes au schéma du CSV réel.
+    """
+    rng = np.random.default_rng(seed)
+    source = read_source(name)
+    options = MULTI_CHOICE_OPTIONS[name]
+
+    columns = {}
+    joint = [column for column in JOINT_COLUMNS[name] if column in source.columns]
+    picked = rng.integers(0, len(source), n_rows)
+    for column in joint:
+        columns[column] = source[column].to_numpy()[picked]
+    for column in source.columns:
+        if column in columns:
+            continue
+        if column in options:
+            columns[column] = sample_multi_answers(
+                source[column], options[column], n_rows, rng
+            )
+        else:
+            columns[column] = sample_column(source[column], n_rows, rng)
+    return pd.DataFrame(columns, columns=source.columns)
+
+
+def output_dir(n_rows):
+    """
+    Dossier des CSV synthétiques de n_rows lignes (utilisable comme MOTIVIA_DATA_DIR).
+    """
+    return os.path.join(OUTPUT_DIR, str(n_rows))
+
+
+def write_survey(n_rows, seed=0):
+    """
+    Écrit profs.csv et eleves.csv synthétiques et retourne leur dossier.
+    """
+    directory = output_dir(n_rows)
+    os.makedirs(directory, exist_ok=True)
+    for name, source in SOURCES.items():
+        df = generate(name, n_rows, seed)
+        df.to_csv(
+            os.path.join(directory, source["file"]),
+            index=source["index_col"] is not None,
+        )
+    return directory
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for n_rows in args.rows:
+        print(f"{n_rows} lignes -> {write_survey(n_rows, args.seed)}")
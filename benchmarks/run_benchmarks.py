@@ -0,0 +1,285 @@
+"""
+Banc d'essai des chemins critiques du tableau de bord sur données synthétiques.
+
+Mesure le chargement des CSV, les filtres de la barre latérale, create_pie_chart,
+create_pie_chart_split, l'exécution complète des pages (AppTest, sans
+navigateur) et la bascule d'un graphique (page entière ou fragment seul). Chaque mesure est ajoutée à benchmarks/history.jsonl puis
+comparée à la précédente de même taille : un ralentissement au-delà de la
+tolérance est signalé et le script se termine en erreur.
+
+Usage : python benchmarks/run_benchmarks.py --rows 10000 100000
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_PATH = os.path.join(ROOT, "benchmarks", "history.jsonl")
+
+# Sélections représentatives de la barre latérale
+SELECTIONS = {
+    "profs": {"Type_etab": ["COLLEGE", "LYCEE GENERAL"]},
+    "eleves": {"Classe": ["2nde", "3e"], "Age": ["13-14 ans", "15-16 ans"]},
+}
+PIE_COLUMNS = {"profs": "Freq_comm_ecrit", "eleves": "Freq_comm_ecrit"}
+SPLIT_COLUMNS = {"profs": "Moment_comm_oral", "eleves": "Methodes_travail"}
+# Graphique des Élèves dont l'interrupteur barre / secteurs est basculé
+TOGGLE_COLUMN = "Classe"
+
+
+def timed(function, repeat):
+    """
+    Durées (s) de repeat appels à function.
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def run_suite(repeat):
+    """
+    Exécute les mesures dans le processus courant (MOTIVIA_DATA_DIR déjà positionné).
+    """
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    import data_loader
+    import utils
+
+    results = {}
+
+    def record(benchmark, function, n=repeat, setup=None):
+        durations = []
+        for _ in range(n):
+            if setup is not None:
+                setup()
+            durations.extend(timed(function, 1))
+        results[benchmark] = durations
+
+    def clear_caches():
+        st.cache_resource.clear()
+        utils.FIGURE_CACHE.clear()
+
+    for name in data_loader.DATASETS:
+        record(f"{name}/csv_load", lambda: data_loader.read_csv_typed(name))
+        record(f"{name}/snapshot_build", lambda: data_loader.build_snapshot(name), 1)
+        record(f"{name}/cube_build", lambda: data_loader.build_cube(name), 1)
+
+        df = data_loader.load_dataset(name)
+        answers = data_loader.load_multi_answers(name)
+        engine = data_loader.load_filter_engine(name)
+        cube = data_loader.load_cube(name)
+        selections = SELECTIONS[name]
+        rows = engine.indices(selections)
+        aggregate = cube.query(selections)
+
+        record(f"{name}/filter_bitsets", lambda: engine.indices(selections))
+        record(f"{name}/filter_cube", lambda: cube.query(selections))
+
+        pie, split = PIE_COLUMNS[name], SPLIT_COLUMNS[name]
+        record(
+            f"{name}/create_pie_chart",
+            lambda: utils.create_pie_chart(df, pie, rows=rows),
+            setup=utils.FIGURE_CACHE.clear,
+        )
+        record(
+            f"{name}/create_pie_chart_cube",
+            lambda: utils.create_pie_chart(df, pie, aggregate=aggregate),
+            setup=utils.FIGURE_CACHE.clear,
+        )
+        record(
+            f"{name}/create_pie_chart_split_text",
+            lambda: utils.create_pie_chart_split(df, split, rows=rows),
+            setup=utils.FIGURE_CACHE.clear,
+        )
+        record(
+            f"{name}/create_pie_chart_split_index",
+            lambda: utils.create_pie_chart_split(df, split, answers=answers, rows=rows),
+            setup=utils.FIGURE_CACHE.clear,
+        )
+
+    pages = ["streamlit_app.py"] + sorted(glob.glob(os.path.join("pages", "*.py")))
+    for page in pages:
+        label = os.path.splitext(os.path.basename(page))[0]
+        app = AppTest.from_file(os.path.join(ROOT, page), default_timeout=600)
+
+        def run_page():
+            app.run()
+            if app.exception:
+                raise RuntimeError(app.exception[0].value)
+
+        record(f"page/{label}/cold", run_page, setup=clear_caches)
+        record(f"page/{label}/warm", run_page)
+
+    # Bascule de l'interrupteur « Diagramme en barre » d'un graphique des
+    # Élèves. AppTest relance toujours la page entière, même pour un widget
+    # d'un fragment : toggle_page mesure cette relance complète,
+    # toggle_fragment un script qui n'exécute que le fragment
+    # (widgets.chart_with_toggle), comme le navigateur
+    page = next(page for page in pages if "Données_El" in page)
+    app = AppTest.from_file(os.path.join(ROOT, page), default_timeout=600).run()
+    fragment = AppTest.from_function(
+        toggle_fragment, args=(TOGGLE_COLUMN, SELECTIONS["eleves"])
+    ).run()
+
+    def toggle(app):
+        def run():
+            switch = app.toggle(key=f"bar_{TOGGLE_COLUMN}")
+            switch.set_value(not switch.value).run()
+            if app.exception:
+                raise RuntimeError(app.exception[0].value)
+
+        return run
+
+    for cache, setup in [("cold", utils.FIGURE_CACHE.clear), ("warm", None)]:
+        record(f"page/eleves/toggle_page/{cache}", toggle(app), setup=setup)
+        record(f"page/eleves/toggle_fragment/{cache}", toggle(fragment), setup=setup)
+    return results
+
+
+def toggle_fragment(column, selections):
+    """
+    Script AppTest réduit au fragment graphique + interrupteur d'une question
+    des Élèves, données lues dans les caches partagés.
+    """
+    import data_loader
+    from widgets import chart_with_toggle
+
+    chart_with_toggle(
+        data_loader.load_eleves(),
+        column,
+        rows=data_loader.load_filter_engine("eleves").indices(selections),
+        aggregate=data_loader.load_cube("eleves").query(selections),
+        intervals="wilson",
+    )
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def read_history(path):
+    history = []
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            history = [json.loads(line) for line in f if line.strip()]
+    return history
+
+
+def compare(records, history, tolerance):
+    """
+    Mesures plus lentes que la précédente de même (taille, mesure) au-delà de tolerance.
+    """
+    previous = {(r["rows"], r["benchmark"]): r for r in history}
+    regressions = []
+    for record in records:
+        before = previous.get((record["rows"], record["benchmark"]))
+        if before and record["median_s"] > before["median_s"] * (1 + tolerance):
+            regressions.append((record, before))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--history", default=HISTORY_PATH)
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        # Processus isolé par taille : DATA_DIR est lu à l'import de data_loader
+        os.chdir(ROOT)
+        sys.path.insert(0, ROOT)
+        with open(args.worker, "w", encoding="utf-8") as f:
+            json.dump(run_suite(args.repeat), f)
+        return 0
+
+    from generate_survey import output_dir, write_survey
+
+    commit = git_commit()
+    timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    records = []
+    for n_rows in args.rows:
+        directory = output_dir(n_rows)
+        if not os.path.exists(os.path.join(directory, "eleves.csv")):
+            write_survey(n_rows)
+        output = os.path.join(directory, "benchmark.json")
+        completed = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--worker",
+                output,
+                "--repeat",
+                str(args.repeat),
+            ],
+            env={**os.environ, "MOTIVIA_DATA_DIR": directory},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        if completed.returncode:
+            sys.stderr.write(completed.stderr)
+            return completed.returncode
+        with open(output, encoding="utf-8") as f:
+            durations_by_benchmark = json.load(f)
+        for benchmark, durations in durations_by_benchmark.items():
+            records.append(
+                {
+                    "timestamp": timestamp,
+                    "commit": commit,
+                    "python": platform.python_version(),
+                    "rows": n_rows,
+                    "benchmark": benchmark,
+                    "repeat": len(durations),
+                    "median_s": statistics.median(durations),
+                    "min_s": min(durations),
+                }
+            )
+
+    for record in records:
+        print(
+            f"{record['rows']:>9} {record['benchmark']:<45} "
+            f"médiane {record['median_s'] * 1000:9.1f} ms  min {record['min_s'] * 1000:9.1f} ms"
+        )
+
+    regressions = compare(records, read_history(args.history), args.tolerance)
+    for record, before in regressions:
+        print(
+            f"RÉGRESSION {record['rows']} {record['benchmark']} : "
+            f"{before['median_s'] * 1000:.1f} ms ({before['commit']}) -> "
+            f"{record['median_s'] * 1000:.1f} ms"
+        )
+
+    if not args.no_save:
+        with open(args.history, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
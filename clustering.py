@@ -0,0 +1,195 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+
+from filters import filter_state_hash
+from parallel import get_pool
+from text_analysis import clean_texts
+
+# Nombres de groupes évalués par la sélection automatique
+K_RANGE = range(2, 11)
+# Réponses tirées pour le score de silhouette
+SILHOUETTE_SAMPLE = 2000
+# Taille des lots du k-means
+BATCH_SIZE = 1024
+# À partir de ce nombre de réponses, les valeurs de k sont évaluées en
+# parallèle sur le pool de processus partagé (parallel.get_pool)
+PARALLEL_MIN_ANSWERS = 5000
+
+
+def _fit_k(vectors, k, weights=None, sample=SILHOUETTE_SAMPLE, seed=42):
+    """
+    k-means par mini-lots pour k groupes, chaque vecteur pondéré par weights ;
+    retourne (score de silhouette sur un échantillon, groupe de chaque
+    vecteur, centres).
+    """
+    model = MiniBatchKMeans(
+        n_clusters=k, batch_size=BATCH_SIZE, n_init=3, random_state=seed
+    )
+    labels = model.fit_predict(vectors, sample_weight=weights)
+    if len(np.unique(labels)) < 2:
+        return -1.0, labels, model.cluster_centers_
+    score = silhouette_score(
+        vectors, labels, sample_size=min(sample, len(vectors)), random_state=seed
+    )
+    return float(score), labels, model.cluster_centers_
+
+
+class ClusterResult:
+    """
+    Groupes de réponses libres pour un état des filtres.
+
+    clusters : une ligne par groupe (taille, part, termes caractéristiques,
+    exemples les plus proches du centre) ; scores : silhouette de chaque k
+    évalué ; labels : groupe de chaque réponse retenue (positions rows) ;
+    distances : distance de chaque réponse au centre de son groupe ;
+    variants : variante (groupe de quasi-doublons) de chaque réponse.
+    """
+
+    def __init__(self, clusters, scores, k, rows, labels, distances, variants):
+        self.clusters = clusters
+        self.scores = scores
+        self.k = k
+        self.rows = rows
+        self.labels = labels
+        self.distances = distances
+        self.variants = variants
+
+
+class ClusterEngine:
+    """
+    Regroupement des réponses libres d'une colonne.
+
+    Les vecteurs (embeddings.EmbeddingSet) sont calculés une fois par colonne ;
+    un état des filtres ne fait que choisir les réponses à regrouper. Sans k
+    imposé, toutes les valeurs de K_RANGE sont évaluées (en parallèle pour les
+    grandes colonnes) et la meilleure silhouette l'emporte. Les résultats sont
+    partagés entre les sessions, par état des filtres.
+
+    Le k-means ne voit qu'une réponse par variante, pondérée par son nombre de
+    réponses : les quasi-doublons (near_duplicates.NearDuplicates, ou à défaut
+    les doublons exacts après nettoyage) ne pèsent pas sur le score de
+    silhouette et ne reviennent pas dans les exemples.
+    """
+
+    def __init__(
+        self, embeddings, analyzer, duplicates=None, k_range=K_RANGE, maxsize=32
+    ):
+        self.embeddings = embeddings
+        self.analyzer = analyzer
+        self.duplicates = duplicates
+        self.k_range = list(k_range)
+        self.maxsize = maxsize
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cluster(self, rows=None, k=None, n_examples=3, n_terms=5):
+        """
+        Regroupe les réponses des lignes rows (positions de load_dataset,
+        toutes si None) en k groupes, k choisi automatiquement si None.
+        """
+        selected = self.embeddings.select(rows)
+        key = (
+            self.embeddings.version,
+            filter_state_hash(selected, len(self.embeddings.positions)),
+            k,
+            n_examples,
+            n_terms,
+        )
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+
+        result = self._cluster(selected, k, n_examples, n_terms)
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return result
+
+    def _fit(self, vectors, k, weights):
+        candidates = [k] if k is not None else self.k_range
+        candidates = [c for c in candidates if 2 <= c < len(vectors)]
+        if not candidates:
+            return pd.Series(dtype=float), np.zeros(len(vectors), dtype=int), None
+        if len(candidates) > 1 and len(vectors) >= PARALLEL_MIN_ANSWERS:
+            futures = [
+                get_pool().submit(_fit_k, vectors, c, weights) for c in candidates
+            ]
+            fits = [future.result() for future in futures]
+        else:
+            fits = [_fit_k(vectors, c, weights) for c in candidates]
+        scores = pd.Series(
+            [score for score, _, _ in fits],
+            index=pd.Index(candidates, name="k"),
+            name="silhouette",
+        )
+        _, labels, centers = fits[int(np.argmax(scores.to_numpy()))]
+        return scores, labels, centers
+
+    def _cluster(self, selected, k, n_examples, n_terms):
+        vectors = np.asarray(self.embeddings.vectors[selected])
+        rows = self.embeddings.positions[selected]
+        texts = self.embeddings.texts[selected]
+        if self.duplicates is not None:
+            variants = self.duplicates.groups[rows]
+        else:
+            variants = pd.factorize(clean_texts(texts))[0]
+        # Une réponse par variante, pondérée par son nombre de réponses
+        _, first, inverse, weights = np.unique(
+            variants, return_index=True, return_inverse=True, return_counts=True
+        )
+        scores, labels, centers = self._fit(vectors[first], k, weights)
+        labels = labels[inverse]
+        if centers is None:
+            centers = vectors.mean(axis=0, keepdims=True) if len(vectors) else None
+        if centers is None:
+            distances = np.zeros(len(vectors), dtype=np.float32)
+        else:
+            distances = np.linalg.norm(vectors - centers[labels], axis=1)
+
+        groups = []
+        for label in range(0 if centers is None else len(centers)):
+            members = np.flatnonzero(labels == label)
+            if not len(members):
+                continue
+            # Réponses les plus proches du centre, sans doublon
+            order = members[np.argsort(distances[members], kind="stable")]
+            _, first = np.unique(variants[order], return_index=True)
+            examples = texts[order[np.sort(first)[:n_examples]]]
+            terms = self.analyzer.distinctive_terms(
+                rows[members], reference=rows, n_top=n_terms
+            )
+            groups.append(
+                {
+                    "label": label,
+                    "taille": len(members),
+                    "part": len(members) / len(vectors),
+                    "termes": ", ".join(terms.index),
+                    "exemples": [str(text) for text in examples],
+                }
+            )
+        clusters = pd.DataFrame(
+            groups, columns=["label", "taille", "part", "termes", "exemples"]
+        ).sort_values("taille", ascending=False, kind="stable")
+        # Groupes numérotés par taille décroissante
+        renumber = np.zeros(max(labels.max(initial=0) + 1, 1), dtype=int)
+        renumber[clusters["label"].to_numpy(dtype=int)] = np.arange(len(clusters))
+        clusters = clusters.drop(columns="label")
+        clusters.index = pd.Index(
+            [f"Groupe {i + 1}" for i in range(len(clusters))], name="groupe"
+        )
+        return ClusterResult(
+            clusters,
+            scores,
+            len(clusters),
+            rows,
+            renumber[labels],
+            distances,
+            variants,
+        )
@@ -0,0 +1,117 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Libellés des populations comparées
+POPULATIONS = {"profs": "Enseignants", "eleves": "Élèves"}
+
+
+class PopulationComparison:
+    """
+    Comparaison enseignants / élèves sur les questions communes
+    (questionnaire.COMPARED_QUESTIONS).
+
+    Chaque modalité commune (question, groupe) est une case ; ses positions
+    dans les totaux de chaque population sont lues d'un coup, si bien que les
+    distributions de toutes les questions sont calculées en une passe NumPy
+    par population, chacune avec ses propres filtres.
+    """
+
+    def __init__(self, questions, populations=tuple(POPULATIONS), maxsize=64):
+        self.questions = questions
+        self.populations = list(populations)
+        self._slots = [
+            (question, group)
+            for question, config in questions.items()
+            for group in config["groups"]
+        ]
+        self._question_codes = np.array(
+            [list(questions).index(question) for question, _ in self._slots]
+        )
+        self.width = max(
+            len(config["groups"][group].get(population, []))
+            for question, config in questions.items()
+            for group in config["groups"]
+            for population in self.populations
+        )
+        self.maxsize = maxsize
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def slot_counts(self, aggregate, population):
+        """
+        Comptages de chaque modalité commune pour une population.
+        """
+        positions = np.full((len(self._slots), max(self.width, 1)), -1)
+        for i, (question, group) in enumerate(self._slots):
+            column = self.questions[question]["columns"][population]
+            labels = self.questions[question]["groups"][group].get(population, [])
+            positions[i, : len(labels)] = aggregate.positions(column, labels)
+        # La dernière case, toujours nulle, sert aux modalités absentes
+        totals = np.append(aggregate.totals, 0)
+        return totals[positions].sum(axis=1)
+
+    def compare(self, aggregates):
+        """
+        Distributions normalisées des questions communes, côte à côte.
+
+        aggregates : {population: AggregateCounts}, chacun pour ses filtres.
+        Retourne une ligne par (question, groupe, population) avec count et
+        share (part parmi les réponses comparées de la question). Le résultat
+        est partagé entre les sessions pour un même état des filtres.
+        """
+        key = tuple(
+            (aggregates[p].version, aggregates[p].filter_key) for p in self.populations
+        )
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+
+        counts = np.column_stack(
+            [self.slot_counts(aggregates[p], p) for p in self.populations]
+        )
+        totals = np.zeros((len(self.questions), len(self.populations)))
+        np.add.at(totals, self._question_codes, counts)
+        denominators = totals[self._question_codes]
+        shares = np.divide(
+            counts, denominators, out=np.zeros(counts.shape), where=denominators > 0
+        )
+
+        n_slots = len(self._slots)
+        result = pd.DataFrame(
+            {
+                "question": np.tile([q for q, _ in self._slots], len(self.populations)),
+                "groupe": np.tile([g for _, g in self._slots], len(self.populations)),
+                "population": np.repeat(self.populations, n_slots),
+                "count": counts.T.ravel().astype(np.int64),
+                "share": shares.T.ravel(),
+            }
+        )
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return result
+
+    def counts(self, result, question, population):
+        """
+        Nombre de réponses comparées par groupe d'une question pour une population.
+        """
+        selected = (result["question"] == question) & (
+            result["population"] == population
+        )
+        return result.loc[selected].set_index("groupe")["count"]
+
+    def share(self, result, question, population, groups):
+        """
+        Part cumulée des groupes d'une question pour une population.
+        """
+        selected = (
+            (result["question"] == question)
+            & (result["population"] == population)
+            & result["groupe"].isin(list(groups))
+        )
+        return float(result.loc[selected, "share"].sum())
@@ -0,0 +1,946 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from aggregation import Aggregator, CountCube
+from comparison import PopulationComparison
+from filters import FilterEngine
+from maps import EstablishmentMap
+from multi_answers import MultiAnswerIndex
+from questionnaire import (
+    COMPARED_QUESTIONS,
+    FREE_TEXT_QUESTIONS,
+    LIKERT_SCALES,
+    MULTI_CHOICE_OPTIONS,
+    SINGLE_CHOICE_COLUMNS,
+)
+
+# MOTIVIA_DATA_DIR permet de pointer l'application sur d'autres CSV (données synthétiques)
+DATA_DIR = os.environ.get("MOTIVIA_DATA_DIR") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "Data"
+)
+SNAPSHOT_DIR = os.path.join(DATA_DIR, "snapshots")
+# Vecteurs des réponses libres, un sous-dossier par encodeur
+EMBEDDING_DIR = os.path.join(SNAPSHOT_DIR, "embeddings")
+# Encodeur des réponses libres : "auto" (modèle SentenceTransformer s'il est
+# disponible), "transformer" ou "local" (TF-IDF + SVD, hors ligne)
+EMBEDDING_ENCODER = os.environ.get("MOTIVIA_ENCODER") or "auto"
+
+# Colonnes décrivant l'établissement, répétées sur chaque réponse enseignant
+ESTABLISHMENT_COLUMNS = [
+    "UAI",
+    "Nom_etab",
+    "Adresse",
+    "Code postal",
+    "Nom_commune",
+    "Contrat",
+    "Type_etab",
+    "Code_departement",
+    "Departement",
+    "latitude",
+    "longitude",
+]
+
+# Clé étrangère entière des réponses vers la table des établissements
+ESTABLISHMENT_KEY = "etab_id"
+
+# Jeux de données disponibles et options de lecture du CSV
+DATASETS = {
+    "profs": {
+        "path": os.path.join(DATA_DIR, "profs.csv"),
+        "read_csv": {"index_col": 0},
+        "ordered": [],
+        # Échelles de Likert : catégories ordonnées selon l'échelle
+        "scales": LIKERT_SCALES["profs"],
+        # Table de dimension (clé naturelle, colonnes) séparée des réponses
+        "dimension": {
+            "name": "etablissements",
+            "key": "UAI",
+            "columns": ESTABLISHMENT_COLUMNS,
+        },
+        # Questions à choix unique, agrégées en une passe
+        "single": SINGLE_CHOICE_COLUMNS["profs"],
+        # Questions à réponses multiples, éclatées une fois au chargement
+        "multi": MULTI_CHOICE_OPTIONS["profs"],
+        # Tableaux croisés (index, colonnes) calculés avec les agrégats
+        "crosstabs": [("Type_etab", "Departement")],
+        # Colonnes de la barre latérale, indexées par masques de bits et
+        # dimensions du cube de comptages
+        "filters": ["Type_etab", "Departement"],
+        # Texte libre, stocké à part et chargé à la demande
+        "text": list(FREE_TEXT_QUESTIONS["profs"]),
+        # Colonnes lues par aucune page, écartées dès l'instantané
+        "drop": ["Créé à", "Mail_etab", "Telephone"],
+    },
+    "eleves": {
+        "path": os.path.join(DATA_DIR, "eleves.csv"),
+        "read_csv": {},
+        # Colonnes comparées avec <= / >= dans les filtres
+        "ordered": ["Age"],
+        "scales": LIKERT_SCALES["eleves"],
+        "dimension": None,
+        "single": SINGLE_CHOICE_COLUMNS["eleves"],
+        "multi": MULTI_CHOICE_OPTIONS["eleves"],
+        "crosstabs": [],
+        "filters": ["Classe", "Age"],
+        "text": list(FREE_TEXT_QUESTIONS["eleves"]),
+        "drop": ["Cle_logbook", "Image1", "Image2", "Créé à"],
+    },
+}
+
+# Une colonne texte devient catégorielle si elle a au plus ce ratio de valeurs distinctes
+CATEGORY_MAX_RATIO = 0.5
+
+# Version du format des instantanés et du cube : à incrémenter quand la lecture,
+# le typage ou le découpage des réponses changent
+SNAPSHOT_FORMAT = 1
+
+
+def _file_signature(path):
+    """
+    Signature du fichier (date de modification, taille) utilisée comme clé de cache.
+    """
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _config_digest(name):
+    """
+    Empreinte de la configuration d'un jeu de données (options de lecture,
+    échelles, catalogue des options) et de SNAPSHOT_FORMAT.
+
+    Enregistrée avec l'instantané et le cube : si elle change, ils sont
+    recalculés entièrement.
+    """
+    config = {key: value for key, value in DATASETS[name].items() if key != "path"}
+    payload = json.dumps(
+        {"format": SNAPSHOT_FORMAT, "config": config}, sort_keys=True, default=str
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _read_meta(path):
+    """
+    Métadonnées JSON écrites à côté d'un fichier généré (None si absentes).
+    """
+    try:
+        with open(f"{path}.json", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(path, meta):
+    tmp_path = f"{path}.json.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, f"{path}.json")
+
+
+def snapshot_path(name):
+    """
+    Chemin de l'instantané Parquet d'un jeu de données.
+    """
+    return os.path.join(SNAPSHOT_DIR, f"{name}.parquet")
+
+
+def text_path(name):
+    """
+    Chemin du fichier Parquet du texte libre d'un jeu de données.
+    """
+    return os.path.join(SNAPSHOT_DIR, f"{name}.texte.parquet")
+
+
+def dimension_path(name):
+    """
+    Chemin de l'instantané Parquet de la table de dimension d'un jeu de données.
+    """
+    return os.path.join(
+        SNAPSHOT_DIR, f"{name}.{DATASETS[name]['dimension']['name']}.parquet"
+    )
+
+
+def _typer_colonnes(df, ordered=(), scales=None, categorical=()):
+    """
+    Convertit les colonnes texte répétitives en catégories (encodage par dictionnaire).
+
+    Les colonnes de scales deviennent des catégories ordonnées selon l'échelle ;
+    les réponses hors échelle sont placées après ses niveaux. Les colonnes de
+    categorical (questions) sont toujours codées, quel que soit leur nombre
+    de modalités ; les entiers sont réduits au plus petit type suffisant.
+    """
+    scales = scales or {}
+    for column in df.columns:
+        if column in scales:
+            known = scales[column]["levels"] + scales[column]["excluded"]
+            others = sorted(set(df[column].dropna()) - set(known))
+            df[column] = pd.Categorical(
+                df[column], categories=known + others, ordered=True
+            )
+        elif column in ordered:
+            categories = sorted(df[column].dropna().unique().tolist())
+            df[column] = pd.Categorical(df[column], categories=categories, ordered=True)
+        elif column in categorical:
+            df[column] = df[column].astype("category")
+        elif pd.api.types.is_string_dtype(df[column]) or df[column].dtype == object:
+            non_null = df[column].count()
+            if non_null and df[column].nunique() <= CATEGORY_MAX_RATIO * non_null:
+                df[column] = df[column].astype("category")
+        elif pd.api.types.is_integer_dtype(df[column]):
+            df[column] = pd.to_numeric(df[column], downcast="integer")
+    return df
+
+
+def read_csv_typed(name):
+    """
+    Lit le CSV source et type ses colonnes.
+
+    Le texte libre reste en chaînes ; les colonnes inutilisées sont écartées.
+    """
+    config = DATASETS[name]
+    df = pd.read_csv(config["path"], **config["read_csv"])
+    df = df.drop(columns=config["drop"], errors="ignore")
+    columns = df.columns
+    text = df[config["text"]].astype(object)
+    df = _typer_colonnes(
+        df.drop(columns=config["text"]),
+        config["ordered"],
+        config["scales"],
+        categorical=list(config["single"]) + list(config["multi"]),
+    )
+    return pd.concat([df, text], axis=1)[columns]
+
+
+def normalize(df, dimension):
+    """
+    Sépare les colonnes de la dimension des réponses.
+
+    Retourne (réponses, dimension) : chaque valeur distincte de la clé naturelle
+    donne une ligne de la dimension, et les réponses ne gardent que son numéro
+    (ESTABLISHMENT_KEY, -1 si la clé manque).
+    """
+    codes, _ = pd.factorize(df[dimension["key"]])
+    present = np.flatnonzero(codes >= 0)
+    _, first = np.unique(codes[present], return_index=True)
+    table = df[dimension["columns"]].iloc[present[first]].reset_index(drop=True)
+    facts = df.drop(columns=dimension["columns"])
+    facts[ESTABLISHMENT_KEY] = codes.astype(np.int32)
+    return facts, table
+
+
+def _write_parquet(df, path):
+    """
+    Écrit via un fichier temporaire pour que les autres processus ne lisent
+    jamais un fichier incomplet.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path, engine="pyarrow")
+    os.replace(tmp_path, path)
+
+
+def split_tables(name, df):
+    """
+    Découpe le jeu de données typé en (réponses, dimension, texte libre).
+
+    Les trois tables sont alignées sur les lignes du CSV (la dimension par la
+    clé) ; dimension vaut None pour un jeu de données sans dimension.
+    """
+    config = DATASETS[name]
+    texts = df[config["text"]]
+    df = df.drop(columns=config["text"])
+    table = None
+    if config["dimension"] is not None:
+        df, table = normalize(df, config["dimension"])
+    return df, table, texts
+
+
+def build_snapshot(name):
+    """
+    Convertit le CSV source en instantané Parquet colonnaire.
+
+    Avec une dimension, ses colonnes sont écrites à part et les réponses ne
+    gardent qu'une clé entière. Le texte libre a son propre fichier.
+    """
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    df, table, texts = split_tables(name, read_csv_typed(name))
+    if table is not None:
+        _write_parquet(table, dimension_path(name))
+    _write_parquet(texts, text_path(name))
+    path = snapshot_path(name)
+    _write_parquet(df, path)
+    # Écrites en dernier : un instantané incomplet n'a pas de métadonnées à jour
+    _write_meta(
+        path,
+        {
+            "signature": list(_file_signature(DATASETS[name]["path"])),
+            "config": _config_digest(name),
+        },
+    )
+    return path
+
+
+def ensure_snapshot(name):
+    """
+    Reconstruit l'instantané s'il est absent, incomplet, calculé sur une autre
+    version du CSV source ou avec une autre configuration.
+    """
+    path = snapshot_path(name)
+    meta = _read_meta(path)
+    if (
+        meta is None
+        or meta["signature"] != list(_file_signature(DATASETS[name]["path"]))
+        or meta.get("config") != _config_digest(name)
+        or not os.path.exists(path)
+        or not os.path.exists(text_path(name))
+        or (
+            DATASETS[name]["dimension"] is not None
+            and not os.path.exists(dimension_path(name))
+        )
+    ):
+        build_snapshot(name)
+    return path
+
+
+def _read_table(name, path, part):
+    """
+    Lit une des tables de l'instantané (part : position dans split_tables).
+    """
+    try:
+        ensure_snapshot(name)
+        return pd.read_parquet(path)
+    except ImportError:
+        # pyarrow absent : lecture directe du CSV
+        return split_tables(name, read_csv_typed(name))[part]
+
+
+@st.cache_resource(show_spinner=False, max_entries=2 * len(DATASETS))
+def _read_facts(name, signature):
+    """
+    Charge les réponses (sans dimension ni texte libre) une seule fois par
+    version du fichier. Les sélections de colonnes en sont des vues : avec la
+    copie à l'écriture de pandas, elles partagent ses tableaux.
+    """
+    return _read_table(name, snapshot_path(name), 0)
+
+
+@st.cache_resource(show_spinner=False, max_entries=2 * len(DATASETS))
+def _read_dimension(name, signature):
+    """
+    Charge la table de dimension une seule fois par version du fichier.
+    """
+    return _read_table(name, dimension_path(name), 1)
+
+
+@st.cache_resource(show_spinner=False, max_entries=2 * len(DATASETS))
+def _read_texts(name, signature):
+    """
+    Charge le texte libre une seule fois par version du fichier, à la demande.
+    """
+    return _read_table(name, text_path(name), 2)
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _read_dataset(name, signature, columns=None):
+    """
+    Charge le jeu de données une seule fois par processus, par version du
+    fichier et par sélection de colonnes.
+
+    Les colonnes de la dimension demandées sont reconstituées par la clé, le
+    texte libre est lu dans son propre fichier. Sans sélection, toutes les
+    colonnes sauf le texte libre.
+    """
+    config = DATASETS[name]
+    facts = _read_facts(name, signature)
+    dimension = config["dimension"]
+    dimension_columns = dimension["columns"] if dimension is not None else []
+    if columns is None:
+        columns = list(facts.columns) + dimension_columns
+    df = facts[[c for c in columns if c in facts.columns]]
+    joined = [c for c in columns if c in dimension_columns]
+    if joined:
+        table = _read_dimension(name, signature)
+        keys = facts[ESTABLISHMENT_KEY].to_numpy()
+        for column in joined:
+            df[column] = table[column].reindex(keys).set_axis(df.index)
+    texts = [c for c in columns if c in config["text"]]
+    if texts:
+        df = df.join(_read_texts(name, signature)[texts])
+    df = df[list(columns)]
+    # Version des données, utilisée comme clé par les caches de figures
+    df.attrs["version"] = (name, signature)
+    return df
+
+
+def load_dataset(name, columns=None):
+    """
+    Retourne le DataFrame partagé entre toutes les sessions.
+
+    Seules les colonnes demandées sont lues depuis l'instantané Parquet. Le
+    fichier n'est relu que si le CSV source change. Le DataFrame est partagé :
+    il ne doit jamais être modifié en place.
+    """
+    columns = tuple(columns) if columns is not None else None
+    return _read_dataset(name, _file_signature(DATASETS[name]["path"]), columns)
+
+
+def load_profs(columns=None):
+    """
+    Données du questionnaire enseignants.
+    """
+    return load_dataset("profs", columns)
+
+
+def load_eleves(columns=None):
+    """
+    Données du questionnaire élèves.
+    """
+    return load_dataset("eleves", columns)
+
+
+def load_establishments():
+    """
+    Table des établissements (une ligne par UAI), indexée par ESTABLISHMENT_KEY.
+    """
+    return _read_dimension("profs", _file_signature(DATASETS["profs"]["path"]))
+
+
+def load_texts(name, columns=None):
+    """
+    Texte libre d'un jeu de données (toutes ses colonnes si columns vaut None),
+    aligné sur les lignes des réponses.
+    """
+    texts = _read_texts(name, _file_signature(DATASETS[name]["path"]))
+    return texts if columns is None else texts[list(columns)]
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _build_text_analyzer(name, column, signature):
+    """
+    Ajuste le vocabulaire d'une colonne de texte libre une seule fois par
+    version du fichier.
+    """
+    from text_analysis import TextAnalyzer
+
+    return TextAnalyzer(
+        _read_texts(name, signature)[column], version=(name, signature, column)
+    )
+
+
+def load_text_analyzer(name, column):
+    """
+    Retourne l'analyseur partagé d'une colonne de texte libre.
+
+    term_frequencies(rows) donne les fréquences de termes des lignes retenues
+    (positions de load_dataset(name)).
+    """
+    return _build_text_analyzer(name, column, _file_signature(DATASETS[name]["path"]))
+
+
+@st.cache_resource(show_spinner=False, max_entries=2 * len(DATASETS))
+def _build_search_index(name, signature):
+    """
+    Construit l'index de recherche du texte libre une seule fois par version
+    du fichier.
+    """
+    from search import SearchIndex
+
+    return SearchIndex(_read_texts(name, signature), version=(name, signature))
+
+
+def load_search_index(name):
+    """
+    Retourne l'index partagé de recherche plein texte du jeu de données.
+
+    search(requête, rows=positions) donne les réponses libres correspondantes
+    parmi les lignes retenues par les filtres.
+    """
+    return _build_search_index(name, _file_signature(DATASETS[name]["path"]))
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _build_near_duplicates(name, column, signature):
+    """
+    Regroupe les réponses quasi identiques d'une colonne de texte libre une
+    seule fois par version du fichier.
+    """
+    from near_duplicates import NearDuplicates
+
+    return NearDuplicates(_read_texts(name, signature)[column])
+
+
+def load_near_duplicates(name, column):
+    """
+    Retourne les groupes partagés de réponses quasi identiques d'une colonne
+    (near_duplicates.NearDuplicates) ; summary(rows) donne leur représentant
+    et leur taille parmi les lignes retenues.
+    """
+    return _build_near_duplicates(name, column, _file_signature(DATASETS[name]["path"]))
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _build_embeddings(name, column, encoder, signature):
+    """
+    Vecteurs d'une colonne de texte libre ; seules les réponses absentes du
+    magasin sur disque sont encodées.
+    """
+    from embeddings import build_embeddings
+
+    return build_embeddings(
+        _read_texts(name, signature)[column],
+        EMBEDDING_DIR,
+        encoder=encoder,
+        version=(name, signature, column, encoder),
+        corpus=f"{name}-{column}",
+    )
+
+
+def load_embeddings(name, column, encoder=None):
+    """
+    Retourne les vecteurs partagés (embeddings.EmbeddingSet) des réponses
+    libres d'une colonne ; encoder vaut EMBEDDING_ENCODER par défaut.
+    """
+    return _build_embeddings(
+        name,
+        column,
+        encoder or EMBEDDING_ENCODER,
+        _file_signature(DATASETS[name]["path"]),
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _build_cluster_engine(name, column, encoder, signature):
+    """
+    Moteur de regroupement d'une colonne de texte libre ; ses résultats sont
+    conservés par état des filtres.
+    """
+    from clustering import ClusterEngine
+
+    return ClusterEngine(
+        _build_embeddings(name, column, encoder, signature),
+        _build_text_analyzer(name, column, signature),
+        duplicates=_build_near_duplicates(name, column, signature),
+    )
+
+
+def load_cluster_engine(name, column, encoder=None):
+    """
+    Retourne le moteur partagé (clustering.ClusterEngine) d'une colonne de
+    texte libre ; cluster(rows) regroupe les réponses des lignes retenues.
+    """
+    return _build_cluster_engine(
+        name,
+        column,
+        encoder or EMBEDDING_ENCODER,
+        _file_signature(DATASETS[name]["path"]),
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=2 * len(DATASETS))
+def _memory_report(name, signature):
+    """
+    Octets par colonne : CSV brut chargé par pandas (avant) et tables
+    partagées par le processus (après).
+    """
+    config = DATASETS[name]
+    raw = pd.read_csv(config["path"], **config["read_csv"])
+    before = raw.memory_usage(deep=True, index=False)
+    stores = {"réponses": _read_facts(name, signature)}
+    if config["dimension"] is not None:
+        stores["dimension"] = _read_dimension(name, signature)
+    stores["texte"] = _read_texts(name, signature)
+
+    rows = []
+    for store, df in stores.items():
+        for column, size in df.memory_usage(deep=True, index=False).items():
+            rows.append((column, store, before.get(column, 0), size))
+    kept = {row[0] for row in rows}
+    for column in raw.columns.difference(kept, sort=False):
+        rows.append((column, "supprimée", before[column], 0))
+    report = pd.DataFrame(rows, columns=["colonne", "stockage", "avant", "après"])
+    return report.astype({"avant": np.int64, "après": np.int64})
+
+
+def memory_report(name):
+    """
+    Rapport mémoire par colonne (colonne, stockage, avant, après) d'un jeu de données.
+    """
+    return _memory_report(name, _file_signature(DATASETS[name]["path"]))
+
+
+@st.cache_resource(show_spinner=False, max_entries=2 * len(DATASETS))
+def _build_multi_answers(name, signature):
+    """
+    Éclate les réponses multiples une seule fois par version du fichier.
+    """
+    catalogue = DATASETS[name]["multi"]
+    columns = list(catalogue)
+    return MultiAnswerIndex.from_frame(
+        load_dataset(name, columns), columns, options=catalogue
+    )
+
+
+def load_multi_answers(name):
+    """
+    Retourne l'index partagé des réponses multiples (respondent_id, question, option).
+
+    Les respondent_id correspondent aux positions des lignes de load_dataset(name).
+    """
+    return _build_multi_answers(name, _file_signature(DATASETS[name]["path"]))
+
+
+@st.cache_resource(show_spinner=False, max_entries=2 * len(DATASETS))
+def _build_filter_engine(name, signature):
+    """
+    Précalcule les masques de filtres une seule fois par version du fichier.
+
+    Si toutes les colonnes filtrées appartiennent à la dimension, les masques
+    portent sur ses lignes et sont propagés aux réponses par la clé.
+    """
+    config = DATASETS[name]
+    columns = config["filters"]
+    dimension = config["dimension"]
+    if dimension is not None and set(columns) <= set(dimension["columns"]):
+        keys = load_dataset(name, [ESTABLISHMENT_KEY])[ESTABLISHMENT_KEY]
+        return FilterEngine(
+            _read_dimension(name, signature), columns, key=keys.to_numpy()
+        )
+    return FilterEngine(load_dataset(name, columns), columns)
+
+
+def load_filter_engine(name):
+    """
+    Retourne le moteur de filtres partagé du jeu de données.
+
+    Les positions qu'il retourne correspondent aux lignes de load_dataset(name).
+    """
+    return _build_filter_engine(name, _file_signature(DATASETS[name]["path"]))
+
+
+@st.cache_resource(show_spinner=False, max_entries=2 * len(DATASETS))
+def _build_aggregator(name, signature):
+    """
+    Encode toutes les questions en codes globaux une seule fois par version du fichier.
+    """
+    config = DATASETS[name]
+    return Aggregator(
+        load_dataset(name, config["single"]),
+        config["single"],
+        answers=load_multi_answers(name),
+        crosstabs=config["crosstabs"],
+    )
+
+
+def load_aggregator(name):
+    """
+    Retourne l'agrégateur partagé du jeu de données.
+
+    aggregate(rows) compte toutes les questions pour les positions rows.
+    """
+    return _build_aggregator(name, _file_signature(DATASETS[name]["path"]))
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _build_establishment_map(signature):
+    """
+    Numérote les établissements une seule fois par version du fichier.
+    """
+    return EstablishmentMap(
+        load_establishments(),
+        load_profs([ESTABLISHMENT_KEY])[ESTABLISHMENT_KEY].to_numpy(),
+        label="Nom_etab",
+    )
+
+
+def load_establishment_map():
+    """
+    Retourne la carte agrégée des établissements des enseignants.
+
+    Ses positions de lignes sont celles de load_profs().
+    """
+    return _build_establishment_map(_file_signature(DATASETS["profs"]["path"]))
+
+
+def cube_path(name):
+    """
+    Chemin du cube de comptages d'un jeu de données, à côté de son instantané.
+    """
+    return os.path.join(SNAPSHOT_DIR, f"{name}.cube.parquet")
+
+
+def _prefix_digest(path, size):
+    """
+    Empreinte des size premiers octets du fichier.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        remaining = size
+        while remaining > 0:
+            chunk = f.read(min(remaining, 1 << 20))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def _count_table(name, df):
+    """
+    Table longue des comptages par cellule des dimensions de filtre de df.
+    """
+    config = DATASETS[name]
+    answers = MultiAnswerIndex.from_frame(
+        df, list(config["multi"]), options=config["multi"]
+    )
+    aggregator = Aggregator(df, config["single"], answers=answers)
+    return aggregator.count_table(df[config["filters"]])
+
+
+def _merge_count_tables(old, new):
+    keys = [column for column in old.columns if column != "count"]
+    table = pd.concat([old, new], ignore_index=True)
+    return table.groupby(keys, dropna=False, sort=False, as_index=False)["count"].sum()
+
+
+def build_cube(name):
+    """
+    Calcule le cube de comptages et l'écrit à côté de l'instantané.
+
+    Si le CSV source n'a fait que s'allonger depuis le dernier calcul, avec la
+    même configuration, seules les lignes ajoutées sont comptées puis ajoutées
+    au cube existant ; sinon le cube est recalculé entièrement.
+    """
+    config = DATASETS[name]
+    columns = list(
+        dict.fromkeys(config["filters"] + config["single"] + list(config["multi"]))
+    )
+    df = load_dataset(name, columns)
+    path = cube_path(name)
+    csv_size = os.stat(config["path"]).st_size
+
+    meta = _read_meta(path)
+    if (
+        meta is not None
+        and meta.get("config") == _config_digest(name)
+        and os.path.exists(path)
+        and meta["n_rows"] <= len(df)
+        and meta["size"] <= csv_size
+        and _prefix_digest(config["path"], meta["size"]) == meta["prefix"]
+    ):
+        added = df.iloc[meta["n_rows"] :]
+        table = pd.read_parquet(path)
+        if len(added):
+            table = _merge_count_tables(table, _count_table(name, added))
+    else:
+        table = _count_table(name, df)
+
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    table.to_parquet(tmp_path, engine="pyarrow", index=False)
+    os.replace(tmp_path, path)
+    _write_meta(
+        path,
+        {
+            "signature": list(_file_signature(config["path"])),
+            "config": _config_digest(name),
+            "n_rows": len(df),
+            "size": csv_size,
+            "prefix": _prefix_digest(config["path"], csv_size),
+        },
+    )
+    return path
+
+
+def ensure_cube(name):
+    """
+    Recalcule le cube s'il est absent ou calculé sur une autre version du CSV
+    ou avec une autre configuration.
+    """
+    meta = _read_meta(cube_path(name))
+    signature = list(_file_signature(DATASETS[name]["path"]))
+    if (
+        meta is None
+        or meta["signature"] != signature
+        or meta.get("config") != _config_digest(name)
+        or not os.path.exists(cube_path(name))
+    ):
+        build_cube(name)
+    return cube_path(name)
+
+
+@st.cache_resource(show_spinner=False, max_entries=2 * len(DATASETS))
+def _build_cube(name, signature):
+    """
+    Charge le cube de comptages une seule fois par version du fichier.
+    """
+    config = DATASETS[name]
+    try:
+        table = pd.read_parquet(ensure_cube(name))
+    except ImportError:
+        # pyarrow absent : cube calculé en mémoire, sans persistance
+        table = _count_table(name, load_dataset(name))
+    return CountCube(
+        table,
+        config["filters"],
+        crosstabs=config["crosstabs"],
+        version=(name, signature),
+    )
+
+
+def load_cube(name):
+    """
+    Retourne le cube de comptages partagé du jeu de données.
+
+    query(selections) compte toutes les questions pour une sélection de la
+    barre latérale, sans parcourir les répondants.
+    """
+    return _build_cube(name, _file_signature(DATASETS[name]["path"]))
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _build_comparison(file_versions):
+    """
+    Construit le moteur de comparaison une seule fois par version des fichiers.
+
+    Le moteur ne lit que COMPARED_QUESTIONS : file_versions (signatures des
+    CSV) ne sert que de clé au cache, pour abandonner les résultats gardés
+    en mémoire quand les fichiers changent.
+    """
+    return PopulationComparison(COMPARED_QUESTIONS, populations=list(DATASETS))
+
+
+def load_comparison():
+    """
+    Retourne le moteur partagé de comparaison enseignants / élèves.
+
+    compare({jeu: load_cube(jeu).query(sélections)}) donne les distributions
+    normalisées des questions communes.
+    """
+    return _build_comparison(
+        tuple(_file_signature(config["path"]) for config in DATASETS.values())
+    )
+
+
+def summary_path(name):
+    """
+    Chemin de la table de résumé des réponses libres, à côté de l'instantané.
+    """
+    return os.path.join(SNAPSHOT_DIR, f"{name}.resume.parquet")
+
+
+def build_text_summary(name):
+    """
+    Regroupe les réponses de chaque colonne de texte libre et écrit la table
+    de résumé (text_summary.summary_table) à côté de l'instantané.
+    """
+    from text_summary import SUMMARY_COLUMNS, summary_table
+
+    config = DATASETS[name]
+    signature = _file_signature(config["path"])
+    table = summary_table(
+        {
+            column: _build_cluster_engine(name, column, EMBEDDING_ENCODER, signature)
+            for column in config["text"]
+        }
+    )
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    path = summary_path(name)
+    _write_parquet(table, path)
+    _write_meta(
+        path,
+        {
+            "signature": list(signature),
+            "config": _config_digest(name),
+            "encoder": EMBEDDING_ENCODER,
+            "columns": SUMMARY_COLUMNS,
+        },
+    )
+    return path
+
+
+def ensure_text_summary(name):
+    """
+    Recalcule la table de résumé si elle est absente ou calculée sur une autre
+    version du CSV ou avec une autre configuration.
+    """
+    from text_summary import SUMMARY_COLUMNS
+
+    path = summary_path(name)
+    meta = _read_meta(path)
+    if (
+        meta is None
+        or meta["signature"] != list(_file_signature(DATASETS[name]["path"]))
+        or meta.get("config") != _config_digest(name)
+        or meta["encoder"] != EMBEDDING_ENCODER
+        or meta.get("columns") != SUMMARY_COLUMNS
+        or not os.path.exists(path)
+    ):
+        build_text_summary(name)
+    return path
+
+
+@st.cache_resource(show_spinner=False, max_entries=2 * len(DATASETS))
+def _build_text_summary(name, signature):
+    """
+    Charge la table de résumé des réponses libres une seule fois par version
+    du fichier.
+    """
+    from text_summary import TextSummaryIndex, summary_table
+
+    texts = _read_texts(name, signature)
+    try:
+        table = pd.read_parquet(ensure_text_summary(name))
+    except ImportError:
+        # pyarrow absent : résumé calculé en mémoire, sans persistance
+        table = summary_table(
+            {
+                column: _build_cluster_engine(
+                    name, column, EMBEDDING_ENCODER, signature
+                )
+                for column in DATASETS[name]["text"]
+            }
+        )
+    return TextSummaryIndex(table, texts, version=(name, signature))
+
+
+def load_text_summary(name):
+    """
+    Retourne l'index partagé des résumés de réponses libres du jeu de données.
+
+    summary(colonne, rows) donne les groupes, leurs termes et des citations
+    représentatives pour les lignes retenues par les filtres.
+    """
+    return _build_text_summary(name, _file_signature(DATASETS[name]["path"]))
+
+
+@st.cache_resource(show_spinner=False, max_entries=2 * len(DATASETS))
+def _build_significance(name, signature):
+    """
+    Prépare les tests de significativité une seule fois par version du fichier.
+    """
+    from significance import SignificanceScan
+
+    config = DATASETS[name]
+    return SignificanceScan(
+        list(config["single"]) + list(config["multi"]), multi=config["multi"]
+    )
+
+
+def load_significance(name):
+    """
+    Retourne le moteur partagé des tests de significativité du jeu de données.
+
+    scan(cube.query(groupe A), cube.query(groupe B)) teste toutes les questions.
+    """
+    return _build_significance(name, _file_signature(DATASETS[name]["path"]))
+
+
+if __name__ == "__main__":
+    # Étape d'ingestion : python data_loader.py
+    for dataset in DATASETS:
+        print(f"{dataset} -> {build_snapshot(dataset)}")
+        print(f"{dataset} -> {build_cube(dataset)}")
+        print(f"{dataset} -> {build_text_summary(dataset)}")
@@ -0,0 +1,368 @@
+"""
+Plongements (embeddings) des réponses libres.
+
+Un encodeur est un objet portant un nom (name) et une méthode encode(textes)
+qui retourne une matrice float32 (textes x dimensions). Deux encodeurs sont
+fournis : le modèle SentenceTransformer du notebook, chargé une fois par
+processus, et un encodeur local TF-IDF + SVD tronquée, rapide et sans
+téléchargement. Les vecteurs sont conservés sur disque par EmbeddingStore,
+indexés par l'empreinte du texte normalisé : seules les nouvelles réponses
+sont encodées, et l'encodeur local ajusté est conservé avec ses vecteurs.
+"""
+
+import contextlib
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import shutil
+import threading
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from text_analysis import clean_texts
+
+logger = logging.getLogger(__name__)
+
+# Modèle multilingue utilisé par le notebook
+TRANSFORMER_MODEL = "distiluse-base-multilingual-cased-v2"
+# Textes encodés par appel au modèle
+BATCH_SIZE = 64
+# Dimensions de l'encodeur local
+LOCAL_DIMENSIONS = 100
+# Modèle ajusté de l'encodeur local, enregistré dans son magasin
+MODEL_FILE = "model.pkl"
+# Fichiers d'un fragment du magasin
+KEYS_SUFFIX = ".keys.npy"
+VECTORS_SUFFIX = ".vectors.npy"
+# Fragments au-delà desquels le magasin est compacté
+MAX_SHARDS = 32
+
+
+class TransformerEncoder:
+    """
+    Encodeur SentenceTransformer ; le modèle est chargé à la construction
+    (une fois par processus via transformer_encoder).
+    """
+
+    def __init__(self, model_name=TRANSFORMER_MODEL, batch_size=BATCH_SIZE):
+        from sentence_transformers import SentenceTransformer
+
+        self.name = model_name
+        self.batch_size = batch_size
+        self._model = SentenceTransformer(model_name)
+        self._lock = threading.Lock()
+
+    def encode(self, texts):
+        with self._lock:
+            vectors = self._model.encode(
+                list(texts), batch_size=self.batch_size, show_progress_bar=False
+            )
+        return np.asarray(vectors, dtype=np.float32)
+
+
+class TfidfSvdEncoder:
+    """
+    Encodeur local : TF-IDF sur les n-grammes de caractères (robuste aux
+    fautes de frappe) puis SVD tronquée, ajusté sur un corpus.
+
+    Son nom ne dépend que de ses paramètres et du nom du corpus : le modèle
+    ajusté est conservé dans son magasin (MODEL_FILE) et réutilisé pour les
+    nouvelles réponses, les vecteurs déjà calculés restent valables.
+    """
+
+    def __init__(self, n_components=LOCAL_DIMENSIONS, random_state=42, corpus="textes"):
+        self.n_components = n_components
+        self.random_state = random_state
+        self.name = f"tfidf-svd-{n_components}-{corpus}"
+        self._vectorizer = None
+        self._svd = None
+
+    def fit(self, texts):
+        texts = pd.unique(clean_texts(texts).to_numpy())
+        self._vectorizer = TfidfVectorizer(
+            analyzer="char_wb",
+            ngram_range=(3, 5),
+            sublinear_tf=True,
+            min_df=1,
+        )
+        matrix = self._vectorizer.fit_transform(texts)
+        n_components = max(1, min(self.n_components, matrix.shape[1] - 1))
+        self._svd = TruncatedSVD(n_components, random_state=self.random_state)
+        # Corpus minuscule : variance totale nulle, sans effet sur les vecteurs
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self._svd.fit(matrix)
+        return self
+
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((self._vectorizer, self._svd), f)
+        os.replace(tmp_path, path)
+        return self
+
+    def load(self, path):
+        with open(path, "rb") as f:
+            self._vectorizer, self._svd = pickle.load(f)
+        return self
+
+    def encode(self, texts):
+        vectors = self._svd.transform(
+            self._vectorizer.transform(clean_texts(texts).to_numpy())
+        )
+        return normalize(vectors).astype(np.float32)
+
+
+@functools.lru_cache(maxsize=2)
+def transformer_encoder(model_name=TRANSFORMER_MODEL):
+    """
+    Encodeur SentenceTransformer partagé par le processus, ou None si le
+    modèle n'est pas disponible (paquet absent, hors ligne).
+    """
+    try:
+        return TransformerEncoder(model_name)
+    except Exception as error:  # ImportError, OSError, erreurs de téléchargement
+        logger.warning("Modèle %s indisponible (%s)", model_name, error)
+        return None
+
+
+def local_encoder(
+    texts, directory, corpus="textes", n_components=LOCAL_DIMENSIONS, refit=False
+):
+    """
+    Encodeur TF-IDF + SVD du corpus, conservé dans son magasin sous directory.
+
+    Le modèle enregistré est réutilisé ; il n'est ajusté sur texts qu'en
+    l'absence de modèle ou si refit. Un nouvel ajustement vide le magasin :
+    les vecteurs de l'ancien modèle ne seraient plus comparables.
+    """
+    encoder = TfidfSvdEncoder(n_components, corpus=corpus)
+    store_directory = os.path.join(directory, encoder.name)
+    model_path = os.path.join(store_directory, MODEL_FILE)
+    if not refit:
+        try:
+            return encoder.load(model_path)
+        except Exception:  # absent, incomplet ou d'une autre version de scikit-learn
+            pass
+    shutil.rmtree(store_directory, ignore_errors=True)
+    os.makedirs(store_directory, exist_ok=True)
+    return encoder.fit(texts).save(model_path)
+
+
+def text_keys(texts):
+    """
+    Empreinte (16 octets) du texte normalisé de chaque réponse.
+    """
+    return np.array(
+        [
+            hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+            for text in clean_texts(texts)
+        ],
+        dtype="S16",
+    )
+
+
+class EmbeddingStore:
+    """
+    Magasin de vecteurs sur disque pour un encodeur.
+
+    Chaque lot de textes encodés forme un fragment : ses vecteurs
+    (*.vectors.npy), puis les empreintes de ses textes (*.keys.npy), écrites
+    en dernier, qui le rendent visible. Les fichiers d'empreintes forment
+    l'index du magasin ; un ajout n'écrit que son fragment, ouvert ensuite
+    en mémoire partagée (mmap) comme les autres. Au-delà de MAX_SHARDS
+    fragments, le magasin est compacté en un seul. Les fragments écrits par
+    d'autres processus sont chargés au prochain encodage.
+    """
+
+    def __init__(self, directory, encoder):
+        self.encoder = encoder
+        self.directory = os.path.join(directory, encoder.name)
+        self._lock = threading.Lock()
+        self._reset()
+        self._refresh()
+
+    def _reset(self):
+        self._loaded = []
+        self._shards = []
+        self._offsets = [0]
+        self._positions = {}
+
+    def _shard_files(self):
+        """
+        Couples (empreintes, vecteurs) des fragments, du plus ancien au plus récent.
+        """
+        try:
+            files = set(os.listdir(self.directory))
+        except FileNotFoundError:
+            return []
+        shards = sorted(
+            f[: -len(KEYS_SUFFIX)] for f in files if f.endswith(KEYS_SUFFIX)
+        )
+        return [
+            (f"{shard}{KEYS_SUFFIX}", f"{shard}{VECTORS_SUFFIX}") for shard in shards
+        ]
+
+    def _refresh(self):
+        """
+        Charge les fragments apparus depuis le dernier appel.
+        """
+        for keys_file, vectors_file in self._shard_files():
+            if keys_file in self._loaded:
+                continue
+            try:
+                keys = np.load(os.path.join(self.directory, keys_file))
+                vectors = np.load(
+                    os.path.join(self.directory, vectors_file), mmap_mode="r"
+                )
+            except (OSError, ValueError):
+                continue
+            if len(vectors) != len(keys):
+                continue
+            start = self._offsets[-1]
+            for i, key in enumerate(keys.tolist()):
+                self._positions.setdefault(key, start + i)
+            self._loaded.append(keys_file)
+            self._shards.append(vectors)
+            self._offsets.append(start + len(keys))
+
+    def _gather(self, positions):
+        """
+        Vecteurs des positions (tous fragments confondus).
+        """
+        shards = np.searchsorted(self._offsets, positions, side="right") - 1
+        vectors = np.empty((len(positions), self._shards[0].shape[1]), np.float32)
+        for shard in np.unique(shards):
+            selected = shards == shard
+            vectors[selected] = self._shards[shard][
+                positions[selected] - self._offsets[shard]
+            ]
+        return vectors
+
+    def _write_shard(self, keys, vectors):
+        path = os.path.join(
+            self.directory, f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        )
+        suffix = f".{os.getpid()}.tmp.npy"
+        np.save(path + VECTORS_SUFFIX + suffix, vectors)
+        os.replace(path + VECTORS_SUFFIX + suffix, path + VECTORS_SUFFIX)
+        np.save(path + KEYS_SUFFIX + suffix, keys)
+        os.replace(path + KEYS_SUFFIX + suffix, path + KEYS_SUFFIX)
+
+    def _append(self, keys, vectors):
+        os.makedirs(self.directory, exist_ok=True)
+        merged = []
+        if len(self._shards) + 1 > MAX_SHARDS:
+            # Compactage : les vecteurs connus et le lot dans un seul fragment
+            positions = np.fromiter(self._positions.values(), np.int64)
+            keys = np.concatenate([np.array(list(self._positions), "S16"), keys])
+            vectors = np.concatenate([self._gather(positions), vectors])
+            merged = [pair for pair in self._shard_files() if pair[0] in self._loaded]
+        self._write_shard(keys, vectors)
+        for pair in merged:
+            for name in pair:
+                with contextlib.suppress(OSError):
+                    os.remove(os.path.join(self.directory, name))
+        if merged:
+            self._reset()
+        self._refresh()
+
+    def __len__(self):
+        return len(self._positions)
+
+    def encode(self, texts):
+        """
+        Vecteurs des textes (matrice float32 alignée sur texts) ; seuls les
+        textes jamais vus sont encodés.
+        """
+        texts = pd.Series(texts, dtype=object).fillna("").astype(str)
+        keys = text_keys(texts)
+        with self._lock:
+            self._refresh()
+            missing = pd.unique(
+                np.array([key for key in keys.tolist() if key not in self._positions])
+            )
+            if len(missing):
+                first = {}
+                for text, key in zip(texts, keys.tolist()):
+                    first.setdefault(key, text)
+                new_texts = [first[key] for key in missing.tolist()]
+                vectors = np.concatenate(
+                    [
+                        self.encoder.encode(new_texts[start : start + BATCH_SIZE])
+                        for start in range(0, len(new_texts), BATCH_SIZE)
+                    ]
+                )
+                self._append(np.asarray(missing, dtype="S16"), vectors)
+            positions = np.array(
+                [self._positions[key] for key in keys.tolist()], dtype=np.int64
+            )
+            if not len(positions):
+                return np.empty((0, 0), dtype=np.float32)
+            return self._gather(positions)
+
+
+class EmbeddingSet:
+    """
+    Vecteurs des réponses non vides d'une colonne de texte libre.
+
+    positions : lignes (positions de data_loader.load_dataset) des réponses
+    encodées ; vectors : leurs vecteurs, dans le même ordre.
+    """
+
+    def __init__(self, positions, vectors, texts, encoder_name, version=None):
+        self.positions = np.asarray(positions, dtype=np.int64)
+        self.vectors = vectors
+        self.texts = np.asarray(texts, dtype=object)
+        self.encoder_name = encoder_name
+        self.version = version
+
+    def select(self, rows=None):
+        """
+        Indices (dans vectors) des réponses des lignes rows (toutes si None).
+        """
+        if rows is None:
+            return np.arange(len(self.positions))
+        return np.flatnonzero(np.isin(self.positions, rows))
+
+
+def build_embeddings(
+    texts,
+    directory,
+    encoder="auto",
+    min_length=10,
+    version=None,
+    corpus=None,
+    refit=False,
+):
+    """
+    Encode les réponses de plus de min_length caractères d'une colonne.
+
+    encoder : "transformer", "local", ou "auto" (le modèle s'il est
+    disponible, sinon l'encodeur local). corpus nomme le magasin de
+    l'encodeur local (le nom de la série par défaut) ; refit le réajuste
+    sur texts au lieu de réutiliser le modèle enregistré.
+    """
+    corpus = corpus or getattr(texts, "name", None) or "textes"
+    texts = pd.Series(texts, dtype=object).fillna("").astype(str).reset_index(drop=True)
+    positions = np.flatnonzero(texts.str.len().to_numpy() > min_length)
+    selected = texts.iloc[positions]
+    if not len(selected):
+        vectors = np.empty((0, 0), dtype=np.float32)
+        return EmbeddingSet(positions, vectors, [], None, version)
+    model = transformer_encoder() if encoder in ("auto", "transformer") else None
+    if model is None:
+        if encoder == "transformer":
+            raise RuntimeError(f"Modèle {TRANSFORMER_MODEL} indisponible")
+        model = local_encoder(selected, directory, corpus, refit=refit)
+    store = EmbeddingStore(directory, model)
+    return EmbeddingSet(
+        positions, store.encode(selected), selected.to_numpy(), model.name, version
+    )
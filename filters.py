@@ -0,0 +1,96 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+
+def filter_state_hash(rows, n_rows):
+    """
+    Empreinte canonique des lignes retenues : deux sélections qui retiennent
+    les mêmes lignes partagent la même empreinte.
+
+    rows : positions retenues, ou None pour les n_rows lignes.
+    """
+    if rows is None:
+        return ("all", n_rows)
+    rows = np.ascontiguousarray(rows, dtype=np.int64)
+    return hashlib.blake2b(rows.tobytes(), digest_size=16).hexdigest()
+
+
+class FilterEngine:
+    """
+    Moteur de filtres par masques de bits précalculés.
+
+    Pour chaque (colonne, valeur) un masque de lignes compressé (np.packbits) est
+    calculé une fois au chargement. Une sélection de la barre latérale se réduit
+    alors à des OU / ET bit à bit, sans copier le DataFrame.
+
+    key : si df est une table de dimension, numéro de sa ligne pour chaque
+    réponse (-1 si inconnu). Les masques sont alors calculés sur la dimension
+    puis propagés aux réponses.
+    """
+
+    def __init__(self, df, columns, key=None):
+        self.n_rows = len(df)
+        self.columns = list(columns)
+        self.key = None if key is None else np.asarray(key)
+        self._values = {}
+        self._bitsets = {}
+        for column in self.columns:
+            codes, uniques = pd.factorize(df[column], sort=True)
+            masks = codes[np.newaxis, :] == np.arange(len(uniques))[:, np.newaxis]
+            self._values[column] = list(uniques)
+            self._bitsets[column] = np.packbits(masks, axis=1)
+
+    def _all_rows(self):
+        return np.packbits(np.ones(self.n_rows, dtype=bool))
+
+    def _column_bits(self, column, selected):
+        """
+        Union des masques des valeurs sélectionnées d'une colonne.
+        """
+        positions = {value: i for i, value in enumerate(self._values[column])}
+        rows = [positions[value] for value in selected if value in positions]
+        if not rows:
+            return np.zeros_like(self._all_rows())
+        return np.bitwise_or.reduce(self._bitsets[column][rows], axis=0)
+
+    def packed_mask(self, selections):
+        """
+        Masque compressé des lignes retenues.
+
+        selections : {colonne: valeurs retenues}. Une colonne absente n'est pas filtrée,
+        une liste vide ne retient aucune ligne.
+        """
+        packed = self._all_rows()
+        for column, selected in selections.items():
+            packed &= self._column_bits(column, selected)
+        return packed
+
+    def mask(self, selections):
+        """
+        Masque booléen des lignes retenues.
+        """
+        packed = self.packed_mask(selections)
+        mask = np.unpackbits(packed, count=self.n_rows).astype(bool)
+        if self.key is not None:
+            # Ligne de dimension -> réponses ; une clé -1 (valeurs manquantes)
+            # n'est retenue que si aucune colonne n'est filtrée
+            mask = np.append(mask, not selections)[self.key]
+        return mask
+
+    def indices(self, selections):
+        """
+        Positions des lignes retenues, à transmettre aux graphiques.
+        """
+        return np.flatnonzero(self.mask(selections))
+
+    def values(self, column, selections=None):
+        """
+        Valeurs triées de la colonne, restreintes aux lignes retenues par selections.
+        """
+        if not selections:
+            return list(self._values[column])
+        packed = self.packed_mask(selections)
+        present = (self._bitsets[column] & packed).any(axis=1)
+        return [value for value, keep in zip(self._values[column], present) if keep]
@@ -0,0 +1,165 @@
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from parallel import MAX_WORKERS, get_pool
+
+# Niveau de confiance des intervalles affichés
+CONFIDENCE = 0.95
+# Nombre de rééchantillonnages du bootstrap
+BOOTSTRAP_REPLICATES = 1000
+# Taille maximale (cases) de la matrice poids x répondants d'un lot de
+# rééchantillonnages
+BATCH_CELLS = 1 << 22
+# À partir de ce nombre de sélections, le bootstrap des réponses multiples est
+# réparti sur le pool de processus partagé (parallel.get_pool)
+PARALLEL_MIN_SELECTIONS = 50_000
+
+# Méthodes proposées par la barre latérale
+METHODS = {"Wilson": "wilson", "Bootstrap": "bootstrap", "Aucun": None}
+
+
+def wilson_interval(counts, n, confidence=CONFIDENCE):
+    """
+    Intervalles de Wilson (low, high) des proportions counts / n.
+    """
+    counts = np.asarray(counts, dtype=float)
+    n = np.broadcast_to(np.asarray(n, dtype=float), counts.shape)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p = counts / n
+        denominator = 1 + z**2 / n
+        center = (p + z**2 / (2 * n)) / denominator
+        half = z * np.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / denominator
+    low = np.where(n > 0, np.clip(center - half, 0, 1), np.nan)
+    high = np.where(n > 0, np.clip(center + half, 0, 1), np.nan)
+    return low, high
+
+
+def _quantiles(shares, confidence):
+    alpha = 1 - confidence
+    return np.quantile(shares, [alpha / 2, 1 - alpha / 2], axis=0)
+
+
+def bootstrap_interval(
+    counts, replicates=BOOTSTRAP_REPLICATES, confidence=CONFIDENCE, seed=0
+):
+    """
+    Intervalles bootstrap (low, high) des parts d'une question à choix unique.
+
+    Les répondants sont rééchantillonnés d'un coup : une matrice multinomiale
+    (replicates x modalités) tirée selon les comptages observés.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    n = int(counts.sum())
+    if n == 0:
+        return np.full(len(counts), np.nan), np.full(len(counts), np.nan)
+    rng = np.random.default_rng(seed)
+    samples = rng.multinomial(n, counts / n, size=replicates) / n
+    low, high = _quantiles(samples, confidence)
+    return low, high
+
+
+def _bootstrap_selections(
+    respondents, codes, n_respondents, n_options, replicates, seed
+):
+    """
+    Parts des options sur replicates rééchantillonnages des répondants.
+
+    codes : option (0 à n_options - 1) de chaque sélection.
+    """
+    rng = np.random.default_rng(seed)
+    # Sélections de chaque répondant (répondants x options)
+    selections = np.zeros((n_respondents, n_options), dtype=np.float32)
+    np.add.at(selections, (respondents, codes), 1)
+    uniform = np.full(n_respondents, 1 / n_respondents)
+    batch = max(1, BATCH_CELLS // n_respondents)
+    shares = []
+    for start in range(0, replicates, batch):
+        size = min(batch, replicates - start)
+        # Poids de chaque répondant dans chaque rééchantillonnage
+        weights = rng.multinomial(n_respondents, uniform, size=size)
+        counts = weights.astype(np.float32) @ selections
+        total = counts.sum(axis=1, keepdims=True)
+        shares.append(counts / np.maximum(total, 1))
+    return np.concatenate(shares)
+
+
+def multi_bootstrap_interval(
+    respondents,
+    codes,
+    n_respondents,
+    n_options,
+    replicates=BOOTSTRAP_REPLICATES,
+    confidence=CONFIDENCE,
+    seed=0,
+):
+    """
+    Intervalles bootstrap (low, high) des parts d'une question à réponses
+    multiples, en rééchantillonnant les répondants (et toutes leurs sélections).
+
+    Les rééchantillonnages sont répartis sur le pool de processus pour les
+    grandes questions.
+    """
+    if n_respondents == 0:
+        return np.full(n_options, np.nan), np.full(n_options, np.nan)
+    workers = MAX_WORKERS if len(codes) >= PARALLEL_MIN_SELECTIONS else 1
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    chunks = np.array_split(np.arange(replicates), workers)
+    if workers == 1:
+        shares = _bootstrap_selections(
+            respondents, codes, n_respondents, n_options, replicates, seeds[0]
+        )
+    else:
+        futures = [
+            get_pool().submit(
+                _bootstrap_selections,
+                respondents,
+                codes,
+                n_respondents,
+                n_options,
+                len(chunk),
+                chunk_seed,
+            )
+            for chunk, chunk_seed in zip(chunks, seeds)
+        ]
+        shares = np.concatenate([future.result() for future in futures])
+    low, high = _quantiles(shares, confidence)
+    return low, high
+
+
+def proportion_intervals(
+    value_counts, method="wilson", answers=None, rows=None, confidence=CONFIDENCE
+):
+    """
+    Intervalles de confiance des parts affichées value_counts / total.
+
+    method : "wilson" (analytique) ou "bootstrap". Pour une question à
+    réponses multiples (answers, index MultiAnswerIndex, et rows, positions
+    retenues), le bootstrap rééchantillonne les répondants ; Wilson prend le
+    nombre de sélections comme effectif. Retourne un DataFrame (low, high)
+    aligné sur value_counts.
+    """
+    counts = value_counts.to_numpy()
+    question = value_counts.index.name
+    if method == "bootstrap" and answers is not None and question in answers:
+        respondents, codes = answers.question_codes(question)
+        selected = np.arange(answers.n_respondents) if rows is None else rows
+        selected = np.asarray(selected, dtype=np.int64)
+        position = np.full(answers.n_respondents, -1)
+        position[selected] = np.arange(len(selected))
+        local = pd.Index(value_counts.index).get_indexer(answers.options)[codes]
+        keep = (position[respondents] >= 0) & (local >= 0)
+        low, high = multi_bootstrap_interval(
+            position[respondents][keep],
+            local[keep],
+            len(selected),
+            len(counts),
+            confidence=confidence,
+        )
+    elif method == "bootstrap":
+        low, high = bootstrap_interval(counts, confidence=confidence)
+    else:
+        low, high = wilson_interval(counts, counts.sum(), confidence)
+    return pd.DataFrame({"low": low, "high": high}, index=value_counts.index)
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+
+class LikertScales:
+    """
+    Registre des échelles ordinales d'un jeu de données (questionnaire.LIKERT_SCALES).
+
+    Les comptages de toutes les échelles sont lus d'un coup dans les totaux
+    d'un AggregateCounts, sous forme d'une matrice (questions x niveaux) ;
+    médiane, top-2-box et score moyen en découlent en une passe NumPy.
+    """
+
+    def __init__(self, scales):
+        self.scales = scales
+        self.questions = list(scales)
+        self.width = max(len(scale["levels"]) for scale in scales.values())
+
+    def levels(self, question):
+        return self.scales[question]["levels"]
+
+    def level_counts(self, aggregate, questions=None):
+        """
+        Matrice (questions x niveaux) des comptages, complétée par des zéros.
+        """
+        questions = self.questions if questions is None else list(questions)
+        positions = np.full((len(questions), self.width), -1)
+        for i, question in enumerate(questions):
+            levels = self.levels(question)
+            positions[i, : len(levels)] = aggregate.positions(question, levels)
+        # La dernière case, toujours nulle, sert aux niveaux absents
+        totals = np.append(aggregate.totals, 0)
+        return totals[positions]
+
+    def summary(self, aggregate, questions=None):
+        """
+        Statistiques ordinales de chaque échelle pour un état des filtres.
+
+        n : réponses sur l'échelle (hors réponses exclues) ; mediane : niveau
+        médian ; top2 : part des deux niveaux les plus hauts ; score : score
+        moyen, les niveaux valant 1 à niveaux.
+        """
+        questions = self.questions if questions is None else list(questions)
+        counts = self.level_counts(aggregate, questions).astype(float)
+        n_levels = np.array([len(self.levels(q)) for q in questions])
+        ranks = np.arange(self.width)
+
+        n = counts.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cumulative = counts.cumsum(axis=1)
+            median = (cumulative >= n[:, np.newaxis] / 2).argmax(axis=1)
+            top2 = (counts * (ranks >= n_levels[:, np.newaxis] - 2)).sum(axis=1) / n
+            score = (counts * (ranks + 1)).sum(axis=1) / n
+
+        return pd.DataFrame(
+            {
+                "n": n.astype(int),
+                "mediane": [
+                    self.levels(q)[m] if total else None
+                    for q, m, total in zip(questions, median, n)
+                ],
+                "top2": top2,
+                "score": score,
+                "niveaux": n_levels,
+            },
+            index=pd.Index(questions, name="question"),
+        )
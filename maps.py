@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+# Longueur d'un degré de latitude (km)
+KM_PER_DEGREE = 111.32
+
+
+class EstablishmentMap:
+    """
+    Points de carte agrégés par établissement ou par maille.
+
+    establishments : table des établissements ; codes : numéro d'établissement
+    de chaque réponse (-1 si inconnu). Une sélection de lignes se réduit à un
+    np.bincount sur leurs numéros. Seules les colonnes latitude, longitude,
+    count et label sont envoyées au navigateur.
+    """
+
+    def __init__(self, establishments, codes, label="Nom_etab"):
+        self._codes = np.asarray(codes)
+        self.n_rows = len(self._codes)
+        self.establishments = pd.DataFrame(
+            {
+                "latitude": establishments["latitude"].to_numpy(),
+                "longitude": establishments["longitude"].to_numpy(),
+                "label": establishments[label].astype(str).to_numpy(),
+            }
+        )
+
+    def counts(self, rows=None):
+        """
+        Nombre de réponses par établissement pour les positions rows (toutes si None).
+        """
+        codes = self._codes if rows is None else self._codes[rows]
+        return np.bincount(codes[codes >= 0], minlength=len(self.establishments))
+
+    def by_establishment(self, rows=None):
+        """
+        Un point par établissement représenté : latitude, longitude, count, label.
+        """
+        points = self.establishments.assign(count=self.counts(rows))
+        points = points[(points["count"] > 0) & points["latitude"].notna()]
+        return points[["latitude", "longitude", "count", "label"]].reset_index(
+            drop=True
+        )
+
+    def by_grid(self, rows=None, cell_km=10):
+        """
+        Un point par maille carrée de cell_km km, placé au barycentre des réponses.
+        """
+        points = self.by_establishment(rows)
+        if points.empty:
+            return points
+        lat_step = cell_km / KM_PER_DEGREE
+        lon_step = lat_step / np.cos(np.radians(points["latitude"].mean()))
+        cells = pd.DataFrame(
+            {
+                "lat_cell": np.floor(points["latitude"] / lat_step),
+                "lon_cell": np.floor(points["longitude"] / lon_step),
+                "lat_weighted": points["latitude"] * points["count"],
+                "lon_weighted": points["longitude"] * points["count"],
+                "count": points["count"],
+                "establishments": 1,
+            }
+        )
+        grid = cells.groupby(["lat_cell", "lon_cell"], sort=False).sum()
+        return pd.DataFrame(
+            {
+                "latitude": grid["lat_weighted"] / grid["count"],
+                "longitude": grid["lon_weighted"] / grid["count"],
+                "count": grid["count"],
+                "label": grid["establishments"].astype(str) + " établissement(s)",
+            }
+        ).reset_index(drop=True)
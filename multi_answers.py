@@ -0,0 +1,168 @@
+import logging
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=64)
+def _answer_pattern(options, separator):
+    """
+    Expression compilée reconnaissant une option par correspondance.
+
+    Ordre de priorité : option entre guillemets, option connue du catalogue
+    (la plus longue d'abord, virgules comprises), puis fragment libre.
+    """
+    sep = re.escape(separator)
+    alternatives = [r'"(?P<quoted>[^"]*)"']
+    if options:
+        known = "|".join(re.escape(o) for o in sorted(options, key=len, reverse=True))
+        alternatives.append(f"(?P<known>{known})")
+    alternatives.append(f"(?P<other>[^{sep}]*?)")
+    return re.compile(r"\s*(?:" + "|".join(alternatives) + rf")\s*(?:{sep}|$)")
+
+
+def split_answers(values, separator=",", options=None):
+    """
+    Éclate une série de réponses multiples en une série longue (une option par ligne).
+
+    Les options entre guillemets et celles du catalogue (options) restent
+    entières même si elles contiennent le séparateur. L'index de la série
+    retournée est celui de la ligne d'origine.
+    """
+    values = values.dropna()
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Découper chaque modalité distincte une seule fois, puis propager par les codes
+        categories = pd.Series(values.cat.categories.astype(str))
+        parts = split_answers(categories, separator, options).rename("option")
+        exploded = values.cat.codes.to_frame("code").join(parts, on="code", how="inner")
+        return exploded["option"]
+
+    pattern = _answer_pattern(tuple(options or ()), separator)
+    matches = values.astype(str).str.extractall(pattern)
+    parts = matches["quoted"].fillna(matches["other"])
+    if "known" in matches:
+        parts = matches["known"].fillna(parts)
+    # La correspondance vide en fin de chaîne ne produit aucun groupe
+    parts = parts.dropna().str.strip().droplevel("match").rename(values.name)
+    return parts[parts != ""]
+
+
+def unknown_options(parts, options):
+    """
+    Comptage des fragments absents du catalogue d'options.
+    """
+    unknown = parts[~parts.isin(list(options))]
+    return unknown.value_counts()
+
+
+def explode_multi_answers(df, columns, separator=",", options=None):
+    """
+    Construit la table longue (respondent_id, question, option) des réponses multiples.
+
+    respondent_id est la position de la ligne dans df. options associe à chaque
+    question la liste de ses modalités connues. Les fragments hors catalogue
+    sont conservés tels quels et retournés à part pour être signalés.
+    """
+    options = options or {}
+    positions = pd.Series(np.arange(len(df)), index=df.index)
+    frames = []
+    unknown = {}
+    for column in columns:
+        parts = split_answers(df[column], separator, options.get(column))
+        if column in options:
+            counts = unknown_options(parts, options[column])
+            if len(counts):
+                unknown[column] = counts
+        frames.append(
+            pd.DataFrame(
+                {
+                    "respondent_id": positions.loc[parts.index].to_numpy(),
+                    "question": column,
+                    "option": parts.to_numpy(),
+                }
+            )
+        )
+
+    if frames:
+        table = pd.concat(frames, ignore_index=True)
+    else:
+        table = pd.DataFrame(columns=["respondent_id", "question", "option"])
+    table["respondent_id"] = table["respondent_id"].astype(np.int64)
+    table["question"] = pd.Categorical(table["question"], categories=list(columns))
+    table["option"] = table["option"].astype("category")
+    return table, unknown
+
+
+class MultiAnswerIndex:
+    """
+    Index des réponses multiples éclaté une fois au chargement.
+
+    Les comptages se font par codes catégoriels, restreints aux répondants filtrés.
+    """
+
+    def __init__(self, table, n_respondents, unknown=None):
+        self.table = table
+        self.n_respondents = n_respondents
+        # Options hors catalogue par question (comptages)
+        self.unknown = unknown or {}
+        self.options = table["option"].cat.categories
+        self._questions = {}
+        option_codes = table["option"].cat.codes.to_numpy()
+        respondents = table["respondent_id"].to_numpy()
+        question_codes = table["question"].cat.codes.to_numpy()
+        for code, question in enumerate(table["question"].cat.categories):
+            rows = question_codes == code
+            self._questions[question] = (respondents[rows], option_codes[rows])
+
+    @classmethod
+    def from_frame(cls, df, columns, separator=",", options=None):
+        """
+        Construit l'index à partir d'un DataFrame et de ses colonnes à réponses multiples.
+        """
+        table, unknown = explode_multi_answers(df, columns, separator, options)
+        for question, counts in unknown.items():
+            logger.warning(
+                "%s : %d option(s) hors catalogue (%s)",
+                question,
+                len(counts),
+                ", ".join(counts.index[:5]),
+            )
+        return cls(table, len(df), unknown)
+
+    def __contains__(self, question):
+        return question in self._questions
+
+    @property
+    def questions(self):
+        return list(self._questions)
+
+    def question_codes(self, question):
+        """
+        Tableaux (respondent_id, code d'option) des sélections d'une question.
+
+        Les codes sont des positions dans self.options.
+        """
+        return self._questions[question]
+
+    def counts(self, question, respondent_ids=None):
+        """
+        Nombre de sélections de chaque option, trié par ordre décroissant.
+
+        respondent_ids : positions des répondants retenus par les filtres (tous si None).
+        """
+        respondents, codes = self._questions[question]
+        if respondent_ids is not None:
+            selected = np.zeros(self.n_respondents, dtype=bool)
+            selected[np.asarray(respondent_ids, dtype=np.int64)] = True
+            codes = codes[selected[respondents]]
+
+        counts = np.bincount(codes, minlength=len(self.options))
+        present = np.flatnonzero(counts)
+        value_counts = pd.Series(
+            counts[present], index=pd.Index(self.options[present], name=question)
+        )
+        return value_counts.sort_values(ascending=False, kind="stable")
@@ -0,0 +1,237 @@
+"""
+Regroupement des réponses libres quasi identiques (MinHash + LSH).
+
+Les réponses sont d'abord normalisées (text_analysis.clean_texts) : les
+doublons exacts ne sont traités qu'une fois. Chaque réponse distincte reçoit
+une signature MinHash de ses trigrammes de caractères ; le hachage sensible à
+la localité (bandes de la signature) ne propose que des paires candidates,
+vérifiées sur la similarité estimée, sans comparer toutes les paires.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+
+from text_analysis import clean_texts
+
+# Similarité de Jaccard (trigrammes) à partir de laquelle deux réponses sont
+# considérées comme des variantes
+THRESHOLD = 0.7
+# Taille des signatures : BANDS bandes de NUM_PERM / BANDS valeurs
+NUM_PERM = 64
+BANDS = 16
+# Taille maximale (cases) d'un lot trigrammes x permutations
+BATCH_CELLS = 1 << 22
+
+
+def _trigrams(texts):
+    """
+    Trigrammes de caractères de réponses nettoyées (ASCII), codés en entiers
+    sur 24 bits, et nombre de trigrammes de chaque réponse.
+
+    Chaque réponse est entourée d'espaces : une réponse d'un caractère a
+    encore un trigramme.
+    """
+    padded = [f" {text} " for text in texts]
+    lengths = np.array([len(text) for text in padded], dtype=np.int64)
+    chars = np.frombuffer(
+        "".join(padded).encode("ascii", "replace"), dtype=np.uint8
+    ).astype(np.uint64)
+    counts = lengths - 2
+    # Début de chaque trigramme : toutes les positions sauf les deux dernières
+    # de chaque réponse
+    starts = np.repeat(np.cumsum(lengths) - lengths, counts)
+    starts += np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    trigrams = (
+        (chars[starts] << np.uint64(16))
+        | (chars[starts + 1] << np.uint64(8))
+        | chars[starts + 2]
+    )
+    return trigrams, counts
+
+
+def minhash_signatures(texts, num_perm=NUM_PERM, seed=0):
+    """
+    Signatures MinHash (réponses x num_perm, uint64) de réponses nettoyées.
+
+    Chaque permutation est un hachage affine a * h + b (modulo 2**64) des
+    trigrammes ; le minimum par réponse est pris en une passe
+    (np.minimum.reduceat) sur des lots de réponses.
+    """
+    hashes, counts = _trigrams(texts)
+    rng = np.random.default_rng(seed)
+    high = np.iinfo(np.int64).max
+    a = rng.integers(0, high, size=num_perm, dtype=np.int64).astype(np.uint64)
+    a |= np.uint64(1)
+    b = rng.integers(0, high, size=num_perm, dtype=np.int64).astype(np.uint64)
+    signatures = np.empty((num_perm, len(counts)), dtype=np.uint64)
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    # Lots de réponses pour borner la matrice permutations x trigrammes
+    mean_count = max(1, int(counts.mean())) if len(counts) else 1
+    step = max(1, BATCH_CELLS // (num_perm * mean_count))
+    with np.errstate(over="ignore"):
+        for start in range(0, len(counts), step):
+            end = min(start + step, len(counts))
+            block = hashes[offsets[start] : offsets[end]]
+            mixed = a[:, None] * block[None, :] + b[:, None]
+            signatures[:, start:end] = np.minimum.reduceat(
+                mixed, offsets[start:end] - offsets[start], axis=1
+            )
+    return np.ascontiguousarray(signatures.T)
+
+
+def _band_keys(signatures, bands):
+    """
+    Clé de hachage de chaque bande de chaque signature (réponses x bandes).
+    """
+    rows = signatures.shape[1] // bands
+    keys = np.empty((len(signatures), bands), dtype=np.uint64)
+    for band in range(bands):
+        block = signatures[:, band * rows : (band + 1) * rows]
+        keys[:, band] = pd.util.hash_pandas_object(pd.DataFrame(block), index=False)
+    return keys
+
+
+def similar_pairs(signatures, bands=BANDS, threshold=THRESHOLD):
+    """
+    Paires (i, j) de signatures qui partagent une bande et dont la similarité
+    estimée atteint threshold.
+
+    Dans chaque seau, chaque membre n'est comparé qu'au premier : le nombre de
+    comparaisons reste proportionnel au nombre de réponses.
+    """
+    keys = _band_keys(signatures, bands)
+    firsts, members = [], []
+    for band in range(bands):
+        order = np.argsort(keys[:, band], kind="stable")
+        sorted_keys = keys[order, band]
+        starts = np.ones(len(order), dtype=bool)
+        starts[1:] = sorted_keys[1:] != sorted_keys[:-1]
+        first = order[np.maximum.accumulate(np.where(starts, np.arange(len(order)), 0))]
+        linked = ~starts
+        firsts.append(first[linked])
+        members.append(order[linked])
+    first = np.concatenate(firsts or [np.empty(0, dtype=np.int64)]).astype(np.int64)
+    member = np.concatenate(members or [np.empty(0, dtype=np.int64)]).astype(np.int64)
+    # Paires vues dans plusieurs bandes : une seule fois
+    pairs = np.unique(first * len(signatures) + member)
+    first, member = pairs // len(signatures), pairs % len(signatures)
+    similarity = (signatures[first] == signatures[member]).mean(axis=1)
+    keep = similarity >= threshold
+    return first[keep], member[keep]
+
+
+def _assign_leaders(first, member, frequency):
+    """
+    Représentant de chaque réponse distincte.
+
+    Les réponses sont parcourues de la plus fréquente à la moins fréquente ;
+    une réponse sans représentant devient celui de ses voisines encore libres.
+    Chaque variante est ainsi directement similaire à son représentant (pas
+    de chaînage de proche en proche).
+    """
+    n = len(frequency)
+    neighbours = coo_matrix(
+        (
+            np.ones(2 * len(first), dtype=np.int8),
+            (np.r_[first, member], np.r_[member, first]),
+        ),
+        shape=(n, n),
+    ).tocsr()
+    leaders = np.full(n, -1, dtype=np.int64)
+    for document in np.lexsort((np.arange(n), -frequency)):
+        if leaders[document] >= 0:
+            continue
+        leaders[document] = document
+        linked = neighbours.indices[
+            neighbours.indptr[document] : neighbours.indptr[document + 1]
+        ]
+        linked = linked[leaders[linked] < 0]
+        leaders[linked] = document
+    return leaders
+
+
+class NearDuplicates:
+    """
+    Groupes de réponses quasi identiques d'une colonne de texte libre.
+
+    groups : groupe de chaque ligne (-1 pour une réponse vide) ;
+    representatives : pour chaque groupe, la ligne de son représentant
+    canonique, la variante la plus fréquente. Les lignes sont les positions de
+    data_loader.load_dataset.
+    """
+
+    def __init__(
+        self, texts, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS, seed=0
+    ):
+        texts = pd.Series(texts, dtype=object).reset_index(drop=True)
+        self.n_rows = len(texts)
+        self.raw = texts.to_numpy()
+        cleaned = clean_texts(texts)
+        codes, uniques = pd.factorize(cleaned.where(cleaned != ""))
+        uniques = np.asarray(uniques, dtype=object)
+        # Doublons exacts : une signature par réponse distincte
+        signatures = minhash_signatures(uniques, num_perm, seed)
+        first, member = similar_pairs(signatures, bands, threshold)
+        n_unique = len(uniques)
+        frequency = np.bincount(codes[codes >= 0], minlength=n_unique)
+        leaders = _assign_leaders(first, member, frequency)
+        # Groupes numérotés dans l'ordre des représentants
+        canonical, unique_groups = np.unique(leaders, return_inverse=True)
+        n_groups = len(canonical)
+        present = np.flatnonzero(codes >= 0)
+        _, first_row = np.unique(codes[present], return_index=True)
+        first_row = present[first_row]
+
+        self.groups = np.full(self.n_rows, -1, dtype=np.int64)
+        self.groups[present] = unique_groups[codes[present]]
+        self.representatives = first_row[canonical]
+        self.n_groups = n_groups
+        self._codes = codes
+
+    def sizes(self, rows=None):
+        """
+        Nombre de lignes de chaque groupe parmi rows (toutes si None).
+        """
+        groups = self.groups if rows is None else self.groups[rows]
+        return np.bincount(groups[groups >= 0], minlength=self.n_groups)
+
+    def collapse(self, rows=None):
+        """
+        Réponses uniques des lignes rows pondérées par leur fréquence :
+        (première ligne retenue de chaque groupe, nombre de lignes du groupe).
+        """
+        rows = np.arange(self.n_rows) if rows is None else np.asarray(rows)
+        rows = rows[self.groups[rows] >= 0]
+        groups, first, weights = np.unique(
+            self.groups[rows], return_index=True, return_counts=True
+        )
+        order = np.argsort(first, kind="stable")
+        return rows[first[order]], weights[order]
+
+    def summary(self, rows=None, n_top=None):
+        """
+        Groupes présents parmi rows, du plus grand au plus petit : représentant
+        canonique, nombre de réponses et nombre de variantes distinctes.
+        """
+        rows = np.arange(self.n_rows) if rows is None else np.asarray(rows)
+        rows = rows[self.groups[rows] >= 0]
+        sizes = np.bincount(self.groups[rows], minlength=self.n_groups)
+        pairs = np.unique(
+            np.stack([self.groups[rows], self._codes[rows]], axis=1), axis=0
+        )
+        variants = np.bincount(
+            pairs[:, 0] if len(pairs) else pairs[:0, 0], minlength=self.n_groups
+        )
+        present = np.flatnonzero(sizes)
+        present = present[np.argsort(-sizes[present], kind="stable")]
+        if n_top is not None:
+            present = present[:n_top]
+        return pd.DataFrame(
+            {
+                "representant": self.raw[self.representatives[present]],
+                "taille": sizes[present],
+                "variantes": variants[present],
+            },
+            index=pd.Index(present, name="groupe"),
+        )
@@ -1,37 +1,95 @@
 import streamlit as st
-import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils import create_pie_chart, create_pie_chart_split
+from data_loader import (
+    load_cluster_engine,
+    load_comparison,
+    load_cube,
+    load_establishment_map,
+    load_filter_engine,
+    load_multi_answers,
+    load_near_duplicates,
+    load_significance,
+    load_text_analyzer,
+    load_profs,
+    load_search_index,
+    memory_report,
+)
+from intervals import METHODS
+from likert import LikertScales
+from profiler import profile, render_profiler_panel, start_profiler
+from questionnaire import FREE_TEXT_QUESTIONS, LIKERT_SCALES
+from sections import SectionRegistry
+from utils import (
+    count_multi_answers,
+    count_values,
+    create_likert_chart,
+    create_pie_chart,
+    create_pie_chart_split,
+    format_share,
+    join_labels,
+)
+
+from widgets import (
+    search_panel,
+    show_clusters,
+    show_comment,
+    show_duplicates,
+    show_figure,
+    show_map,
+    significance_panel,
+    show_term_frequencies,
+)
 
 st.set_page_config(
     page_title="Données Professeurs - MotivIA", page_icon="📊", layout="wide"
 )
+# Profilage du rendu, affiché avec ?debug=profiler
+start_profiler("profs")
 
 st.title("📊 Analyse des données Professeurs")
 st.subheader("Questionnaire enseignants - Académie d'Orléans-Tours")
 
-# Charger les données
-df_original = pd.read_csv("Data/profs.csv", index_col=0)
-df_prof = df_original.copy()
-
-# Sidebar - Filtres
+# Colonnes utilisées par la page (l'établissement est lu dans sa propre table)
+COLONNES = [
+    "Discipline",
+    "Temps_enseignement",
+    "Freq_eval",
+    "grille",
+    "Preoccupation_IA",
+    "Freq_comm_ecrit",
+    "Difficultes_comm_ecrit",
+    "Trace_comm_ecrit",
+    "Lecture_comm_ecrit",
+    "Freq_comm_oral",
+    "Moment_comm_oral",
+    "Objectif_comm_oral",
+    "Comprehension_comm_oral",
+    "Questions_comm_oral",
+    "Eleve_mal_a_l_aise",
+    "Avantages_comm_oral",
+    "Inconveniants_oral",
+]
+
+# Charger les données (partagées entre les sessions, non modifiées)
+with profile("load"):
+    df_prof = load_profs(COLONNES)
+    answers_prof = load_multi_answers("profs")
+    filters_prof = load_filter_engine("profs")
+
+# Sidebar - Filtres : sélections {colonne: valeurs retenues}
 st.sidebar.header("🔍 Filtres")
-
-# Charger les données originales (avant filtrage)
-df_original = pd.read_csv("Data/profs.csv", index_col=0)
-df_prof = df_original.copy()
+selections = {}
 
 # Filtre par type d'établissement avec multiselect
-if "Type_etab" in df_prof.columns:
+if "Type_etab" in filters_prof.columns:
     st.sidebar.subheader("Type d'établissement")
 
     # Obtenir tous les types uniques
-    all_types = sorted(df_prof["Type_etab"].dropna().unique().tolist())
+    all_types = filters_prof.values("Type_etab")
 
     # Options de sélection rapide
     col1, col2 = st.sidebar.columns(2)
@@ -78,18 +136,16 @@ if "Type_etab" in df_prof.columns:
     )
 
     # Appliquer le filtre si des types sont sélectionnés
-    if selected_types:
-        df_prof = df_prof[df_prof["Type_etab"].isin(selected_types)]
-    else:
+    selections["Type_etab"] = selected_types
+    if not selected_types:
         st.sidebar.warning("⚠️ Aucun type sélectionné")
-        df_prof = df_prof.iloc[0:0]  # DataFrame vide
 
 # Filtre par département avec multiselect
-if "Departement" in df_prof.columns:
+if "Departement" in filters_prof.columns:
     st.sidebar.subheader("Département")
 
     # Obtenir les départements disponibles après le filtrage par type
-    available_depts = sorted(df_prof["Departement"].dropna().unique().tolist())
+    available_depts = filters_prof.values("Departement", selections)
 
     # Option pour tout sélectionner/désélectionner
     select_all_depts = st.sidebar.checkbox(
@@ -111,49 +167,75 @@ if "Departement" in df_prof.columns:
     )
 
     # Appliquer le filtre si des départements sont sélectionnés
-    if selected_depts:
-        df_prof = df_prof[df_prof["Departement"].isin(selected_depts)]
-    else:
+    selections["Departement"] = selected_depts
+    if not selected_depts:
         st.sidebar.warning("⚠️ Aucun département sélectionné")
-        df_prof = df_prof.iloc[0:0]  # DataFrame vide
+
+# Intervalles de confiance des pourcentages affichés
+st.sidebar.subheader("Intervalles de confiance")
+intervals_prof = METHODS[
+    st.sidebar.selectbox(
+        "Méthode",
+        list(METHODS),
+        help=(
+            "Wilson : calcul analytique. Bootstrap : rééchantillonnage des "
+            "répondants. Dans les commentaires, l'intervalle suit la part "
+            "entre crochets."
+        ),
+    )
+]
+
+# Positions des lignes retenues (aucune copie du DataFrame)
+with profile("filter"):
+    rows_prof = filters_prof.indices(selections)
+# Comptages de toutes les questions : somme des cellules retenues du cube
+with profile("aggregate"):
+    aggregate_prof = load_cube("profs").query(selections)
 
 # Afficher le nombre de résultats après filtrage
 st.sidebar.markdown("---")
 col1, col2 = st.sidebar.columns(2)
 with col1:
-    st.metric("Total filtré", len(df_prof))
+    st.metric("Total filtré", aggregate_prof.n_respondents)
 with col2:
-    st.metric("Total initial", len(df_original))
+    st.metric("Total initial", len(df_prof))
 
-if len(df_prof) == 0:
+if aggregate_prof.n_respondents == 0:
     st.warning("Aucune donnée ne correspond aux filtres sélectionnés")
 
 # with st.expander("Données 'brutes'"):
 #     st.dataframe(df_prof)
 
-tab1, tab2, tab3 = st.tabs(
-    ["Données de contexte", "Commentaires écrits", "Commentaires oraux"]
-)
+# Onglets, calculés uniquement lorsqu'ils sont affichés
+sections = SectionRegistry("onglets_profs")
 
-with tab1:
+
+@sections.register("Données de contexte")
+def donnees_contexte():
     st.header("Données de contexte")
 
-    st.metric(label="Nombre de réponses", value=len(df_prof))
+    st.metric(label="Nombre de réponses", value=aggregate_prof.n_respondents)
 
     with st.expander("Carte"):
-        st.map(
-            df_prof,
-            latitude="latitude",
-            longitude="longitude",
+        # Réponses agrégées côté serveur : une bulle par établissement ou par maille
+        mode = st.segmented_control(
+            "Regrouper par",
+            ["Établissement", "Maille"],
+            default="Établissement",
+            key="carte_mode",
         )
+        establishment_map = load_establishment_map()
+        if mode == "Maille":
+            cell_km = st.select_slider(
+                "Taille de maille (km)", [5, 10, 20, 50], value=10, key="carte_maille"
+            )
+            points = establishment_map.by_grid(rows_prof, cell_km)
+        else:
+            points = establishment_map.by_establishment(rows_prof)
+        show_map(points)
 
     # Agréger les données
-    df_pivot = (
-        df_prof.groupby(["Type_etab", "Departement"]).size().reset_index(name="count")
-    )
-    df_pivot = df_pivot.pivot(
-        index="Type_etab", columns="Departement", values="count"
-    ).fillna(0)
+    df_pivot = aggregate_prof.crosstab("Type_etab", "Departement")
 
     # Créer le graphique empilé
     fig = go.Figure()
@@ -188,102 +270,48 @@ with tab1:
         ),
         margin=dict(b=100),
     )
-    st.plotly_chart(fig, use_container_width=True)
+    show_figure(fig)
 
     col1, col2 = st.columns(2)
 
     with col1:
         # Répartition par matières
-        # Compter les occurrences de chaque discipline
-        discipline_counts = df_prof["Discipline"].value_counts()
-
-        # Version 1 : Diagramme circulaire simple avec px.pie
-        fig = px.pie(
-            values=discipline_counts.values,
-            names=discipline_counts.index,
-            title="Répartition des enseignants par discipline",
-            labels={"names": "Discipline", "values": "Nombre"},
-        )
-
-        fig.update_traces(
-            hovertemplate="<b>%{label}</b><br>Nombre: %{value}<br>Pourcentage: %{percent}<extra></extra>",
-        )
-
-        fig.update_layout(
-            showlegend=True,
-            legend=dict(orientation="v", yanchor="top", y=1, xanchor="left", x=1.02),
-            margin=dict(r=200),  # Marge à droite pour la légende
-            height=500,
+        fig = create_pie_chart(
+            df_prof,
+            "Discipline",
+            "Répartition des enseignants par discipline",
+            color_scheme="Plotly",
+            rows=rows_prof,
+            aggregate=aggregate_prof,
+            intervals=intervals_prof,
         )
-
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure(fig)
     with col2:
         # Temps enseignement
-
-        temps_counts = df_prof["Temps_enseignement"].value_counts()
-
-        # Diagramme circulaire
-        fig = px.pie(
-            values=temps_counts.values,
-            names=temps_counts.index,
-            title="Répartition par temps d'enseignement",
-            labels={"names": "Temps d'enseignement", "values": "Nombre"},
-            color_discrete_sequence=px.colors.qualitative.Set2,
-        )
-
-        # Personnaliser l'affichage
-        fig.update_traces(
-            textposition="inside",
-            textinfo="percent+label",
-            hovertemplate="<b>%{label}</b><br>Nombre: %{value}<br>Pourcentage: %{percent}<extra></extra>",
-        )
-
-        fig.update_layout(
-            showlegend=True,
-            legend=dict(orientation="v", yanchor="top", y=1, xanchor="left", x=1.02),
-            margin=dict(r=200),
-            height=500,
+        fig = create_pie_chart(
+            df_prof,
+            "Temps_enseignement",
+            "Répartition par temps d'enseignement",
+            rows=rows_prof,
+            aggregate=aggregate_prof,
+            intervals=intervals_prof,
         )
-
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure(fig)
 
     col1, col2 = st.columns(2)
     with col1:
-        # Fréquence d'évaluation
-        # Séparer les valeurs multiples et compter toutes les occurrences
-        freq_eval_list = []
-        for value in df_prof["Freq_eval"].dropna():
-            # Séparer par virgule et nettoyer les espaces
-            frequencies = [freq.strip() for freq in str(value).split(",")]
-            freq_eval_list.extend(frequencies)
-
-        # Compter les occurrences
-        freq_eval_counts = pd.Series(freq_eval_list).value_counts()
-
-        # Diagramme circulaire
-        fig = px.pie(
-            values=freq_eval_counts.values,
-            names=freq_eval_counts.index,
-            title="Fréquence d'évaluation des enseignants (réponses multiples comptées)",
-            labels={"names": "Fréquence d'évaluation", "values": "Nombre"},
-            color_discrete_sequence=px.colors.qualitative.Pastel,
-        )
-
-        # Personnaliser l'affichage
-        fig.update_traces(
-            textposition="inside",
-            textinfo="percent+label",
-            hovertemplate="<b>%{label}</b><br>Nombre: %{value}<br>Pourcentage: %{percent}<extra></extra>",
-        )
-
-        fig.update_layout(
-            showlegend=True,
-            legend=dict(orientation="v", yanchor="top", y=1, xanchor="left", x=1.02),
-            margin=dict(r=250),
-            height=500,
+        # Fréquence d'évaluation (réponses multiples)
+        fig = create_pie_chart_split(
+            df_prof,
+            "Freq_eval",
+            "Fréquence d'évaluation des enseignants (réponses multiples comptées)",
+            color_scheme="Pastel",
+            answers=answers_prof,
+            rows=rows_prof,
+            aggregate=aggregate_prof,
+            intervals=intervals_prof,
         )
-
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure(fig)
         st.markdown(
             """
             :material/Comment: :blue[Les évaluations sont régulières, voire très régulières.] 
@@ -292,7 +320,7 @@ with tab1:
 
         # Optionnel : afficher le nombre total de réponses
         st.caption(
-            f"Note : Total de {len(freq_eval_list)} réponses (certains enseignants ont sélectionné plusieurs fréquences)"
+            f"Note : Total de {aggregate_prof.counts('Freq_eval').sum()} réponses (certains enseignants ont sélectionné plusieurs fréquences)"
         )
 
     with col2:
@@ -300,12 +328,25 @@ with tab1:
             df_prof,
             "grille",
             "Usage d'une grille, des descripteurs ou des critères d'évaluation prédéfinis ",
+            rows=rows_prof,
+            aggregate=aggregate_prof,
+            intervals=intervals_prof,
         )
-        st.plotly_chart(fig1, use_container_width=True)
-        st.markdown(
-            """
-            :material/Comment: :blue[L'usage d'une grille est très répandu, 70% des répondants utilisent des grilles d'évaluation de manière régulière (souvent ou toujours), ce qui témoigne d'une volonté de structurer et objectiver l'évaluation.] 
-            """
+        show_figure(fig1)
+        grille = count_values(df_prof, "grille", rows_prof, aggregate_prof)
+        regulier = format_share(
+            grille,
+            [
+                "Souvent, pour la plupart des travaux",
+                "Toujours, pour tous les travaux",
+            ],
+            intervals_prof,
+        )
+        show_comment(
+            f"""
+            :material/Comment: :blue[L'usage d'une grille est très répandu, {regulier} des répondants utilisent des grilles d'évaluation de manière régulière (souvent ou toujours), ce qui témoigne d'une volonté de structurer et objectiver l'évaluation.] 
+            """,
+            grille,
         )
 
     fig1 = create_pie_chart_split(
@@ -314,147 +355,372 @@ with tab1:
         "Principales préoccupations concernant l'usage de l'IA pour les commentaires ?",
         color_scheme="Pastel",
         chart_type="bar",
+        answers=answers_prof,
+        rows=rows_prof,
+        aggregate=aggregate_prof,
+        intervals=intervals_prof,
     )
-    st.plotly_chart(fig1, use_container_width=True)
-    st.markdown(
-        """
-            :material/Comment: :blue[Les enseignants expriment trois préoccupations majeures d'égale importance (≈21% chacune) : la confidentialité des données élèves, la fiabilité des suggestions de l'IA et la protection des données, révélant une inquiétude centrale autour de la sécurité et de la pertinence pédagogique de l'outil.] 
-            """
+    show_figure(fig1)
+    preoccupations = count_multi_answers(
+        df_prof,
+        "Preoccupation_IA",
+        answers=answers_prof,
+        rows=rows_prof,
+        aggregate=aggregate_prof,
+    )
+    principales = join_labels(
+        f"« {option} » ({format_share(preoccupations, [option], intervals_prof)})"
+        for option in preoccupations.nlargest(3).index
+    )
+    show_comment(
+        f"""
+            :material/Comment: :blue[Les préoccupations les plus citées par les enseignants sont {principales}.] 
+            """,
+        preoccupations,
     )
 
-    with tab2:
-        col1, col2 = st.columns(2)
-        with col1:
-            fig1 = create_pie_chart(
-                df_prof,
-                "Freq_comm_ecrit",
-                "Fréquence des commentaires écrits ",
-            )
-            st.plotly_chart(fig1, use_container_width=True)
-        with col2:
-            fig1 = create_pie_chart_split(
-                df_prof,
-                "Difficultes_comm_ecrit",
-                "Difficulités lors des commentaires écrits ",
-                chart_type="bar",
-            )
-            st.plotly_chart(fig1, use_container_width=True)
-            st.markdown(
-                """
-            :material/Comment: :blue[Le manque d'impact perçu sur les élèves domine (39 réponses), suivi du manque de temps général (33) et de la répétitivité des commentaires (28), suggérant que la contrainte temporelle est le principal frein à la production de commentaires personnalisés et de qualité.] 
-            """
-            )
 
-        col1, col2 = st.columns(2)
-        with col1:
-            fig1 = create_pie_chart(
-                df_prof,
-                "Trace_comm_ecrit",
-                "Gardez-vous une trace de vos commentaires écrits ? ",
-            )
-            st.plotly_chart(fig1, use_container_width=True)
-        with col2:
-            fig1 = create_pie_chart(
-                df_prof,
-                "Lecture_comm_ecrit",
-                "Lecture des commentaires par les élèves ",
-            )
-            st.plotly_chart(fig1, use_container_width=True)
-            st.markdown(
-                """
-                :material/Comment: :blue[Les 3/4 des enseignants pensent que les élèves ne lisent pas les commentaires écrit, alors que dans les réponses élèves, plus de 80 % disent lire les commentaires.] 
-                """
+@sections.register("Commentaires écrits")
+def commentaires_ecrits():
+    col1, col2 = st.columns(2)
+    with col1:
+        fig1 = create_pie_chart(
+            df_prof,
+            "Freq_comm_ecrit",
+            "Fréquence des commentaires écrits ",
+            rows=rows_prof,
+            aggregate=aggregate_prof,
+            intervals=intervals_prof,
+        )
+        show_figure(fig1)
+    with col2:
+        fig1 = create_pie_chart_split(
+            df_prof,
+            "Difficultes_comm_ecrit",
+            "Difficulités lors des commentaires écrits ",
+            chart_type="bar",
+            answers=answers_prof,
+            rows=rows_prof,
+            aggregate=aggregate_prof,
+            intervals=intervals_prof,
+        )
+        show_figure(fig1)
+        difficultes = count_multi_answers(
+            df_prof,
+            "Difficultes_comm_ecrit",
+            answers=answers_prof,
+            rows=rows_prof,
+            aggregate=aggregate_prof,
+        )
+        impact, temps, repetition = (
+            format_share(difficultes, [option], intervals_prof)
+            for option in (
+                "Manque d'impact perçu sur les élèves",
+                "Manque de temps",
+                "Répétitivité des commentaires",
             )
+        )
+        show_comment(
+            f"""
+        :material/Comment: :blue[Parmi les difficultés citées, le manque d'impact perçu sur les élèves ({impact}), le manque de temps général ({temps}) et la répétitivité des commentaires ({repetition}) suggèrent que la contrainte temporelle est un frein important à la production de commentaires personnalisés et de qualité.] 
+        """,
+            difficultes,
+        )
 
-    with tab3:
+    col1, col2 = st.columns(2)
+    with col1:
+        fig1 = create_pie_chart(
+            df_prof,
+            "Trace_comm_ecrit",
+            "Gardez-vous une trace de vos commentaires écrits ? ",
+            rows=rows_prof,
+            aggregate=aggregate_prof,
+            intervals=intervals_prof,
+        )
+        show_figure(fig1)
+    with col2:
+        fig1 = create_pie_chart(
+            df_prof,
+            "Lecture_comm_ecrit",
+            "Lecture des commentaires par les élèves ",
+            rows=rows_prof,
+            aggregate=aggregate_prof,
+            intervals=intervals_prof,
+        )
+        show_figure(fig1)
+        # Parts calculées en direct : enseignants filtrés, tous les élèves
+        comparison = load_comparison()
+        result = comparison.compare(
+            {"profs": aggregate_prof, "eleves": load_cube("eleves").query({})}
+        )
+        lecture = comparison.counts(result, "Lecture_comm_ecrit", "profs")
+        lecture_profs = format_share(
+            lecture,
+            ["Rarement", "Parfois"],
+            intervals_prof,
+        )
+        lecture_eleves = format_share(
+            comparison.counts(result, "Lecture_comm_ecrit", "eleves"),
+            ["La plupart du temps ou toujours"],
+            intervals_prof,
+        )
+        show_comment(
+            f"""
+            :material/Comment: :blue[{lecture_profs} des enseignants pensent que les élèves ne lisent les commentaires écrits que rarement ou parfois, alors que sur l'ensemble des élèves (hors filtres), {lecture_eleves} disent les lire la plupart du temps ou toujours.] 
+            """,
+            lecture,
+        )
 
-        #
-        #
 
-        col1, col2 = st.columns(2)
-        with col1:
-            fig1 = create_pie_chart(
-                df_prof,
-                "Freq_comm_oral",
-                "Fréquence des commentaires à l'oral",
-            )
-            st.plotly_chart(fig1, use_container_width=True)
-        st.markdown(
-            """
-                :material/Comment: :blue[Les pratiques sont équilibrées avec 35,3% d'enseignants pratiquant régulièrement les commentaires oraux, 29,4% parfois, tandis que 26,5% les utilisent rarement ou jamais, révélant une diversité d'approches où l'oral reste une modalité de feedback significative mais non systématique.] 
-                """
+@sections.register("Commentaires oraux")
+def commentaires_oraux():
+
+    #
+    #
+
+    col1, col2 = st.columns(2)
+    with col1:
+        fig1 = create_pie_chart(
+            df_prof,
+            "Freq_comm_oral",
+            "Fréquence des commentaires à l'oral",
+            rows=rows_prof,
+            aggregate=aggregate_prof,
+            intervals=intervals_prof,
+        )
+        show_figure(fig1)
+    oral = count_values(df_prof, "Freq_comm_oral", rows_prof, aggregate_prof)
+    regulier, parfois, rarement = (
+        format_share(oral, options, intervals_prof)
+        for options in (
+            ["Oui, régulièrement", "Oui, très fréquemment"],
+            ["Parfois"],
+            ["Rarement", "Jamais"],
         )
+    )
+    show_comment(
+        f"""
+            :material/Comment: :blue[Les pratiques sont équilibrées avec {regulier} d'enseignants pratiquant régulièrement ou très fréquemment les commentaires oraux, {parfois} parfois, tandis que {rarement} les utilisent rarement ou jamais, révélant une diversité d'approches où l'oral reste une modalité de feedback significative mais non systématique.] 
+            """,
+        oral,
+    )
 
-        with col2:
-            fig1 = create_pie_chart_split(
-                df_prof,
-                "Moment_comm_oral",
-                "A quel moments sont faits les commentaires à l'oral",
-                chart_type="bar",
-            )
-            st.plotly_chart(fig1, use_container_width=True)
-
-        col1, col2 = st.columns(2)
-        with col1:
-            fig1 = create_pie_chart_split(
-                df_prof,
-                "Objectif_comm_oral",
-                "Objectif du commentaire oral",
-            )
-            st.plotly_chart(fig1, use_container_width=True)
-        with col2:
-            fig1 = create_pie_chart_split(
-                df_prof,
-                "Comprehension_comm_oral",
-                "Compréhension du commentaire oral",
-            )
-            st.plotly_chart(fig1, use_container_width=True)
-
-        col1, col2 = st.columns(2)
-        with col1:
-            fig1 = create_pie_chart_split(
-                df_prof,
-                "Questions_comm_oral",
-                "Les élèves peuvent-ils facilement vous poser des questions sur vos commentaires ?",
-                chart_type="bar",
-            )
-            st.plotly_chart(fig1, use_container_width=True)
-        with col2:
-            fig1 = create_pie_chart_split(
-                df_prof,
-                "Eleve_mal_a_l_aise",
-                "Des élèves ont-ils déjà été mal à l'aise lorsque vous donniez un commentaire oral ?",
-            )
-            st.plotly_chart(fig1, use_container_width=True)
-            st.markdown(
-                """
-                    :material/Comment: :blue[Près de la moitié des élèves (47,1%) sont rarement mal à l'aise avec les feedbacks oraux, contre seulement 15,7% qui ne le sont jamais, suggérant que cette modalité est globalement bien acceptée mais nécessite une attention particulière pour environ un quart des élèves qui peuvent parfois éprouver de l'inconfort.] 
-                    """
-            )
+    with col2:
+        fig1 = create_pie_chart_split(
+            df_prof,
+            "Moment_comm_oral",
+            "A quel moments sont faits les commentaires à l'oral",
+            chart_type="bar",
+            answers=answers_prof,
+            rows=rows_prof,
+            aggregate=aggregate_prof,
+            intervals=intervals_prof,
+        )
+        show_figure(fig1)
 
-        col1, col2 = st.columns(2)
-        with col1:
-            fig1 = create_pie_chart_split(
-                df_prof,
-                "Avantages_comm_oral",
-                "Avantages des commentaires oraux.",
-            )
-            st.plotly_chart(fig1, use_container_width=True)
-        with col2:
-            fig1 = create_pie_chart_split(
-                df_prof,
-                "Inconveniants_oral",
-                "Inconvénients des commentaires oraux.",
-            )
-            st.plotly_chart(fig1, use_container_width=True)
+    col1, col2 = st.columns(2)
+    with col1:
+        fig1 = create_pie_chart_split(
+            df_prof,
+            "Objectif_comm_oral",
+            "Objectif du commentaire oral",
+            answers=answers_prof,
+            rows=rows_prof,
+            aggregate=aggregate_prof,
+            intervals=intervals_prof,
+        )
+        show_figure(fig1)
+    with col2:
+        fig1 = create_pie_chart_split(
+            df_prof,
+            "Comprehension_comm_oral",
+            "Compréhension du commentaire oral",
+            answers=answers_prof,
+            rows=rows_prof,
+            aggregate=aggregate_prof,
+            intervals=intervals_prof,
+        )
+        show_figure(fig1)
 
-        st.markdown(
-            """
-            :material/Comment: :blue[Avantages principaux :
-Les enseignants valorisent surtout le caractère direct et personnalisé (25,9%), la rapidité de formulation (19,4%) et la meilleure réceptivité des élèves (17,5%), confirmant l'efficacité relationnelle de cette modalité.
+    col1, col2 = st.columns(2)
+    with col1:
+        fig1 = create_pie_chart_split(
+            df_prof,
+            "Questions_comm_oral",
+            "Les élèves peuvent-ils facilement vous poser des questions sur vos commentaires ?",
+            chart_type="bar",
+            answers=answers_prof,
+            rows=rows_prof,
+            aggregate=aggregate_prof,
+            intervals=intervals_prof,
+        )
+        show_figure(fig1)
+    with col2:
+        fig1 = create_pie_chart_split(
+            df_prof,
+            "Eleve_mal_a_l_aise",
+            "Des élèves ont-ils déjà été mal à l'aise lorsque vous donniez un commentaire oral ?",
+            answers=answers_prof,
+            rows=rows_prof,
+            aggregate=aggregate_prof,
+            intervals=intervals_prof,
+        )
+        show_figure(fig1)
+        malaise = count_multi_answers(
+            df_prof,
+            "Eleve_mal_a_l_aise",
+            answers=answers_prof,
+            rows=rows_prof,
+            aggregate=aggregate_prof,
+        )
+        rarement, jamais, parfois = (
+            format_share(malaise, [option], intervals_prof)
+            for option in ("Rarement", "Jamais", "Parfois")
+        )
+        show_comment(
+            f"""
+                :material/Comment: :blue[Les élèves sont rarement mal à l'aise avec les feedbacks oraux ({rarement} des réponses), et jamais pour {jamais}, suggérant que cette modalité est globalement bien acceptée mais nécessite une attention particulière pour les élèves qui peuvent parfois éprouver de l'inconfort ({parfois}).] 
+                """,
+            malaise,
+        )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        fig1 = create_pie_chart_split(
+            df_prof,
+            "Avantages_comm_oral",
+            "Avantages des commentaires oraux.",
+            answers=answers_prof,
+            rows=rows_prof,
+            aggregate=aggregate_prof,
+            intervals=intervals_prof,
+        )
+        show_figure(fig1)
+    with col2:
+        fig1 = create_pie_chart_split(
+            df_prof,
+            "Inconveniants_oral",
+            "Inconvénients des commentaires oraux.",
+            answers=answers_prof,
+            rows=rows_prof,
+            aggregate=aggregate_prof,
+            intervals=intervals_prof,
+        )
+        show_figure(fig1)
+
+    avantages = count_multi_answers(
+        df_prof,
+        "Avantages_comm_oral",
+        answers=answers_prof,
+        rows=rows_prof,
+        aggregate=aggregate_prof,
+    )
+    direct, rapide, receptivite = (
+        format_share(avantages, [option], intervals_prof)
+        for option in (
+            "Plus direct et personnalisé",
+            "Plus rapide à formuler",
+            "Meilleure réceptivité des élèves",
+        )
+    )
+    inconvenients = count_multi_answers(
+        df_prof,
+        "Inconveniants_oral",
+        answers=answers_prof,
+        rows=rows_prof,
+        aggregate=aggregate_prof,
+    )
+    temps, trace, oubli = (
+        format_share(inconvenients, [option], intervals_prof)
+        for option in (
+            "Manque de temps en classe",
+            "Absence de trace écrite pour le suivi",
+            "Les élèves oublient facilement ce qui est dit",
+        )
+    )
+    show_comment(
+        f"""
+        :material/Comment: :blue[Avantages principaux :
+Les enseignants valorisent surtout le caractère direct et personnalisé ({direct}), la rapidité de formulation ({rapide}) et la meilleure réceptivité des élèves ({receptivite}), confirmant l'efficacité relationnelle de cette modalité.
 Inconvénients majeurs :
-Le manque de temps en classe (23,5%) et l'absence de trace écrite (22,8%) dominent, suivis par le risque d'oubli rapide par les élèves (17,6%), révélant les contraintes pratiques et la problématique de pérennité du feedback oral.
+Le manque de temps en classe ({temps}) et l'absence de trace écrite ({trace}) dominent, suivis par le risque d'oubli rapide par les élèves ({oubli}), révélant les contraintes pratiques et la problématique de pérennité du feedback oral.
 Constat global :
 L'oral est perçu comme un mode de feedback efficace et humanisant mais chronophage et volatile, suggérant un besoin d'outils permettant de combiner les avantages de l'oral (personnalisation, rapidité) avec la traçabilité de l'écrit.] 
-            """
+        """,
+        avantages,
+    )
+
+
+@sections.register("Synthèse des échelles")
+def synthese_echelles():
+    st.header("Synthèse des échelles")
+    scales = LikertScales(LIKERT_SCALES["profs"])
+    show_figure(
+        create_likert_chart(
+            scales,
+            aggregate_prof,
+            title="Réponses aux questions à échelle (du plus bas au plus haut)",
         )
+    )
+    summary = scales.summary(aggregate_prof)
+    st.dataframe(
+        summary,
+        column_config={
+            "n": st.column_config.NumberColumn("Réponses"),
+            "mediane": st.column_config.TextColumn("Niveau médian"),
+            "top2": st.column_config.NumberColumn("Top-2", format="percent"),
+            "score": st.column_config.NumberColumn("Score moyen", format="%.2f"),
+            "niveaux": st.column_config.NumberColumn("Niveaux"),
+        },
+        use_container_width=True,
+    )
+    st.caption(
+        "Top-2 : part des deux niveaux les plus hauts. Score moyen : niveaux "
+        "notés de 1 au nombre de niveaux. Les réponses hors échelle (« Je ne "
+        "sais pas »…) sont exclues."
+    )
+
+
+@sections.register("Réponses libres")
+def reponses_libres():
+    st.header("Réponses libres")
+    questions = FREE_TEXT_QUESTIONS["profs"]
+    column = st.selectbox(
+        "Question",
+        list(questions),
+        format_func=questions.get,
+        key="texte_profs",
+    )
+    show_term_frequencies(
+        load_text_analyzer("profs", column), rows_prof, title=questions[column]
+    )
+    st.caption(
+        "Mots et expressions de deux mots les plus fréquents dans les réponses "
+        "retenues par les filtres, hors mots vides."
+    )
+    st.subheader("Réponses les plus fréquentes")
+    show_duplicates(load_near_duplicates("profs", column), rows_prof)
+    st.subheader("Groupes de réponses proches")
+    show_clusters(
+        load_cluster_engine("profs", column), rows_prof, key=f"groupes_profs_{column}"
+    )
+    st.subheader("Recherche")
+    search_panel(
+        load_search_index("profs"), questions, rows_prof, key="recherche_profs"
+    )
+
+
+@sections.register("Différences entre groupes")
+def differences_groupes():
+    st.header("Différences entre groupes")
+    significance_panel(
+        filters_prof,
+        selections,
+        load_cube("profs"),
+        load_significance("profs"),
+        key="significativite_profs",
+    )
+
+
+sections.render()
+render_profiler_panel(memory=lambda: memory_report("profs"))
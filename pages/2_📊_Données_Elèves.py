@@ -1,32 +1,91 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils import create_pie_chart, create_pie_chart_split
+from data_loader import (
+    load_cluster_engine,
+    load_cube,
+    load_eleves,
+    load_filter_engine,
+    load_multi_answers,
+    load_near_duplicates,
+    load_search_index,
+    load_significance,
+    load_text_analyzer,
+    load_text_summary,
+    memory_report,
+)
+from intervals import METHODS
+from likert import LikertScales
+from profiler import profile, render_profiler_panel, start_profiler
+from questionnaire import FREE_TEXT_QUESTIONS, LIKERT_SCALES
+from sections import SectionRegistry
+from utils import (
+    count_multi_answers,
+    count_values,
+    create_likert_chart,
+    create_pie_chart,
+    format_share,
+)
+from widgets import (
+    chart_with_toggle,
+    search_panel,
+    show_clusters,
+    show_comment,
+    show_duplicates,
+    show_figure,
+    significance_panel,
+    show_term_frequencies,
+    show_text_summary,
+)
 
 st.set_page_config(page_title="Données élèves - MotivIA", page_icon="📊", layout="wide")
+# Profilage du rendu, affiché avec ?debug=profiler
+start_profiler("eleves")
 
 st.title("📊 Analyse des données élèves")
 st.subheader("Questionnaire élèves - Académie d'Orléans-Tours")
 
-# Charger les données
-df_original = pd.read_csv(
-    "Data/eleves.csv",
-)
-df_eleves = df_original.copy()
-
-
+# Colonnes utilisées par la page
+COLONNES = [
+    "Classe",
+    "Age",
+    "Freq_comm_ecrit",
+    "Lecture_comm_ecrit",
+    "Objectif_commentaire",
+    "Impact_comm_ecrit",
+    "Comp_comm_ecrit",
+    "Freq_comm_oral",
+    "Moment_comm_oral",
+    "Prof_comm_oral_prive",
+    "Gene_comm_oral",
+    "Raison_gene_comm_oral",
+    "Impact_comm_oral",
+    "Pref_ecrit_oral",
+    "Pref_freq_oral",
+    "Besoin_comm_oral",
+    "Motiv_comm",
+    "Peur",
+    "Methodes_travail",
+]
+
+# Charger les données (partagées entre les sessions, non modifiées)
+with profile("load"):
+    df_eleves = load_eleves(COLONNES)
+    answers_eleves = load_multi_answers("eleves")
+    filters_eleves = load_filter_engine("eleves")
+
+
+# Sidebar - Filtres : sélections {colonne: valeurs retenues}
 st.sidebar.header("🔍 Filtres Élèves")
+selections = {}
 # Filtre par type d'établissement avec multiselect
 if "Classe" in df_eleves.columns:
     st.sidebar.subheader("Classe")
 
     # Obtenir toutes les classes uniques et les trier
-    all_classes = sorted(df_eleves["Classe"].dropna().unique().tolist())
+    all_classes = filters_eleves.values("Classe")
 
     # Options de sélection rapide
     col1, col2 = st.sidebar.columns(2)
@@ -53,20 +112,18 @@ if "Classe" in df_eleves.columns:
     )
 
     # Appliquer le filtre
-    if selected_classes:
-        df_eleves = df_eleves[df_eleves["Classe"].isin(selected_classes)]
-    else:
+    selections["Classe"] = selected_classes
+    if not selected_classes:
         st.sidebar.warning("⚠️ Aucune classe sélectionnée")
-        df_eleves = df_eleves.iloc[0:0]  # DataFrame vide
 
 # Filtre par ages (si la colonne existe)
 if "Age" in df_eleves.columns:
     st.sidebar.subheader("Age")
 
     # Obtenir les ages disponibles après le filtrage par classe
-    available_ages = sorted(df_eleves["Age"].dropna().unique().tolist())
+    available_ages = filters_eleves.values("Age", selections)
 
-    if len(df_eleves) > 0:
+    if available_ages:
         start_age, end_age = st.sidebar.select_slider(
             "Sélectionner les ages:",
             options=available_ages,
@@ -74,269 +131,345 @@ if "Age" in df_eleves.columns:
         )
 
         if start_age and end_age:
-            df_eleves = df_eleves[
-                (df_eleves["Age"] <= end_age) & (df_eleves["Age"] >= start_age)
+            selections["Age"] = [
+                age for age in available_ages if start_age <= age <= end_age
             ]
         elif not start_age or end_age:
             st.sidebar.warning("⚠️ Aucun ages sélectionné")
-            df_eleves = df_eleves.iloc[0:0]
+            selections["Age"] = []
+
+# Intervalles de confiance des pourcentages affichés
+st.sidebar.subheader("Intervalles de confiance")
+intervals_eleves = METHODS[
+    st.sidebar.selectbox(
+        "Méthode",
+        list(METHODS),
+        help=(
+            "Wilson : calcul analytique. Bootstrap : rééchantillonnage des "
+            "répondants. Dans les commentaires, l'intervalle suit la part "
+            "entre crochets."
+        ),
+    )
+]
 
+# Positions des lignes retenues (aucune copie du DataFrame)
+with profile("filter"):
+    rows_eleves = filters_eleves.indices(selections)
+# Comptages de toutes les questions : somme des cellules retenues du cube
+with profile("aggregate"):
+    aggregate_eleves = load_cube("eleves").query(selections)
 
 # Afficher le nombre de résultats après filtrage
 st.sidebar.markdown("---")
 col1, col2 = st.sidebar.columns(2)
 with col1:
-    st.metric("Total filtré", len(df_eleves))
+    st.metric("Total filtré", aggregate_eleves.n_respondents)
 with col2:
-    st.metric("Total initial", len(df_original))
+    st.metric("Total initial", len(df_eleves))
 
-if len(df_eleves) == 0:
+if aggregate_eleves.n_respondents == 0:
     st.warning("Aucune donnée ne correspond aux filtres sélectionnés")
 
 
-# Onglets pour les analyses élèves
-tab1, tab2, tab3, tab4, tab5 = st.tabs(
-    [
-        "Vue d'ensemble",
-        "Commentaires écrits",
-        "Commentaires oraux",
-        "Comparaison écrit / oral",
-        "Motivation, habitudes de travail",
-    ]
-)
+# Onglets pour les analyses élèves, calculés uniquement lorsqu'ils sont affichés
+sections = SectionRegistry("onglets_eleves")
 
-with tab1:
+
+@sections.register("Vue d'ensemble")
+def vue_ensemble():
     st.header("Vue d'ensemble")
 
     # Métriques principales
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Nombre d'élèves", len(df_eleves))
+        st.metric("Nombre d'élèves", aggregate_eleves.n_respondents)
     with col2:
         if "Classe" in df_eleves.columns:
-            st.metric("Niveaux représentés", df_eleves["Classe"].nunique())
+            st.metric(
+                "Niveaux représentés",
+                len(aggregate_eleves.counts("Classe")),
+            )
     with col3:
         if "Niveau" in df_eleves.columns:
-            st.metric("Niveaux représentés", df_eleves["Niveau"].nunique())
+            st.metric(
+                "Niveaux représentés",
+                len(count_values(df_eleves, "Niveau", rows_eleves)),
+            )
     with col4:
         if "Etablissement" in df_eleves.columns:
-            st.metric("Établissements", df_eleves["Etablissement"].nunique())
+            st.metric(
+                "Établissements",
+                len(count_values(df_eleves, "Etablissement", rows_eleves)),
+            )
 
     # Visualisation de la répartition par classe
 
     if "Classe" in df_eleves.columns:
-        bar1 = st.toggle("Diagramme en barre", value=True, key=1)
-        fig_classe = create_pie_chart(
+        chart_with_toggle(
             df_eleves,
             "Classe",
             "Répartition par classe",
-            chart_type="bar" if bar1 else "pie",
+            bar=True,
+            rows=rows_eleves,
+            aggregate=aggregate_eleves,
+            intervals=intervals_eleves,
         )
-        st.plotly_chart(fig_classe, use_container_width=True)
 
-with tab2:
+
+@sections.register("Commentaires écrits")
+def commentaires_ecrits():
     st.header("Commentaires écrits")
     col1, col2 = st.columns(2)
     with col1:
-        bar_Freq_comm_ecrit = st.toggle(
-            "Diagramme en barre",
-            value=True,
-        )
-        fig_Freq_comm_ecrit = create_pie_chart(
+        chart_with_toggle(
             df_eleves,
             "Freq_comm_ecrit",
             "Est-ce que tes enseignants écrivent des commentaires (ou appréciations) sur tes copies ou devoirs ?",
-            chart_type="bar" if bar_Freq_comm_ecrit else "pie",
+            bar=True,
+            rows=rows_eleves,
+            aggregate=aggregate_eleves,
+            intervals=intervals_eleves,
         )
-        st.plotly_chart(fig_Freq_comm_ecrit, use_container_width=True)
     with col2:
-        bar_Lecture_comm_ecrit = st.toggle(
-            "Diagramme en barre", value=False, key="Lecture_comm_ecrit"
-        )
-        fig_Lecture_comm_ecrit = create_pie_chart(
+        chart_with_toggle(
             df_eleves,
             "Lecture_comm_ecrit",
             "Est-ce que tu lis toujours les commentaires écrits des enseignants ?",
-            chart_type="bar" if bar_Lecture_comm_ecrit else "pie",
+            bar=False,
+            rows=rows_eleves,
+            aggregate=aggregate_eleves,
+            intervals=intervals_eleves,
         )
-        st.plotly_chart(fig_Lecture_comm_ecrit, use_container_width=True)
 
     col1, col2 = st.columns(2)
     with col1:
-        bar_Objectif_commentaire = st.toggle(
-            "Diagramme en barre",
-            value=False,
-            key="Que cherches-tu en priorité dans une appréciation ? ",
-        )
-        fig_Objectif_commentaire = create_pie_chart(
+        chart_with_toggle(
             df_eleves,
             "Objectif_commentaire",
             "Que cherches-tu en priorité dans une appréciation ?",
-            chart_type="bar" if bar_Objectif_commentaire else "pie",
+            bar=False,
+            rows=rows_eleves,
+            aggregate=aggregate_eleves,
+            intervals=intervals_eleves,
         )
-        st.plotly_chart(fig_Objectif_commentaire, use_container_width=True)
 
-        st.markdown(
-            """
-                :material/Comment: :blue[Les élèves privilégient massivement l'amélioration (38,3%) et la compréhension de la note (37,3%), contre seulement 8,6% pour la valorisation des réussites, révélant une approche davantage corrective qu'encourageante du feedback.] 
-                """
+        objectifs = count_values(
+            df_eleves, "Objectif_commentaire", rows_eleves, aggregate_eleves
+        )
+        ameliorer, comprendre, encourager = (
+            format_share(objectifs, [option], intervals_eleves)
+            for option in (
+                "Savoir ce que je dois améliorer",
+                "Comprendre pourquoi j'ai eu cette note",
+                "Être encouragé(e)",
+            )
+        )
+        show_comment(
+            f"""
+                :material/Comment: :blue[Les élèves privilégient massivement l'amélioration ({ameliorer}) et la compréhension de la note ({comprendre}), contre seulement {encourager} pour l'encouragement, révélant une approche davantage corrective qu'encourageante du feedback.] 
+                """,
+            objectifs,
         )
 
     with col2:
-        bar_Impact_comm_ecrit = st.toggle(
-            "Diagramme en barre", value=True, key="Impact_comm_ecrit"
-        )
-        fig_Impact_comm_ecrit = create_pie_chart(
+        chart_with_toggle(
             df_eleves,
             "Impact_comm_ecrit",
             "Est-ce que les commentaires écrits t’aident à progresser ?",
-            chart_type="bar" if bar_Impact_comm_ecrit else "pie",
+            bar=True,
+            rows=rows_eleves,
+            aggregate=aggregate_eleves,
+            intervals=intervals_eleves,
+        )
+        impact = count_values(
+            df_eleves, "Impact_comm_ecrit", rows_eleves, aggregate_eleves
         )
-        st.plotly_chart(fig_Impact_comm_ecrit, use_container_width=True)
-        st.markdown(
-            """
-                :material/Comment: :blue[794 élèves jugent que les commentaires les aident "un peu" à progresser, contre seulement 187 "je ne sais pas" et 112 "pas du tout", révélant que les élèves reconnaissent une utilité modérée mais réelle des feedbacks écrits, même s'ils ne les perçoivent pas comme déterminants pour leur progression.] 
-                """
+        un_peu, ne_sait_pas, pas_du_tout = (
+            format_share(impact, [option], intervals_eleves)
+            for option in ("Un peu", "Je ne sais pas", "Pas du tout")
+        )
+        show_comment(
+            f"""
+                :material/Comment: :blue[{un_peu} des élèves jugent que les commentaires les aident "un peu" à progresser, contre seulement {ne_sait_pas} "je ne sais pas" et {pas_du_tout} "pas du tout", révélant que les élèves reconnaissent une utilité modérée mais réelle des feedbacks écrits, même s'ils ne les perçoivent pas comme déterminants pour leur progression.] 
+                """,
+            impact,
         )
 
-    bar_Comp_comm_ecrit = st.toggle(
-        "Diagramme en barre", value=True, key="Comp_comm_ecrit"
-    )
-    fig_Comp_comm_ecrit = create_pie_chart_split(
+    chart_with_toggle(
         df_eleves,
         "Comp_comm_ecrit",
         "Quand tu ne comprends pas un commentaire écrit, que fais-tu ?",
-        chart_type="bar" if bar_Comp_comm_ecrit else "pie",
+        bar=True,
+        split=True,
+        answers=answers_eleves,
+        rows=rows_eleves,
+        aggregate=aggregate_eleves,
+        intervals=intervals_eleves,
     )
-    st.plotly_chart(fig_Comp_comm_ecrit, use_container_width=True)
 
-with tab3:
+
+@sections.register("Commentaires oraux")
+def commentaires_oraux():
     st.header("Les commentaires oraux.")
     col1, col2 = st.columns(2)
     with col1:
-        bar_Freq_comm_oral = st.toggle(
-            "Diagramme en barre", value=False, key="Freq_comm_oral"
-        )
-        fig_Freq_comm_oral = create_pie_chart(
+        chart_with_toggle(
             df_eleves,
             "Freq_comm_oral",
             "Est-ce que tes enseignants te font des commentaires à l'oral sur ton travail ?",
-            chart_type="bar" if bar_Freq_comm_oral else "pie",
+            bar=False,
+            rows=rows_eleves,
+            aggregate=aggregate_eleves,
+            intervals=intervals_eleves,
         )
-        st.plotly_chart(fig_Freq_comm_oral, use_container_width=True)
 
     with col2:
-        bar_Moment_comm_oral = st.toggle(
-            "Diagramme en barre", value=True, key="Moment_comm_oral"
-        )
-        fig_Moment_comm_oral = create_pie_chart_split(
+        chart_with_toggle(
             df_eleves,
             "Moment_comm_oral",
             "Quand tes enseignants te font-ils des commentaires oraux sur ton travail ? (Réponses multiples)",
-            chart_type="bar" if bar_Moment_comm_oral else "pie",
+            bar=True,
+            split=True,
+            answers=answers_eleves,
+            rows=rows_eleves,
+            aggregate=aggregate_eleves,
+            intervals=intervals_eleves,
+        )
+    oral = count_values(df_eleves, "Freq_comm_oral", rows_eleves, aggregate_eleves)
+    parfois, rarement, souvent = (
+        format_share(oral, [option], intervals_eleves)
+        for option in ("Parfois", "Rarement", "Oui, souvent")
+    )
+    moments = count_multi_answers(
+        df_eleves,
+        "Moment_comm_oral",
+        answers=answers_eleves,
+        rows=rows_eleves,
+        aggregate=aggregate_eleves,
+    )
+    individuelle, collective = (
+        format_share(moments, [option], intervals_eleves)
+        for option in (
+            "Pendant une discussion individuelle (juste avec moi)",
+            "Pendant la correction collective devant toute la classe",
         )
-        st.plotly_chart(fig_Moment_comm_oral, use_container_width=True)
-    st.markdown(
-        """
-                :material/Comment: :blue[40,7% des élèves reçoivent "parfois" des commentaires oraux, 26,3% "rarement", contre seulement 14,5% "souvent", révélant une pratique occasionnelle de l'oral.
+    )
+    show_comment(
+        f"""
+                :material/Comment: :blue[{parfois} des élèves reçoivent "parfois" des commentaires oraux, {rarement} "rarement", contre seulement {souvent} "souvent", révélant une pratique occasionnelle de l'oral.
 Moments privilégiés :
-Les commentaires oraux interviennent principalement pendant des discussions individuelles (618) et lors de correction collective (603)] 
-                """
+Les commentaires oraux interviennent principalement pendant des discussions individuelles ({individuelle} des réponses) et lors de correction collective ({collective})] 
+                """,
+        oral,
     )
 
     col1, col2 = st.columns(2)
     with col1:
-        bar_Prof_comm_oral_prive = st.toggle(
-            "Diagramme en barre", value=False, key="Prof_comm_oral_prive"
-        )
-        fig_comm_oral_prive = create_pie_chart(
+        chart_with_toggle(
             df_eleves,
             "Prof_comm_oral_prive",
             "Préfères-tu recevoir des commentaires en privé ou devant la classe ?",
-            chart_type="bar" if bar_Prof_comm_oral_prive else "pie",
+            bar=False,
+            rows=rows_eleves,
+            aggregate=aggregate_eleves,
+            intervals=intervals_eleves,
         )
-        st.plotly_chart(fig_comm_oral_prive, use_container_width=True)
 
     with col2:
-        bar_Gene_comm_oral = st.toggle(
-            "Diagramme en barre", value=True, key="Gene_comm_oral"
-        )
-        fig_Gene_comm_oral = create_pie_chart(
+        chart_with_toggle(
             df_eleves,
             "Gene_comm_oral",
             "As-tu déjà été mal à l'aise lors de commentaires oraux devant la classe ?",
-            chart_type="bar" if bar_Gene_comm_oral else "pie",
+            bar=True,
+            rows=rows_eleves,
+            aggregate=aggregate_eleves,
+            intervals=intervals_eleves,
         )
-        st.plotly_chart(fig_Gene_comm_oral, use_container_width=True)
 
-    st.markdown(
-        """
-                :material/Comment: :blue[39% préfèrent en privé contre 10% qui préfèrent devant la classe, mais 14,5% n'ont pas de préférence et 5% veulent même éviter l'oral, révélant des besoins différenciés selon les profils d'élèves.
+    preference = count_values(
+        df_eleves, "Prof_comm_oral_prive", rows_eleves, aggregate_eleves
+    )
+    prive, classe, indifferent, eviter = (
+        format_share(preference, [option], intervals_eleves)
+        for option in (
+            "En privé (juste moi et le professeur)",
+            "Devant la classe, ça ne me dérange pas",
+            "Je n'ai pas de préférence",
+            "Je préfère éviter les commentaires oraux",
+        )
+    )
+    gene = count_values(df_eleves, "Gene_comm_oral", rows_eleves, aggregate_eleves)
+    jamais, parfois, rarement, souvent = (
+        format_share(gene, options, intervals_eleves)
+        for options in (
+            ["Jamais"],
+            ["Parfois, selon ce qui est dit"],
+            ["Rarement, ça va"],
+            ["Souvent, je n'aime pas ça", "Toujours, je suis gêné"],
+        )
+    )
+    show_comment(
+        f"""
+                :material/Comment: :blue[{prive} préfèrent en privé contre {classe} qui préfèrent devant la classe, mais {indifferent} n'ont pas de préférence et {eviter} veulent même éviter l'oral, révélant des besoins différenciés selon les profils d'élèves.
 Malaise devant la classe :
-491 élèves ne sont "jamais" mal à l'aise et 424 "parfois", contre 394 "rarement", montrant une résilience majoritaire mais confirmant qu'environ 30% des élèves peuvent éprouver un inconfort public, justifiant l'importance d'adapter les modalités de feedback oral au contexte et à l'élève.] 
-                """
+{jamais} des élèves ne sont "jamais" mal à l'aise et {parfois} "parfois", contre {rarement} "rarement", montrant une résilience majoritaire mais confirmant que {souvent} des élèves éprouvent souvent ou toujours un inconfort public, justifiant l'importance d'adapter les modalités de feedback oral au contexte et à l'élève.] 
+                """,
+        preference,
     )
 
-    bar_Raison_gene_comm_oral = st.toggle(
-        "Diagramme en barre", value=True, key="Raison_gene_comm_oral"
-    )
-    fig_Raison_gene_comm_oral = create_pie_chart_split(
+    chart_with_toggle(
         df_eleves,
         "Raison_gene_comm_oral",
         "Si tu as été mal à l'aise, pourquoi ? (Réponses multiples)",
-        chart_type="bar" if bar_Raison_gene_comm_oral else "pie",
+        bar=True,
+        split=True,
+        answers=answers_eleves,
+        rows=rows_eleves,
+        aggregate=aggregate_eleves,
+        intervals=intervals_eleves,
     )
-    st.plotly_chart(fig_Raison_gene_comm_oral, use_container_width=True)
 
-    liste_gene_autre = [
-        "J'aime pas que cela est dit a voit haute",
-        "remarques des autres camarades (suite à un 21/20)",
-        "c'est un commentaire positif, mais ça me gêne d'avoir eu un compliment, seulement moi ou un petit groupe",
-        "",
-    ]
-    st.write("'Si tu as été mal à l'aise, pourquoi ?' Autres réponses :")
-    st.write(liste_gene_autre)
-
-    bar_Impact_comm_oral = st.toggle(
-        "Diagramme en barre", value=False, key="Impact_comm_oral"
+    show_text_summary(
+        load_text_summary("eleves"),
+        "Raison_gene_autre",
+        rows_eleves,
+        title="Si tu as été mal à l'aise, pourquoi ? Autres réponses",
     )
-    fig_Impact_comm_oral = create_pie_chart_split(
+
+    chart_with_toggle(
         df_eleves,
         "Impact_comm_oral",
         "Est-ce que ces commentaires oraux t’aident à progresser ?",
-        chart_type="bar" if bar_Impact_comm_oral else "pie",
+        bar=False,
+        split=True,
+        answers=answers_eleves,
+        rows=rows_eleves,
+        aggregate=aggregate_eleves,
+        intervals=intervals_eleves,
     )
-    st.plotly_chart(fig_Impact_comm_oral, use_container_width=True)
 
-with tab4:
+
+@sections.register("Comparaison écrit / oral")
+def comparaison_ecrit_oral():
     st.header("Comparaison écrit / oral")
     col1, col2 = st.columns(2)
     with col1:
-        bar2 = st.toggle("Diagramme en barre", value=False, key=2)
-        fig_pref_ecrit_oral = create_pie_chart(
+        chart_with_toggle(
             df_eleves,
             "Pref_ecrit_oral",
             "Préfères-tu les commentaires oraux ou écrits ?",
-            chart_type="bar" if bar2 else "pie",
+            bar=False,
+            rows=rows_eleves,
+            aggregate=aggregate_eleves,
+            intervals=intervals_eleves,
         )
-        st.plotly_chart(fig_pref_ecrit_oral, use_container_width=True)
-
-    liste_autre = [
-        "Les oraux m'angoisse",
-        "Parce que c’est pareil",
-        "je ne sais pas",
-        "Car c'est clair ",
-        "je trouve ça mieux ",
-        "Car mes camarades ne peuvent pas voir ",
-        "Je n’ai pas vraiment d’explications à donner, je préfère juste. ",
-        "J’aime le fait que les professeurs prennent le temps de rédiger une appréciation : ils ont l’air plus impliqués dans la réussite des élèves ",
-        "Cela dépend des commentaires ",
-        "car c'est plus personnel",
-    ]
-    st.write(
-        "'Préfères-tu les commentaires oraux ou écrits ? Pourquoi ?' : 10 groupes de réponses"
-    )
-    st.write(liste_autre)
+
+    show_text_summary(
+        load_text_summary("eleves"),
+        "Pref_ecrit_oral_texte",
+        rows_eleves,
+        title="Préfères-tu les commentaires oraux ou écrits ? Pourquoi ?",
+    )
 
     with col2:
         # bar2 = st.toggle("Diagramme en barre", value=True, key=2)
@@ -345,83 +478,203 @@ with tab4:
             "Pref_freq_oral",
             "Est-ce que tu aimerais que tes enseignants te parlent plus souvent de ton travail à l’oral ?",
             # chart_type="bar" if bar2 else "pie",
+            rows=rows_eleves,
+            aggregate=aggregate_eleves,
+            intervals=intervals_eleves,
         )
-        st.plotly_chart(fig_Pref_freq_oral, use_container_width=True)
+        show_figure(fig_Pref_freq_oral)
 
     col1, col2 = st.columns(2)
     with col1:
-        bar3 = st.toggle(
-            "Diagramme en barre",
-            value=False,
-        )
-        fig_Besoin_comm_oral = create_pie_chart_split(
+        chart_with_toggle(
             df_eleves,
             "Besoin_comm_oral",
             "Qu’est-ce que tu aimerais entendre dans les commentaires oraux ? (réponses multiples)",
-            chart_type="bar" if bar3 else "pie",
+            bar=False,
+            split=True,
+            answers=answers_eleves,
+            rows=rows_eleves,
+            aggregate=aggregate_eleves,
+            intervals=intervals_eleves,
+        )
+    # Parts des sélections calculées en direct sur les options du catalogue
+    besoins = count_multi_answers(
+        df_eleves,
+        "Besoin_comm_oral",
+        answers=answers_eleves,
+        rows=rows_eleves,
+        aggregate=aggregate_eleves,
+    )
+    points_forts, corriger, conseils, encouragements = (
+        format_share(besoins, [option], intervals_eleves)
+        for option in (
+            "Ce que j'ai bien fait, mes points forts",
+            "Ce que je dois corriger précisément",
+            "Des conseils concrets pour progresser",
+            "Des encouragements pour me motiver",
         )
-        st.plotly_chart(fig_Besoin_comm_oral, use_container_width=True)
-    st.markdown(
-        """
-            :material/Comment: :blue[Les élèves privilégient massivement l'aspect formatif : "mes points forts" (18,9%), "ce que j'ai bien fait" (18,9%), "ce que je dois corriger précisément" (17,5%) et "des conseils concrets pour progresser" (15,3%), contre seulement 12,1% pour les "encouragements pour me motiver", révélant une demande de feedback précis et actionnable plutôt qu'émotionnel.] 
-            """
     )
+    show_comment(
+        f"""
+            :material/Comment: :blue[Les élèves privilégient l'aspect formatif : "ce que j'ai bien fait, mes points forts" ({points_forts}), "ce que je dois corriger précisément" ({corriger}) et "des conseils concrets pour progresser" ({conseils}), contre {encouragements} pour les "encouragements pour me motiver", révélant une demande de feedback précis et actionnable plutôt qu'émotionnel.] 
+            """,
+        besoins,
+    )
+
 
-with tab5:
+@sections.register("Motivation, habitudes de travail")
+def motivation_travail():
     st.subheader("Ressenti et motivation")
     col1, col2 = st.columns(2)
     with col1:
-        bar_Motiv_comm = st.toggle("Diagramme en barre", value=False, key="Motiv_comm")
-        fig_Motiv_comm = create_pie_chart_split(
+        chart_with_toggle(
             df_eleves,
             "Motiv_comm",
             "Comment les commentaires jouent-ils sur ta motivation à préparer au mieux la prochaine évaluation ?",
-            chart_type="bar" if bar_Motiv_comm else "pie",
+            bar=False,
+            split=True,
+            answers=answers_eleves,
+            rows=rows_eleves,
+            aggregate=aggregate_eleves,
+            intervals=intervals_eleves,
         )
-        st.plotly_chart(fig_Motiv_comm, use_container_width=True)
     with col2:
-        bar_Peur = st.toggle("Diagramme en barre", value=False, key="Peur")
-        fig_Peur = create_pie_chart_split(
+        chart_with_toggle(
             df_eleves,
             "Peur",
             "As-tu déjà eu peur de poser une question sur un commentaire que tu ne comprenais pas ?",
-            chart_type="bar" if bar_Peur else "pie",
+            bar=False,
+            split=True,
+            answers=answers_eleves,
+            rows=rows_eleves,
+            aggregate=aggregate_eleves,
+            intervals=intervals_eleves,
         )
-        st.plotly_chart(fig_Peur, use_container_width=True)
 
-    st.write(
-        "Comment les commentaires jouent-ils sur ta motivation à préparer au mieux la prochaine évaluation ? Pourquoi ?' : 3 groupes de réponses."
+    show_text_summary(
+        load_text_summary("eleves"),
+        "Motiv_text",
+        rows_eleves,
+        title="Comment les commentaires jouent-ils sur ta motivation à préparer au "
+        "mieux la prochaine évaluation ? Pourquoi ?",
     )
-    liste_motiv_text = [
-        "car j'ai envie d'avoir un meilleur commentaire a chaque fois",
-        "Cela me pousse à réussir",
-        "Ne sais pas quoi repondre",
-    ]
-    st.write(liste_motiv_text)
 
     st.subheader("Méthodes de travail")
-    bar_Methodes_travail = st.toggle(
-        "Diagramme en barre", value=False, key="Methodes_travail"
-    )
-    fig_Methodes_travail = create_pie_chart_split(
+    chart_with_toggle(
         df_eleves,
         "Methodes_travail",
         "Que fais-tu en général pour préparer une évaluation ? (Réponses multiples)",
-        chart_type="bar" if bar_Methodes_travail else "pie",
+        bar=False,
+        split=True,
+        answers=answers_eleves,
+        rows=rows_eleves,
+        aggregate=aggregate_eleves,
+        intervals=intervals_eleves,
+    )
+
+    methodes = count_multi_answers(
+        df_eleves,
+        "Methodes_travail",
+        answers=answers_eleves,
+        rows=rows_eleves,
+        aggregate=aggregate_eleves,
+    )
+    relecture, camarades, exercices, fiches = (
+        format_share(methodes, [option], intervals_eleves)
+        for option in (
+            "Je relis le cours",
+            "Je révise avec des camarades",
+            "Je refais des exercices",
+            "Je fais des fiches de révision",
+        )
+    )
+    show_comment(
+        f"""
+                :material/Comment: :blue[Les stratégies "je relis le cours" ({relecture}) et "je révise avec des camarades" ({camarades}) révèlent une diversité des approches avec une prédominance de méthodes plutôt passives (relecture) sur les méthodes actives (exercices {exercices}, fiches {fiches}).] 
+                """,
+        methodes,
+    )
+
+    show_text_summary(
+        load_text_summary("eleves"),
+        "Commentaire_libre",
+        rows_eleves,
+        title="Commentaire libre",
+    )
+
+
+@sections.register("Synthèse des échelles")
+def synthese_echelles():
+    st.header("Synthèse des échelles")
+    scales = LikertScales(LIKERT_SCALES["eleves"])
+    show_figure(
+        create_likert_chart(
+            scales,
+            aggregate_eleves,
+            title="Réponses aux questions à échelle (du plus bas au plus haut)",
+        )
+    )
+    summary = scales.summary(aggregate_eleves)
+    st.dataframe(
+        summary,
+        column_config={
+            "n": st.column_config.NumberColumn("Réponses"),
+            "mediane": st.column_config.TextColumn("Niveau médian"),
+            "top2": st.column_config.NumberColumn("Top-2", format="percent"),
+            "score": st.column_config.NumberColumn("Score moyen", format="%.2f"),
+            "niveaux": st.column_config.NumberColumn("Niveaux"),
+        },
+        use_container_width=True,
+    )
+    st.caption(
+        "Top-2 : part des deux niveaux les plus hauts. Score moyen : niveaux "
+        "notés de 1 au nombre de niveaux. Les réponses hors échelle (« Je ne "
+        "sais pas »…) sont exclues."
     )
-    st.plotly_chart(fig_Methodes_travail, use_container_width=True)
 
-    st.markdown(
-        """
-                :material/Comment: :blue[Les stratégies  "je relis le cours" (22%) et "je révise avec des camarades" (9%) révélant une diversité des approches avec une prédominance de méthodes plutôt passives (relecture) sur les méthodes actives (exercices 11%, fiches  13 %).] 
-                """
+
+@sections.register("Réponses libres")
+def reponses_libres():
+    st.header("Réponses libres")
+    questions = FREE_TEXT_QUESTIONS["eleves"]
+    column = st.selectbox(
+        "Question",
+        list(questions),
+        format_func=questions.get,
+        key="texte_eleves",
+    )
+    show_term_frequencies(
+        load_text_analyzer("eleves", column), rows_eleves, title=questions[column]
+    )
+    st.caption(
+        "Mots et expressions de deux mots les plus fréquents dans les réponses "
+        "retenues par les filtres, hors mots vides."
+    )
+    st.subheader("Réponses les plus fréquentes")
+    show_duplicates(load_near_duplicates("eleves", column), rows_eleves)
+    st.subheader("Groupes de réponses proches")
+    show_clusters(
+        load_cluster_engine("eleves", column),
+        rows_eleves,
+        key=f"groupes_eleves_{column}",
+    )
+    st.subheader("Recherche")
+    search_panel(
+        load_search_index("eleves"), questions, rows_eleves, key="recherche_eleves"
     )
 
-    st.write("Quelques réponses au commentaire libre :")
-    liste_comm_libre = [
-        "ils sont gentils, et essaye vraiment de m'aider pour ma part",
-        "Ils faut réussir à être moins sec quand certains parlent ",
-        "respecter et avoir une facon de parler aux eleves cela ne les concernent pas tous ",
-        "Motivé au lieu de rabaisser ",
-    ]
-    st.write(liste_comm_libre)
+
+@sections.register("Différences entre groupes")
+def differences_groupes():
+    st.header("Différences entre groupes")
+    significance_panel(
+        filters_eleves,
+        selections,
+        load_cube("eleves"),
+        load_significance("eleves"),
+        key="significativite_eleves",
+    )
+
+
+sections.render()
+render_profiler_panel(memory=lambda: memory_report("eleves"))
@@ -0,0 +1,103 @@
+import streamlit as st
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comparison import POPULATIONS
+from data_loader import load_comparison, load_cube, load_filter_engine
+from profiler import profile, render_profiler_panel, start_profiler
+from sections import SectionRegistry
+from utils import create_comparison_chart
+from widgets import show_figure
+
+st.set_page_config(
+    page_title="Comparaison enseignants / élèves - MotivIA",
+    page_icon="📊",
+    layout="wide",
+)
+# Profilage du rendu, affiché avec ?debug=profiler
+start_profiler("comparaison")
+
+st.title("📊 Comparaison enseignants / élèves")
+st.subheader("Questions communes aux deux questionnaires - Académie d'Orléans-Tours")
+
+# Sidebar - Filtres de chaque population : {jeu: {colonne: valeurs retenues}}
+st.sidebar.header("🔍 Filtres")
+selections = {}
+with profile("load"):
+    engines = {name: load_filter_engine(name) for name in POPULATIONS}
+
+for name, label in POPULATIONS.items():
+    st.sidebar.subheader(label)
+    selections[name] = {}
+    for column in engines[name].columns:
+        # Les valeurs proposées tiennent compte des filtres précédents
+        available = engines[name].values(column, selections[name])
+        selected = st.sidebar.pills(
+            column.replace("_", " "),
+            options=available,
+            default=available,
+            selection_mode="multi",
+            key=f"comparaison_{name}_{column}",
+        )
+        selections[name][column] = selected
+        if not selected:
+            st.sidebar.warning("⚠️ Aucune valeur sélectionnée")
+
+# Comptages de toutes les questions de chaque population, sous ses propres filtres
+with profile("aggregate"):
+    aggregates = {name: load_cube(name).query(selections[name]) for name in POPULATIONS}
+    comparison = load_comparison()
+    result = comparison.compare(aggregates)
+
+st.sidebar.markdown("---")
+columns = st.sidebar.columns(len(POPULATIONS))
+for column, (name, label) in zip(columns, POPULATIONS.items()):
+    with column:
+        st.metric(f"{label} retenus", aggregates[name].n_respondents)
+
+if any(aggregate.n_respondents == 0 for aggregate in aggregates.values()):
+    st.warning("Aucune donnée ne correspond aux filtres sélectionnés")
+
+sections = SectionRegistry("onglets_comparaison")
+
+
+@sections.register("Questions communes")
+def questions_communes():
+    lecture_profs = comparison.share(
+        result, "Lecture_comm_ecrit", "profs", ["Rarement", "Parfois"]
+    )
+    lecture_eleves = comparison.share(
+        result, "Lecture_comm_ecrit", "eleves", ["La plupart du temps ou toujours"]
+    )
+    st.markdown(
+        f"""
+        :material/Comment: :blue[{lecture_profs:.0%} des enseignants pensent que les élèves ne lisent leurs commentaires écrits que rarement ou parfois, alors que {lecture_eleves:.0%} des élèves disent les lire la plupart du temps ou toujours.]
+        """
+    )
+
+    questions = list(comparison.questions)
+    for start in range(0, len(questions), 2):
+        for column, question in zip(st.columns(2), questions[start : start + 2]):
+            with column:
+                show_figure(create_comparison_chart(comparison, aggregates, question))
+    st.caption(
+        "Parts calculées sur les réponses comparables des deux questionnaires : "
+        "les modalités sans équivalent (« Je ne sais pas »…) sont exclues. "
+        "Pour les questions à réponses multiples, chaque option cochée compte."
+    )
+
+
+@sections.register("Tableau")
+def tableau():
+    table = result.pivot_table(
+        index=["question", "groupe"],
+        columns="population",
+        values=["count", "share"],
+        sort=False,
+    )
+    st.dataframe(table, use_container_width=True)
+
+
+sections.render()
+render_profiler_panel()
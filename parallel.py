@@ -0,0 +1,51 @@
+"""
+Pool de processus partagé des calculs parallèles (bootstrap des intervalles,
+choix du nombre de groupes du clustering).
+
+Le serveur Streamlit est multithread : les processus du pool ne sont jamais
+créés par fork du serveur, mais par forkserver (ou spawn s'il n'est pas
+disponible). Le pool est créé à la première utilisation et arrêté à la
+sortie de l'interpréteur.
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Nombre de processus du pool
+MAX_WORKERS = int(os.environ.get("MOTIVIA_WORKERS") or os.cpu_count() or 1)
+# Méthode de démarrage des processus
+START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    Pool de processus partagé, créé à la première utilisation.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=MAX_WORKERS,
+                mp_context=multiprocessing.get_context(START_METHOD),
+            )
+        return _pool
+
+
+@atexit.register
+def shutdown_pool():
+    """
+    Arrête le pool s'il a été créé ; un nouveau sera créé au besoin.
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
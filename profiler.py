@@ -0,0 +1,219 @@
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+
+import pandas as pd
+import streamlit as st
+
+# Panneau activé par l'URL : ?debug=profiler
+QUERY_PARAM = "debug"
+QUERY_VALUE = "profiler"
+
+# Fichier JSON lines où ajouter chaque exécution profilée (facultatif)
+LOG_PATH = os.environ.get("MOTIVIA_PROFILE_LOG")
+
+# Profileur de l'exécution en cours : Streamlit exécute chaque session dans son thread
+_local = threading.local()
+
+# tracemalloc est global au processus : il est démarré par la première
+# exécution profilée en cours et arrêté par la dernière
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_runs = 0
+_tracing_owned = False
+
+
+def _acquire_tracing():
+    """
+    Inscrit une exécution profilée ; retourne (exécutions déjà en cours,
+    numéro de cette exécution). Le pic n'est remis à zéro que si elle est seule.
+    """
+    global _tracing_users, _tracing_runs, _tracing_owned
+    with _tracing_lock:
+        others = _tracing_users
+        if others == 0:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _tracing_owned = True
+            tracemalloc.reset_peak()
+        _tracing_users += 1
+        _tracing_runs += 1
+        return others, _tracing_runs
+
+
+def _release_tracing(run, alone):
+    """
+    Désinscrit une exécution ; retourne (pic mémoire du processus, pic exact),
+    le pic n'étant exact que si aucune autre exécution profilée n'a chevauché
+    celle-ci (alone : seule à son démarrage).
+    """
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+        exact = alone and _tracing_users == 1 and _tracing_runs == run
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+        return peak, exact
+
+
+class RenderProfiler:
+    """
+    Mesures d'une exécution de page : durée de chaque phase (chargement,
+    filtres, agrégation, figure, sérialisation), taille des figures envoyées
+    au navigateur et pic mémoire Python.
+
+    Le pic mémoire est celui du processus : si d'autres exécutions profilées
+    se chevauchent, il les inclut et peak_exact vaut False.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.started_at = time.time()
+        self.records = []
+        self.total_ms = None
+        self.peak_bytes = None
+        self.peak_exact = False
+        self._start = time.perf_counter()
+        others, run = _acquire_tracing()
+        # Désinscription à l'arrêt, ou à la destruction du profileur si la page
+        # s'est interrompue avant (exception, st.stop()) ; le pic n'est exact
+        # que si aucune autre exécution n'était en cours au démarrage
+        self._release = weakref.finalize(self, _release_tracing, run, others == 0)
+
+    @contextlib.contextmanager
+    def phase(self, name, label=None):
+        """
+        Chronomètre le bloc ; le dictionnaire retourné peut recevoir "bytes".
+        """
+        record = {"phase": name, "label": label}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["duration_ms"] = (time.perf_counter() - start) * 1000
+            self.records.append(record)
+
+    def stop(self):
+        """
+        Termine l'exécution : durée totale et pic mémoire. Sans effet si elle
+        est déjà terminée.
+        """
+        if not self._release.alive:
+            return
+        self.total_ms = (time.perf_counter() - self._start) * 1000
+        self.peak_bytes, self.peak_exact = self._release()
+
+    def frame(self):
+        return pd.DataFrame(
+            self.records, columns=["phase", "label", "duration_ms", "bytes"]
+        )
+
+    def to_jsonl(self):
+        """
+        Une ligne JSON par mesure, avec le contexte de l'exécution.
+        """
+        context = {
+            "page": self.page,
+            "started_at": self.started_at,
+            "total_ms": self.total_ms,
+            "peak_bytes": self.peak_bytes,
+            "peak_exact": self.peak_exact,
+        }
+        return "".join(
+            json.dumps({**context, **record}, ensure_ascii=False) + "\n"
+            for record in self.records
+        )
+
+
+def start_profiler(page):
+    """
+    Démarre le profilage de l'exécution si l'URL le demande, sinon le désactive.
+
+    Une exécution précédente de la session interrompue avant
+    render_profiler_panel (exception, st.stop()) est d'abord terminée ; la
+    dernière l'est à la fin du thread de la session, avec son profileur.
+    """
+    previous = getattr(_local, "profiler", None)
+    if previous is not None:
+        previous.stop()
+    enabled = st.query_params.get(QUERY_PARAM) == QUERY_VALUE
+    _local.profiler = RenderProfiler(page) if enabled else None
+    return _local.profiler
+
+
+def profile(name, label=None):
+    """
+    Chronomètre une phase de l'exécution en cours (sans effet hors profilage).
+    """
+    profiler = getattr(_local, "profiler", None)
+    if profiler is None:
+        return contextlib.nullcontext({})
+    return profiler.phase(name, label)
+
+
+def profiling():
+    return getattr(_local, "profiler", None) is not None
+
+
+def render_profiler_panel(memory=None):
+    """
+    Affiche les mesures dans la barre latérale et les exporte en JSON lines.
+
+    memory : fonction retournant le rapport mémoire par colonne
+    (data_loader.memory_report), appelée seulement si le panneau s'affiche.
+    """
+    profiler = getattr(_local, "profiler", None)
+    if profiler is None:
+        return
+    profiler.stop()
+    records = profiler.frame()
+    jsonl = profiler.to_jsonl()
+    if LOG_PATH:
+        with open(LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(jsonl)
+
+    with st.sidebar.expander("⏱️ Profilage du rendu", expanded=True):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Exécution", f"{profiler.total_ms:.0f} ms")
+        col2.metric(
+            "Pic mémoire" if profiler.peak_exact else "Pic mémoire (≈)",
+            f"{(profiler.peak_bytes or 0) / 2**20:.1f} Mo",
+            help=(
+                "Pic Python du processus pendant l'exécution (tracemalloc)"
+                if profiler.peak_exact
+                else "Approximatif : d'autres exécutions profilées du processus "
+                "étaient en cours et sont comptées dans ce pic"
+            ),
+        )
+        col3.metric("Figures", f"{records['bytes'].sum() / 2**10:.0f} Ko")
+        st.dataframe(
+            records.groupby("phase", sort=False)["duration_ms"]
+            .agg(["count", "sum"])
+            .round(1),
+            use_container_width=True,
+        )
+        st.dataframe(records.round(1), use_container_width=True, hide_index=True)
+        st.download_button(
+            "Exporter (JSON lines)",
+            data=jsonl,
+            file_name=f"profil_{profiler.page}.jsonl",
+            mime="application/jsonl",
+        )
+
+    if memory is not None:
+        report = memory()
+        with st.sidebar.expander("🧮 Mémoire des données"):
+            col1, col2 = st.columns(2)
+            col1.metric("CSV brut", f"{report['avant'].sum() / 2**20:.2f} Mo")
+            col2.metric("Chargé", f"{report['après'].sum() / 2**20:.2f} Mo")
+            st.dataframe(
+                report.sort_values("avant", ascending=False),
+                use_container_width=True,
+                hide_index=True,
+            )
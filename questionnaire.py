@@ -0,0 +1,454 @@
+"""
+Catalogue des modalités proposées dans les questionnaires MotivIA.
+
+Les listes reprennent le libellé exact des options. Certaines contiennent des
+virgules : elles ne peuvent pas être découpées naïvement sur ",".
+"""
+
+# Questions à réponses multiples (et questions à choix unique dont les
+# libellés contiennent des virgules), par jeu de données
+MULTI_CHOICE_OPTIONS = {
+    "profs": {
+        "Freq_eval": [
+            "À la fin de chaque séquence/chapitre",
+            "Une fois par mois",
+            "Une fois par semaine",
+            "Plusieurs fois par semaine",
+            "Quotidiennement",
+        ],
+        "Preoccupation_IA": [
+            "Confidentialité et protection des données élèves",
+            "Coût financier pour l'établissement",
+            "Fiabilité des suggestions de l'IA",
+            "Acceptation par les parents et l'institution",
+            "Complexité d'utilisation",
+            "Perte d'authenticité dans la relation pédagogique",
+            "Aucune préoccupation particulière",
+        ],
+        "Difficultes_comm_ecrit": [
+            "Manque de temps",
+            "Manque d'impact perçu sur les élèves",
+            "Répétitivité des commentaires",
+            "Difficulté à formuler des remarques constructives",
+            "Difficulté à être à la fois bienveillant(e) et précis",
+            "Difficulté à personnaliser selon chaque élève",
+            "Aucune difficulté particulière",
+            "Autre",
+        ],
+        "Moment_comm_oral": [
+            "Pendant une activité en classe (feedback immédiat)",
+            "Lors de la remise des copies",
+            "En correction collective",
+            "Juste après une évaluation",
+            "Lors de travaux de groupes",
+            "Pendant les récréations/pauses",
+            "Lors d'entretiens individuels planifiés",
+            "Autre",
+        ],
+        "Objectif_comm_oral": [
+            "Expliquer et justifier une note",
+            "Encourager et motiver l'élève",
+            "Donner des pistes concrètes de progression",
+            "Corriger des erreurs spécifiques",
+            "Créer un dialogue avec l'élève",
+            "Autre",
+        ],
+        "Comprehension_comm_oral": [
+            "Oui, dans la plupart des cas",
+            "Cela dépend beaucoup des élèves",
+            "Non, ils semblent souvent oubliés",
+            "Je n'ai pas suffisamment de recul pour en juger",
+        ],
+        "Questions_comm_oral": [
+            "Oui, ils posent souvent des questions",
+            "Oui, mais ils le font rarement",
+            "Parfois, selon le contexte",
+            "Non, le temps manque généralement",
+            "Non, cela n'est pas prévu dans mon organisation",
+        ],
+        "Eleve_mal_a_l_aise": [
+            "Jamais",
+            "Rarement",
+            "Parfois",
+            "Je n'y ai pas fait attention",
+        ],
+        "Avantages_comm_oral": [
+            "Plus rapide à formuler",
+            "Plus direct et personnalisé",
+            "Meilleure réceptivité des élèves",
+            "Plus authentique et chaleureux",
+            "Permet l'interaction et le dialogue",
+            "Permet de s'adapter en temps réel aux réactions de l'élève",
+        ],
+        "Inconveniants_oral": [
+            "Manque de temps en classe",
+            "Absence de trace écrite pour le suivi",
+            "Les élèves oublient facilement ce qui est dit",
+            "Difficulté à individualiser dans un grand groupe",
+            "Certains élèves sont mal à l'aise avec l'oral",
+            "Difficulté à être équitable avec tous les élèves",
+            "Autre",
+        ],
+    },
+    "eleves": {
+        "Comp_comm_ecrit": [
+            "Je demande des explications au professeur",
+            "Je demande à un camarade",
+            "Je demande à mes parents",
+            "J'essaie de deviner ce que ça veut dire",
+            "Je laisse tomber, tant pis",
+            "J'ai peur de poser la question",
+        ],
+        "Moment_comm_oral": [
+            "Pendant une discussion individuelle (juste avec moi)",
+            "Pendant la correction collective devant toute la classe",
+            "Pendant des travaux en groupes",
+            "Pendant les pauses ou récréations",
+            "Je ne m’en souviens pas",
+        ],
+        "Raison_gene_comm_oral": [
+            "J'ai eu l'impression d'être jugé(e) devant les autres",
+            "Le commentaire était trop négatif",
+            "Je n'ai pas compris et je n'ai pas osé demander",
+            "Les autres élèves se sont moqués",
+            "Cela ne m'est jamais arrivé",
+            "Autre, complète ci-contre",
+        ],
+        "Impact_comm_oral": [
+            "Oui, beaucoup, c'est plus clair qu'à l'écrit",
+            "Oui, un peu",
+            "Pas vraiment",
+            "Pas du tout",
+            "Je ne sais pas",
+        ],
+        "Besoin_comm_oral": [
+            "Ce que j'ai bien fait, mes points forts",
+            "Ce que je dois corriger précisément",
+            "Des conseils concrets pour progresser",
+            "Des exemples pour mieux comprendre",
+            "Des encouragements pour me motiver",
+            "Autre, complète ci-dessous.",
+        ],
+        "Motiv_comm": [
+            "Ils m'encouragent toujours à mieux faire",
+            "Ils m'encouragent souvent",
+            "Parfois ça m'encourage, parfois ça me décourage",
+            "Ils n'ont pas d'effet sur ma motivation",
+            "Ils me découragent souvent",
+            "Ils me découragent toujours",
+        ],
+        "Peur": [
+            "Jamais, j'ose toujours demander",
+            "Parfois, ça dépend du professeur",
+            "Souvent",
+            "Toujours, je n'ose pas poser de questions",
+        ],
+        "Methodes_travail": [
+            "Je relis le cours",
+            "Je fais des fiches de révision",
+            "Je refais des exercices",
+            "Je révise avec des camarades",
+            "Je m'aide d'internet en utilisant des vidéos, des tutoriels,...",
+            "Je reprends les dernières évaluations pour comprendre ce que je peux améliorer",
+            "Je me fais aider par une I.A.",
+            "Je suis des cours particuliers",
+            "Je ne prépare pas vraiment",
+            "Rien de tout cela suivre le cours me suffit",
+        ],
+    },
+}
+
+# Questions à choix unique (et dimensions de contexte) agrégées par la page
+SINGLE_CHOICE_COLUMNS = {
+    "profs": [
+        "Type_etab",
+        "Departement",
+        "Discipline",
+        "Temps_enseignement",
+        "grille",
+        "Freq_comm_ecrit",
+        "Trace_comm_ecrit",
+        "Lecture_comm_ecrit",
+        "Freq_comm_oral",
+        "Impact_comm_oral",
+    ],
+    "eleves": [
+        "Classe",
+        "Age",
+        "Freq_comm_ecrit",
+        "Lecture_comm_ecrit",
+        "Objectif_commentaire",
+        "Impact_comm_ecrit",
+        "Freq_comm_oral",
+        "Comp_comm_oral",
+        "Prof_comm_oral_prive",
+        "Gene_comm_oral",
+        "Pref_ecrit_oral",
+        "Pref_freq_oral",
+    ],
+}
+
+# Échelles ordinales (Likert) : modalités de la plus basse à la plus haute.
+# "excluded" liste les réponses hors échelle (ne sais pas…), ignorées par les
+# statistiques ordinales.
+LIKERT_SCALES = {
+    "profs": {
+        "grille": {
+            "levels": [
+                "Rarement",
+                "Parfois, selon le type de travail",
+                "Souvent, pour la plupart des travaux",
+                "Toujours, pour tous les travaux",
+            ],
+            "excluded": [],
+        },
+        "Freq_comm_ecrit": {
+            "levels": [
+                "Rarement",
+                "Parfois, selon le type d'activité",
+                "Oui, sur la plupart des travaux",
+                "Oui, sur tous les travaux",
+            ],
+            "excluded": [],
+        },
+        "Trace_comm_ecrit": {
+            "levels": ["Jamais", "Parfois", "Toujours (cahier, fichier numérique...)"],
+            "excluded": ["Je ne sais pas comment m'organiser pour cela"],
+        },
+        "Lecture_comm_ecrit": {
+            "levels": [
+                "Rarement",
+                "Parfois, selon les élèves",
+                "Oui, la plupart du temps",
+            ],
+            "excluded": ["Je ne sais pas comment le mesurer"],
+        },
+        "Freq_comm_oral": {
+            "levels": [
+                "Jamais",
+                "Rarement",
+                "Parfois",
+                "Oui, régulièrement",
+                "Oui, très fréquemment",
+            ],
+            "excluded": [],
+        },
+        "Impact_comm_oral": {
+            "levels": [
+                "Peu ou pas d'impact visible",
+                "Oui, mais difficile à quantifier",
+                "Oui, un impact clair et mesurable",
+            ],
+            "excluded": ["Je ne sais pas comment l'évaluer"],
+        },
+        "Eleve_mal_a_l_aise": {
+            "levels": ["Jamais", "Rarement", "Parfois"],
+            "excluded": ["Je n'y ai pas fait attention"],
+        },
+    },
+    "eleves": {
+        "Freq_comm_ecrit": {
+            "levels": [
+                "Jamais ou presque jamais",
+                "Rarement",
+                "Parfois",
+                "Oui, souvent",
+                "Oui, sur presque tous mes devoirs",
+            ],
+            "excluded": [],
+        },
+        "Lecture_comm_ecrit": {
+            "levels": [
+                "Je regarde juste le résultat (note ou compétences)",
+                "Parfois, ça dépend de la matière ou de la note",
+                "La plupart du temps",
+                "Oui, je les lis toujours attentivement",
+            ],
+            "excluded": [],
+        },
+        "Impact_comm_ecrit": {
+            "levels": ["Pas du tout", "Pas vraiment", "Un peu", "Oui, beaucoup"],
+            "excluded": ["Je ne sais pas"],
+        },
+        "Freq_comm_oral": {
+            "levels": [
+                "Jamais ou presque jamais",
+                "Rarement",
+                "Parfois",
+                "Oui, souvent",
+                "Oui, très souvent",
+            ],
+            "excluded": [],
+        },
+        "Comp_comm_oral": {
+            "levels": [
+                "Non, c'est rarement clair pour moi",
+                "Souvent je ne comprends pas bien",
+                "Parfois c'est un peu flou",
+                "La plupart du temps",
+                "Oui, toujours, c'est très clair",
+            ],
+            "excluded": [],
+        },
+        "Gene_comm_oral": {
+            "levels": [
+                "Jamais",
+                "Rarement, ça va",
+                "Parfois, selon ce qui est dit",
+                "Souvent, je n'aime pas ça",
+                "Toujours, je suis gêné",
+            ],
+            "excluded": [],
+        },
+        "Impact_comm_oral": {
+            "levels": [
+                "Pas du tout",
+                "Pas vraiment",
+                "Oui, un peu",
+                "Oui, beaucoup, c'est plus clair qu'à l'écrit",
+            ],
+            "excluded": ["Je ne sais pas"],
+        },
+        "Motiv_comm": {
+            "levels": [
+                "Ils me découragent toujours",
+                "Ils me découragent souvent",
+                "Ils n'ont pas d'effet sur ma motivation",
+                "Parfois ça m'encourage, parfois ça me décourage",
+                "Ils m'encouragent souvent",
+                "Ils m'encouragent toujours à mieux faire",
+            ],
+            "excluded": [],
+        },
+        "Peur": {
+            "levels": [
+                "Jamais, j'ose toujours demander",
+                "Parfois, ça dépend du professeur",
+                "Souvent",
+                "Toujours, je n'ose pas poser de questions",
+            ],
+            "excluded": [],
+        },
+    },
+}
+
+# Questions posées aux deux populations. Les modalités de chaque questionnaire
+# sont regroupées en modalités communes ("groups") : {groupe: {jeu: [modalités]}}.
+# Les modalités non listées (hors échelle, sans équivalent) ne sont pas comparées.
+COMPARED_QUESTIONS = {
+    "Lecture_comm_ecrit": {
+        "title": "Les élèves lisent-ils les commentaires écrits ?",
+        "columns": {"profs": "Lecture_comm_ecrit", "eleves": "Lecture_comm_ecrit"},
+        "groups": {
+            "Rarement": {
+                "profs": ["Rarement"],
+                "eleves": ["Je regarde juste le résultat (note ou compétences)"],
+            },
+            "Parfois": {
+                "profs": ["Parfois, selon les élèves"],
+                "eleves": ["Parfois, ça dépend de la matière ou de la note"],
+            },
+            "La plupart du temps ou toujours": {
+                "profs": ["Oui, la plupart du temps"],
+                "eleves": [
+                    "La plupart du temps",
+                    "Oui, je les lis toujours attentivement",
+                ],
+            },
+        },
+    },
+    "Freq_comm_ecrit": {
+        "title": "Fréquence des commentaires écrits",
+        "columns": {"profs": "Freq_comm_ecrit", "eleves": "Freq_comm_ecrit"},
+        "groups": {
+            "Jamais ou rarement": {
+                "profs": ["Rarement"],
+                "eleves": ["Jamais ou presque jamais", "Rarement"],
+            },
+            "Parfois": {
+                "profs": ["Parfois, selon le type d'activité"],
+                "eleves": ["Parfois"],
+            },
+            "Souvent": {
+                "profs": ["Oui, sur la plupart des travaux"],
+                "eleves": ["Oui, souvent"],
+            },
+            "Toujours ou presque": {
+                "profs": ["Oui, sur tous les travaux"],
+                "eleves": ["Oui, sur presque tous mes devoirs"],
+            },
+        },
+    },
+    "Freq_comm_oral": {
+        "title": "Fréquence des commentaires oraux",
+        "columns": {"profs": "Freq_comm_oral", "eleves": "Freq_comm_oral"},
+        "groups": {
+            "Jamais": {"profs": ["Jamais"], "eleves": ["Jamais ou presque jamais"]},
+            "Rarement": {"profs": ["Rarement"], "eleves": ["Rarement"]},
+            "Parfois": {"profs": ["Parfois"], "eleves": ["Parfois"]},
+            "Souvent": {"profs": ["Oui, régulièrement"], "eleves": ["Oui, souvent"]},
+            "Très souvent": {
+                "profs": ["Oui, très fréquemment"],
+                "eleves": ["Oui, très souvent"],
+            },
+        },
+    },
+    "Moment_comm_oral": {
+        "title": "Moments des commentaires oraux",
+        "columns": {"profs": "Moment_comm_oral", "eleves": "Moment_comm_oral"},
+        "groups": {
+            "En individuel": {
+                "profs": ["Lors d'entretiens individuels planifiés"],
+                "eleves": ["Pendant une discussion individuelle (juste avec moi)"],
+            },
+            "En correction collective": {
+                "profs": ["En correction collective"],
+                "eleves": ["Pendant la correction collective devant toute la classe"],
+            },
+            "Pendant des travaux de groupes": {
+                "profs": ["Lors de travaux de groupes"],
+                "eleves": ["Pendant des travaux en groupes"],
+            },
+            "Pendant les pauses": {
+                "profs": ["Pendant les récréations/pauses"],
+                "eleves": ["Pendant les pauses ou récréations"],
+            },
+        },
+    },
+    "Gene_comm_oral": {
+        "title": "Malaise des élèves face aux commentaires oraux",
+        "columns": {"profs": "Eleve_mal_a_l_aise", "eleves": "Gene_comm_oral"},
+        "groups": {
+            "Jamais": {"profs": ["Jamais"], "eleves": ["Jamais"]},
+            "Rarement": {"profs": ["Rarement"], "eleves": ["Rarement, ça va"]},
+            "Parfois": {
+                "profs": ["Parfois"],
+                "eleves": ["Parfois, selon ce qui est dit"],
+            },
+            "Souvent ou toujours": {
+                "profs": [],
+                "eleves": ["Souvent, je n'aime pas ça", "Toujours, je suis gêné"],
+            },
+        },
+    },
+}
+
+# Questions à réponse libre (texte), avec leur libellé, par jeu de données
+FREE_TEXT_QUESTIONS = {
+    "profs": {
+        "Niveau_enseignement_autre": "Autres niveaux d'enseignement",
+        "Diffcultes_autres": "Autres difficultés lors des commentaires écrits",
+        "Moment_autre": "Autres moments des commentaires oraux",
+        "Objectif_autre": "Autres objectifs du commentaire oral",
+        "Inconveniant_autre": "Autres inconvénients des commentaires oraux",
+        "Commentaire_libre": "Commentaire libre",
+    },
+    "eleves": {
+        "Texte_objectif_comm_ecrit": "Que cherches-tu en priorité dans une appréciation ? (autre)",
+        "Raison_gene_autre": "Si tu as été mal à l'aise, pourquoi ? (autre)",
+        "Pref_ecrit_oral_texte": "Préfères-tu les commentaires oraux ou écrits ? Pourquoi ?",
+        "Besoin_comm_oral_text": "Qu'aimerais-tu entendre dans les commentaires oraux ? (autre)",
+        "Motiv_text": "Comment les commentaires jouent-ils sur ta motivation ? Pourquoi ?",
+        "Commentaire_libre": "Commentaire libre",
+    },
+}
@@ -0,0 +1,206 @@
+"""
+Recherche plein texte dans les réponses libres.
+
+L'index inversé est construit une fois par version des données, avec la même
+normalisation que text_analysis.clean_texts (minuscules, sans accents ni
+ponctuation). Seules les réponses distinctes sont indexées : chaque terme
+pointe vers des réponses distinctes, elles-mêmes reliées à leurs lignes.
+
+Syntaxe : les termes sont combinés par ET ; "termes entre guillemets" cherche
+une expression exacte, terme* un préfixe.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from text_analysis import clean_text, clean_texts, fold_text
+
+# Borne haute des termes commençant par un préfixe (ordre lexicographique)
+_LAST_CHAR = chr(0x10FFFF)
+# Expressions entre guillemets, ou mots isolés
+_QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def parse_query(query):
+    """
+    Découpe une requête en clauses (mots normalisés, préfixe).
+
+    Une expression entre guillemets donne une clause de plusieurs mots ; un
+    mot terminé par * est un préfixe.
+    """
+    clauses = []
+    for phrase, word in _QUERY_PATTERN.findall(query or ""):
+        prefix = not phrase and word.endswith("*")
+        words = tuple(clean_text(phrase or word.rstrip("*")).split())
+        if words:
+            clauses.append((words, prefix))
+    return clauses
+
+
+def _tokens(text):
+    """
+    Termes indexés d'une réponse nettoyée : les mots, et leurs parties de
+    part et d'autre d'une apostrophe (l'oral -> l'oral, l, oral).
+    """
+    words = text.split()
+    return set(words).union(*(word.split("'") for word in words if "'" in word))
+
+
+def _clause_pattern(words, prefix):
+    """
+    Expression régulière d'une clause sur un texte normalisé.
+    """
+    body = r"\s+".join(re.escape(word) for word in words)
+    return r"(?<!\w)" + body + (r"\w*" if prefix else r"(?!\w)")
+
+
+class _ColumnIndex:
+    """
+    Index inversé d'une colonne : vocabulaire trié, listes de réponses
+    distinctes par terme (format CSR) et réponse distincte de chaque ligne.
+    """
+
+    def __init__(self, texts):
+        self.raw = texts.to_numpy(dtype=object)
+        codes, uniques = pd.factorize(clean_texts(texts))
+        self.codes = codes
+        self.documents = np.asarray(uniques, dtype=object)
+
+        terms, documents = [], []
+        for document, text in enumerate(self.documents):
+            tokens = _tokens(text)
+            terms.extend(tokens)
+            documents.extend([document] * len(tokens))
+        term_codes, vocabulary = pd.factorize(pd.Series(terms, dtype=object), sort=True)
+        self.vocabulary = np.asarray(vocabulary, dtype=str)
+        documents = np.asarray(documents, dtype=np.int32)
+        order = np.lexsort((documents, term_codes))
+        self.postings = documents[order]
+        self.indptr = np.concatenate(
+            [[0], np.cumsum(np.bincount(term_codes, minlength=len(vocabulary)))]
+        )
+
+    def _term_range(self, term, prefix):
+        low = np.searchsorted(self.vocabulary, term, side="left")
+        if prefix:
+            high = np.searchsorted(self.vocabulary, term + _LAST_CHAR, side="left")
+        else:
+            found = low < len(self.vocabulary) and self.vocabulary[low] == term
+            high = low + 1 if found else low
+        return self.postings[self.indptr[low] : self.indptr[high]]
+
+    def match(self, clauses):
+        """
+        Masque des réponses distinctes qui satisfont toutes les clauses.
+        """
+        matched = np.ones(len(self.documents), dtype=bool)
+        for words, prefix in clauses:
+            for i, word in enumerate(words):
+                hit = np.zeros(len(self.documents), dtype=bool)
+                hit[self._term_range(word, prefix and i == len(words) - 1)] = True
+                matched &= hit
+            if len(words) > 1:
+                # Expression : mots consécutifs, vérifiés sur les candidates
+                pattern = re.compile(_clause_pattern(words, prefix))
+                for document in np.flatnonzero(matched):
+                    if not pattern.search(self.documents[document]):
+                        matched[document] = False
+        return matched
+
+
+class SearchIndex:
+    """
+    Index de recherche des colonnes de texte libre d'un jeu de données.
+
+    search(query, rows) retourne les lignes dont la réponse correspond, en
+    croisant avec les lignes retenues par les filtres.
+    """
+
+    def __init__(self, texts, version=None):
+        self.version = version
+        self.n_rows = len(texts)
+        self._columns = {
+            column: _ColumnIndex(texts[column]) for column in texts.columns
+        }
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    def search(self, query, columns=None, rows=None):
+        """
+        Réponses qui correspondent à query dans columns (toutes si None),
+        restreintes aux lignes rows (toutes si None).
+
+        Retourne un DataFrame (colonne, ligne), colonne par colonne dans
+        l'ordre des lignes ; text(colonne, ligne) donne la réponse.
+        """
+        columns = list(columns or self.columns)
+        clauses = parse_query(query)
+        lines = [np.empty(0, dtype=np.int64)]
+        counts = np.zeros(len(columns), dtype=np.int64)
+        if clauses:
+            mask = None
+            if rows is not None:
+                mask = np.zeros(self.n_rows, dtype=bool)
+                mask[rows] = True
+            for i, column in enumerate(columns):
+                index = self._columns[column]
+                hit = index.match(clauses)[index.codes]
+                if mask is not None:
+                    hit &= mask
+                lines.append(np.flatnonzero(hit))
+                counts[i] = len(lines[-1])
+        return pd.DataFrame(
+            {
+                "colonne": pd.Categorical.from_codes(
+                    np.repeat(np.arange(len(columns)), counts), categories=columns
+                ),
+                "ligne": np.concatenate(lines),
+            }
+        )
+
+    def text(self, column, row):
+        """
+        Réponse d'origine d'une ligne.
+        """
+        return self._columns[column].raw[row]
+
+
+def highlight(text, query, width=200, mark=("**", "**"), escape=None):
+    """
+    Extrait de text autour de la première correspondance de query, les
+    correspondances encadrées par mark.
+
+    La recherche se fait sur le texte normalisé puis est reportée sur le texte
+    d'origine (accents conservés). escape, s'il est donné, s'applique aux
+    morceaux de texte hors marques (échappement Markdown par exemple).
+    """
+    text = "" if pd.isna(text) else str(text)
+    escape = escape or (lambda part: part)
+    folded, origin = fold_text(text)
+    spans = []
+    for words, prefix in parse_query(query):
+        for found in re.finditer(_clause_pattern(words, prefix), folded):
+            start, end = found.span()
+            if end > start:
+                spans.append((origin[start], origin[end - 1] + 1))
+    spans.sort()
+
+    first = spans[0][0] if spans else 0
+    start = max(0, min(first - width // 4, len(text) - width))
+    end = min(len(text), start + width)
+    pieces, cursor = [], start
+    for span_start, span_end in spans:
+        span_start, span_end = max(span_start, cursor), min(span_end, end)
+        if span_start >= span_end:
+            continue
+        pieces.append(escape(text[cursor:span_start]))
+        pieces.append(mark[0] + escape(text[span_start:span_end]) + mark[1])
+        cursor = span_end
+    pieces.append(escape(text[cursor:end]))
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if end < len(text) else ""
+    return prefix + "".join(pieces) + suffix
@@ -0,0 +1,38 @@
+import streamlit as st
+
+
+class SectionRegistry:
+    """
+    Registre des sections (onglets) d'une page, rendues à la demande.
+
+    Seul l'onglet affiché est exécuté : un changement de filtre ne paie que
+    pour la section visible. Les figures déjà construites sont ensuite servies
+    par utils.FIGURE_CACHE lorsqu'on revient sur un onglet.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self._sections = []
+
+    def register(self, label):
+        """
+        Décorateur : enregistre la fonction comme contenu de l'onglet label.
+        """
+
+        def decorator(render):
+            self._sections.append((label, render))
+            return render
+
+        return decorator
+
+    def render(self):
+        """
+        Crée les onglets et n'exécute que le contenu de l'onglet ouvert.
+        """
+        labels = [label for label, _ in self._sections]
+        tabs = st.tabs(labels, key=self.key, on_change="rerun")
+        for tab, (_, render) in zip(tabs, self._sections):
+            # open vaut None si l'état des onglets n'est pas suivi : tout afficher
+            if tab.open is not False:
+                with tab:
+                    render()
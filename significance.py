@@ -0,0 +1,162 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# Effectif attendu minimal du test du khi-deux ; en dessous, test exact de
+# Fisher pour les tableaux 2 x 2
+MIN_EXPECTED = 5
+
+
+def benjamini_hochberg(p_values):
+    """
+    p-valeurs ajustées (taux de fausses découvertes de Benjamini-Hochberg).
+    """
+    p_values = np.asarray(p_values, dtype=float)
+    valid = ~np.isnan(p_values)
+    adjusted = np.full(p_values.shape, np.nan)
+    p = p_values[valid]
+    if not len(p):
+        return adjusted
+    order = np.argsort(p)
+    scaled = p[order] * len(p) / np.arange(1, len(p) + 1)
+    scaled = np.minimum.accumulate(scaled[::-1])[::-1]
+    adjusted_valid = np.empty(len(p))
+    adjusted_valid[order] = np.minimum(scaled, 1)
+    adjusted[valid] = adjusted_valid
+    return adjusted
+
+
+class SignificanceScan:
+    """
+    Tests d'indépendance de toutes les questions pour une partition des
+    répondants en deux groupes.
+
+    Les comptages des deux groupes (AggregateCounts) forment un tableau
+    2 x modalités pour toutes les questions à la fois ; effectifs attendus,
+    khi-deux, degrés de liberté et V de Cramér sont calculés en une passe
+    NumPy, test par test via les numéros de segment. Une question à réponses
+    multiples (multi) est testée option par option : tableau 2 x 2 des
+    répondants de chaque groupe qui ont coché l'option ou non, les sélections
+    d'un même répondant n'étant pas indépendantes.
+    """
+
+    def __init__(self, questions, multi=(), maxsize=64):
+        self.questions = list(questions)
+        self.multi = set(multi)
+        self.maxsize = maxsize
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def scan(self, group_a, group_b, exclude=(), alpha=0.05):
+        """
+        Teste chaque question et classe les résultats par taille d'effet.
+
+        exclude : questions à ignorer (la dimension qui définit les groupes).
+        Retourne une ligne par question, ou par option d'une question à
+        réponses multiples : option, test, effectifs, statistique, ddl, p,
+        p_ajustee (Benjamini-Hochberg), v_cramer et significatif. Le
+        résultat est partagé entre les sessions pour une même partition.
+        """
+        key = (
+            group_a.version,
+            group_a.filter_key,
+            group_b.filter_key,
+            tuple(exclude),
+            alpha,
+        )
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+
+        result = self._scan(group_a, group_b, exclude, alpha)
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return result
+
+    def _scan(self, group_a, group_b, exclude, alpha):
+        totals = np.stack([group_a.totals, group_b.totals]).astype(float)
+        sizes = np.array([group_a.n_respondents, group_b.n_respondents], dtype=float)
+        exclude = set(exclude)
+        questions, options, blocks = [], [], []
+        for question in self.questions:
+            if question not in group_a or question in exclude:
+                continue
+            start, length = group_a.slice(question)
+            counts = totals[:, start : start + length]
+            if question not in self.multi:
+                questions.append(question)
+                options.append(None)
+                blocks.append(counts)
+                continue
+            # Répondants du groupe qui ont coché l'option, et les autres
+            for option, selected in zip(group_a.labels(question), counts.T):
+                questions.append(question)
+                options.append(option)
+                blocks.append(np.stack([selected, sizes - selected], axis=1))
+        lengths = np.array([block.shape[1] for block in blocks], dtype=np.int64)
+        observed = np.concatenate(blocks or [np.empty((2, 0))], axis=1)
+        segments = np.repeat(np.arange(len(questions)), lengths)
+        n_questions = len(questions)
+
+        column_totals = observed.sum(axis=0)
+        row_totals = np.stack(
+            [
+                np.bincount(segments, weights=row, minlength=n_questions)
+                for row in observed
+            ]
+        )
+        n = row_totals.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            expected = row_totals[:, segments] * column_totals / n[segments]
+            contributions = np.where(
+                expected > 0, (observed - expected) ** 2 / expected, 0
+            )
+        statistic = np.bincount(
+            segments, weights=contributions.sum(axis=0), minlength=n_questions
+        )
+        # Modalités observées dans au moins un groupe
+        k = np.bincount(
+            segments, weights=column_totals > 0, minlength=n_questions
+        ).astype(int)
+        dof = k - 1
+        testable = (dof >= 1) & (row_totals > 0).all(axis=0)
+
+        p = np.full(n_questions, np.nan)
+        p[testable] = stats.chi2.sf(statistic[testable], dof[testable])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cramer_v = np.where(testable, np.sqrt(statistic / n), np.nan)
+
+        # Tableaux 2 x 2 à faibles effectifs : test exact de Fisher
+        min_expected = np.full(n_questions, np.inf)
+        present = column_totals > 0
+        np.minimum.at(min_expected, segments[present], expected[:, present].min(axis=0))
+        test = np.where(testable, "khi-deux", "")
+        for i in np.flatnonzero(testable & (k == 2) & (min_expected < MIN_EXPECTED)):
+            table = observed[:, segments == i]
+            table = table[:, table.sum(axis=0) > 0]
+            p[i] = stats.fisher_exact(table)[1]
+            test[i] = "Fisher"
+
+        adjusted = benjamini_hochberg(p)
+        result = pd.DataFrame(
+            {
+                "option": options,
+                "test": test,
+                "n_a": row_totals[0].astype(np.int64),
+                "n_b": row_totals[1].astype(np.int64),
+                "statistique": np.where(testable, statistic, np.nan),
+                "ddl": np.where(testable, dof, 0),
+                "p": p,
+                "p_ajustee": adjusted,
+                "v_cramer": cramer_v,
+                "significatif": adjusted < alpha,
+            },
+            index=pd.Index(questions, name="question"),
+        )
+        return result.sort_values("v_cramer", ascending=False, na_position="last")
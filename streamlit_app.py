@@ -19,6 +19,7 @@ Utilisez le menu latéral pour accéder aux différentes sections :
 
 - **📊 Données Professeurs** : Analyse des réponses des enseignants
 - **📚 Données Élèves** : Analyse des réponses des élèves
+- **📊 Comparaison** : Questions communes aux enseignants et aux élèves
 
 ### 📈 Fonctionnalités
 
@@ -40,16 +41,22 @@ en particulier l'usage des commentaires écrits et oraux, ainsi que les perspect
 col1, col2, col3 = st.columns(3)
 
 try:
-    import pandas as pd
+    from data_loader import (
+        ESTABLISHMENT_KEY,
+        load_eleves,
+        load_establishments,
+        load_profs,
+    )
 
-    df_prof = pd.read_csv("Data/profs.csv", index_col=0)
-    df_eleves = pd.read_csv("Data/eleves.csv", index_col=0)
+    df_prof = load_profs([ESTABLISHMENT_KEY])
+    df_eleves = load_eleves(["Classe"])
 
     with col1:
         st.metric("Total Professeurs", len(df_prof))
     with col2:
         st.metric("Total Élèves", len(df_eleves))
     with col3:
-        st.metric("Établissements", df_prof["UAI"].nunique())
+        # Une ligne par UAI dans la table des établissements
+        st.metric("Établissements", len(load_establishments()))
 except:
     st.info("Chargez les données pour voir les statistiques globales")
@@ -0,0 +1,111 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_loader
+from data_loader import DATASETS
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    """
+    Instantanés et cubes écrits dans un dossier temporaire.
+    """
+    monkeypatch.setattr(data_loader, "SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    return tmp_path
+
+
+def selections(engine, columns):
+    """
+    Sélections représentatives de la barre latérale pour les colonnes de filtre.
+    """
+    first, second = columns
+    values = engine.values(first)
+    return [
+        {},
+        {first: values[:1]},
+        {first: values[1:]},
+        {first: values, second: engine.values(second)[::2]},
+        {second: engine.values(second)[:1]},
+        {first: []},
+    ]
+
+
+@pytest.mark.parametrize("name", list(DATASETS))
+def test_cube_query_matches_aggregator(snapshot_dir, name):
+    config = DATASETS[name]
+    cube = data_loader.load_cube(name)
+    aggregator = data_loader.load_aggregator(name)
+    engine = data_loader.load_filter_engine(name)
+    questions = list(config["single"]) + list(config["multi"])
+    for selection in selections(engine, config["filters"]):
+        expected = aggregator.aggregate(engine.indices(selection))
+        result = cube.query(selection)
+        assert result.n_respondents == expected.n_respondents, selection
+        for question in questions:
+            pd.testing.assert_series_equal(
+                result.counts(question).sort_index(),
+                expected.counts(question).sort_index(),
+                check_index_type=False,
+                check_names=False,
+            )
+        for index, columns in config["crosstabs"]:
+            pd.testing.assert_frame_equal(
+                result.crosstab(index, columns),
+                expected.crosstab(index, columns),
+                check_index_type=False,
+                check_column_type=False,
+            )
+
+
+def write_csv(df, path, n_rows):
+    df.iloc[:n_rows].to_csv(path, index=False)
+
+
+@pytest.mark.parametrize("name", list(DATASETS))
+def test_incremental_cube_matches_full_rebuild(snapshot_dir, monkeypatch, name):
+    config = DATASETS[name]
+    source = pd.read_csv(config["path"], **config["read_csv"])
+    path = str(snapshot_dir / f"{name}.csv")
+    monkeypatch.setitem(config, "path", path)
+    monkeypatch.setitem(config, "read_csv", {})
+
+    # Premier calcul sur les deux tiers des lignes, puis CSV allongé
+    write_csv(source, path, 2 * len(source) // 3)
+    data_loader.build_snapshot(name)
+    data_loader.build_cube(name)
+    with open(path, "rb") as f:
+        prefix = f.read()
+    write_csv(source, path, len(source))
+    with open(path, "rb") as f:
+        assert f.read().startswith(prefix)
+    data_loader.build_snapshot(name)
+    counted = []
+    count_table = data_loader._count_table
+    monkeypatch.setattr(
+        data_loader,
+        "_count_table",
+        lambda name, df: counted.append(len(df)) or count_table(name, df),
+    )
+    data_loader.build_cube(name)
+    # Seules les lignes ajoutées ont été comptées
+    assert counted == [len(source) - 2 * len(source) // 3]
+    incremental = pd.read_parquet(data_loader.cube_path(name))
+    assert data_loader._read_meta(data_loader.cube_path(name))["n_rows"] == len(source)
+
+    # Recalcul complet, sans cube existant
+    os.remove(data_loader.cube_path(name))
+    data_loader.build_cube(name)
+    full = pd.read_parquet(data_loader.cube_path(name))
+
+    keys = [column for column in full.columns if column != "count"]
+
+    def canonical(table):
+        table = table.astype({key: object for key in keys})
+        table = table.fillna({key: "<NA>" for key in keys})
+        return table.sort_values(keys).reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(canonical(incremental), canonical(full))
+    assert np.int64(full["count"].sum()) > 0
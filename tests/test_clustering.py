@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from clustering import ClusterEngine
+from embeddings import EmbeddingSet
+from text_analysis import TextAnalyzer
+
+THEMES = [
+    "les commentaires oraux sont plus personnels",
+    "je ne lis pas les appréciations écrites",
+    "des conseils concrets pour progresser",
+]
+
+
+@pytest.fixture
+def engine():
+    """
+    Trois thèmes de 20 réponses, vecteurs regroupés autour de trois centres ;
+    chaque thème répète une même réponse pour ses 10 premières lignes.
+    """
+    rng = np.random.default_rng(0)
+    centers = np.eye(3, 8, dtype=np.float32) * 10
+    themes = np.repeat(np.arange(3), 20)
+    texts = pd.Series(
+        [
+            THEMES[theme] + ("" if i % 20 < 10 else f" réponse {i}")
+            for i, theme in enumerate(themes)
+        ]
+    )
+    vectors = centers[themes] + rng.normal(scale=0.1, size=(60, 8))
+    embeddings = EmbeddingSet(
+        np.arange(60), vectors.astype(np.float32), texts, "test", version="v1"
+    )
+    analyzer = TextAnalyzer(texts, use_nltk=False)
+    return ClusterEngine(embeddings, analyzer, k_range=range(2, 6)), themes
+
+
+def test_automatic_k_finds_the_themes(engine):
+    engine, themes = engine
+    result = engine.cluster()
+    assert result.k == 3
+    assert result.scores.idxmax() == 3
+    # Un groupe par thème, quel que soit leur numéro
+    for theme in range(3):
+        assert len(np.unique(result.labels[themes == theme])) == 1
+    assert result.clusters["taille"].tolist() == [20, 20, 20]
+    np.testing.assert_allclose(result.clusters["part"].sum(), 1)
+
+
+def test_examples_skip_repeated_answers(engine):
+    engine, _ = engine
+    for examples in engine.cluster(n_examples=3).clusters["exemples"]:
+        assert len(examples) == 3
+        assert len(set(examples)) == 3
+
+
+def test_results_are_cached_per_filter_state(engine):
+    engine, themes = engine
+    rows = np.flatnonzero(themes != 2)
+    result = engine.cluster(rows, k=2)
+    assert engine.cluster(rows, k=2) is result
+    assert engine.cluster(rows, k=3) is not result
+    np.testing.assert_array_equal(result.rows, rows)
+    assert result.k == 2
+
+
+def test_too_few_answers_make_a_single_group(engine):
+    engine, _ = engine
+    result = engine.cluster(rows=[0, 1])
+    assert result.k == 1
+    assert result.scores.empty
+    assert result.clusters["taille"].tolist() == [2]
@@ -0,0 +1,67 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import embeddings
+from embeddings import EmbeddingStore, build_embeddings
+
+TEXTS = pd.Series(
+    [
+        "Les commentaires m'aident à progresser",
+        "Je ne lis pas toujours les appréciations",
+        "Plus personnel à l'oral qu'à l'écrit",
+        "Des conseils concrets pour la prochaine fois",
+    ],
+    name="Commentaire_libre",
+)
+
+
+class CountingEncoder:
+    name = "compteur"
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts):
+        self.encoded.extend(texts)
+        return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+
+def test_store_appends_one_shard_per_batch(tmp_path):
+    encoder = CountingEncoder()
+    store = EmbeddingStore(tmp_path, encoder)
+    first = store.encode(TEXTS[:2])
+    store.encode(TEXTS)
+    assert len(encoder.encoded) == len(TEXTS)
+    shards = sorted(os.listdir(tmp_path / encoder.name))
+    assert len(shards) == 4  # empreintes et vecteurs de deux fragments
+
+    # Un autre magasin (autre processus) relit les fragments sans réencoder
+    other = EmbeddingStore(tmp_path, CountingEncoder())
+    np.testing.assert_array_equal(other.encode(TEXTS[:2]), first)
+    assert other.encoder.encoded == []
+
+
+def test_store_compacts_shards(tmp_path, monkeypatch):
+    monkeypatch.setattr(embeddings, "MAX_SHARDS", 2)
+    encoder = CountingEncoder()
+    store = EmbeddingStore(tmp_path, encoder)
+    for text in TEXTS:
+        store.encode([text])
+    assert len(os.listdir(tmp_path / encoder.name)) <= 2 * 2
+    expected = np.array([[len(text), 1.0] for text in TEXTS], dtype=np.float32)
+    np.testing.assert_array_equal(store.encode(TEXTS[::-1]), expected[::-1])
+    assert len(store) == len(TEXTS)
+
+
+def test_local_encoder_is_reused_until_refit(tmp_path):
+    first = build_embeddings(TEXTS[:3], tmp_path, encoder="local")
+    again = build_embeddings(TEXTS, tmp_path, encoder="local")
+    assert first.encoder_name == again.encoder_name
+    assert os.listdir(tmp_path) == [first.encoder_name]
+    np.testing.assert_array_equal(again.vectors[:3], first.vectors)
+
+    refit = build_embeddings(TEXTS, tmp_path, encoder="local", refit=True)
+    assert refit.encoder_name == first.encoder_name
+    assert not np.array_equal(refit.vectors[:3], first.vectors)
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from filters import FilterEngine, filter_state_hash
+
+DIMENSION = pd.DataFrame(
+    {
+        "Type_etab": ["COLLEGE", "LYCEE", "COLLEGE", None],
+        "Departement": ["Loiret", "Cher", "Cher", "Indre"],
+    }
+)
+# Réponses -> ligne de la dimension (-1 : établissement inconnu)
+KEY = np.array([0, 1, -1, 2, 3, 0, -1, 1])
+
+SELECTIONS = [
+    {},
+    {"Type_etab": ["COLLEGE"]},
+    {"Type_etab": ["COLLEGE", "LYCEE"], "Departement": ["Cher"]},
+    {"Departement": ["Indre"]},
+    {"Type_etab": []},
+    {"Type_etab": ["INCONNU"]},
+]
+
+
+def expected_rows(frame, selections):
+    """
+    Positions retenues par un filtrage pandas direct.
+    """
+    keep = pd.Series(True, index=frame.index)
+    for column, selected in selections.items():
+        keep &= frame[column].isin(selected)
+    return np.flatnonzero(keep.to_numpy())
+
+
+@pytest.mark.parametrize("selections", SELECTIONS)
+def test_indices_match_pandas_filter(selections):
+    engine = FilterEngine(DIMENSION, list(DIMENSION.columns))
+    assert engine.indices(selections).tolist() == list(
+        expected_rows(DIMENSION, selections)
+    )
+
+
+@pytest.mark.parametrize("selections", SELECTIONS)
+def test_dimension_key_matches_denormalized_filter(selections):
+    engine = FilterEngine(DIMENSION, list(DIMENSION.columns), key=KEY)
+    # Réponses avec leurs colonnes d'établissement (manquantes si clé -1)
+    denormalized = DIMENSION.reindex(KEY).reset_index(drop=True)
+    assert engine.indices(selections).tolist() == list(
+        expected_rows(denormalized, selections)
+    )
+
+
+def test_values_are_restricted_by_other_selections():
+    engine = FilterEngine(DIMENSION, list(DIMENSION.columns))
+    assert engine.values("Type_etab") == ["COLLEGE", "LYCEE"]
+    assert engine.values("Departement", {"Type_etab": ["LYCEE"]}) == ["Cher"]
+
+
+def test_filter_state_hash_depends_only_on_rows():
+    assert filter_state_hash([1, 2], 5) == filter_state_hash(np.array([1, 2]), 5)
+    assert filter_state_hash([1, 2], 5) != filter_state_hash([1, 3], 5)
+    assert filter_state_hash(None, 5) == ("all", 5)
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from intervals import (
+    bootstrap_interval,
+    multi_bootstrap_interval,
+    proportion_intervals,
+    wilson_interval,
+)
+
+
+@pytest.mark.parametrize(
+    "count, n, expected",
+    [
+        # Formule de Wilson calculée en précision décimale (z = 1,959963984540054)
+        (30, 100, (0.2189488529, 0.3958485463)),
+        (5, 20, (0.1118617014, 0.4687008776)),
+        # Aux bornes : z² / (n + z²)
+        (0, 10, (0.0, 0.2775327999)),
+        (10, 10, (0.7224672001, 1.0)),
+    ],
+)
+def test_wilson_matches_reference_values(count, n, expected):
+    low, high = wilson_interval([count], n)
+    np.testing.assert_allclose([low[0], high[0]], expected, atol=1e-9)
+
+
+def test_wilson_without_respondents_is_undefined():
+    low, high = wilson_interval([0, 0], 0)
+    assert np.isnan(low).all() and np.isnan(high).all()
+
+
+def test_bootstrap_is_reproducible_with_a_fixed_seed():
+    counts = [30, 50, 20]
+    low, high = bootstrap_interval(counts, seed=7)
+    again_low, again_high = bootstrap_interval(counts, seed=7)
+    np.testing.assert_array_equal(low, again_low)
+    np.testing.assert_array_equal(high, again_high)
+    assert not np.array_equal(bootstrap_interval(counts, seed=8)[0], low)
+
+    shares = np.array(counts) / sum(counts)
+    assert (low <= shares).all() and (shares <= high).all()
+    # Proche de Wilson pour un effectif de cette taille
+    wilson_low, wilson_high = wilson_interval(counts, sum(counts))
+    np.testing.assert_allclose(low, wilson_low, atol=0.03)
+    np.testing.assert_allclose(high, wilson_high, atol=0.03)
+
+
+def test_multi_bootstrap_resamples_respondents():
+    # Chaque répondant choisit les deux options : parts fixées à 50 %
+    respondents = np.repeat(np.arange(40), 2)
+    codes = np.tile([0, 1], 40)
+    low, high = multi_bootstrap_interval(respondents, codes, 40, 2, seed=3)
+    np.testing.assert_allclose(low, [0.5, 0.5])
+    np.testing.assert_allclose(high, [0.5, 0.5])
+
+    rng = np.random.default_rng(0)
+    respondents = rng.integers(0, 60, size=150)
+    codes = rng.integers(0, 3, size=150)
+    low, high = multi_bootstrap_interval(respondents, codes, 60, 3, seed=3)
+    again = multi_bootstrap_interval(respondents, codes, 60, 3, seed=3)
+    np.testing.assert_array_equal(low, again[0])
+    np.testing.assert_array_equal(high, again[1])
+    shares = np.bincount(codes, minlength=3) / len(codes)
+    assert (low <= shares).all() and (shares <= high).all()
+
+
+def test_proportion_intervals_are_aligned_on_counts():
+    counts = pd.Series([30, 70], index=pd.Index(["Oui", "Non"], name="Question"))
+    intervals = proportion_intervals(counts)
+    assert list(intervals.index) == ["Oui", "Non"]
+    np.testing.assert_allclose(intervals.loc["Oui"], (0.2189488529, 0.3958485463))
+    assert proportion_intervals(counts, method="bootstrap").notna().all().all()
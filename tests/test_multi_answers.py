@@ -0,0 +1,54 @@
+import pandas as pd
+
+from multi_answers import MultiAnswerIndex, split_answers
+
+OPTIONS = [
+    "Ce que j'ai bien fait, mes points forts",
+    "Ce que je dois corriger précisément",
+    "Autre",
+]
+
+
+def split(values, options=None):
+    return split_answers(pd.Series(values, dtype=object), options=options)
+
+
+def test_catalogue_option_keeps_its_comma():
+    parts = split(
+        [
+            "Ce que j'ai bien fait, mes points forts, Ce que je dois corriger précisément"
+        ],
+        OPTIONS,
+    )
+    assert parts.tolist() == OPTIONS[:2]
+
+
+def test_quoted_option_keeps_its_comma():
+    parts = split(['"Une option, avec virgule", Autre'], OPTIONS)
+    assert parts.tolist() == ["Une option, avec virgule", "Autre"]
+
+
+def test_without_catalogue_splits_on_every_comma():
+    parts = split(["Ce que j'ai bien fait, mes points forts"])
+    assert parts.tolist() == ["Ce que j'ai bien fait", "mes points forts"]
+
+
+def test_unknown_options_are_kept_and_reported():
+    df = pd.DataFrame({"q": ["Autre, Inconnue", None, "Autre"]})
+    index = MultiAnswerIndex.from_frame(df, ["q"], options={"q": OPTIONS})
+    assert index.counts("q").to_dict() == {"Autre": 2, "Inconnue": 1}
+    assert index.unknown["q"].to_dict() == {"Inconnue": 1}
+
+
+def test_index_of_parts_is_the_original_row():
+    parts = split(
+        pd.Series(["Autre", None, "Autre, Inconnue"], index=[10, 20, 30]), OPTIONS
+    )
+    assert parts.index.tolist() == [10, 30, 30]
+
+
+def test_categorical_column_matches_object_column():
+    values = ["Autre, Ce que je dois corriger précisément", "Autre", None]
+    plain = split(values, OPTIONS)
+    categorical = split_answers(pd.Series(values, dtype="category"), options=OPTIONS)
+    assert sorted(plain.items()) == sorted(categorical.items())
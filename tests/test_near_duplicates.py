@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from near_duplicates import NearDuplicates, minhash_signatures, similar_pairs
+
+TEXTS = pd.Series(
+    [
+        "Les commentaires m'aident à progresser",
+        "Je ne lis pas toujours les appréciations",
+        "les commentaires m'aident a progresser !",
+        "Les commentaires m'aident à progresser",
+        "",
+        "Les commentaires m'aident beaucoup à progresser",
+        "Les commentaires ne m'aident pas",
+        "Plus personnel à l'oral qu'à l'écrit",
+        None,
+        "Des conseils concrets pour la prochaine fois",
+        "Je ne lis pas toujours les appreciations",
+    ]
+)
+
+
+def test_exact_and_near_exact_duplicates_are_grouped():
+    duplicates = NearDuplicates(TEXTS)
+    groups = duplicates.groups
+    # Doublon exact, puis casse, accents et ponctuation (identiques une fois
+    # nettoyés), puis un mot ajouté
+    assert groups[0] == groups[3] == groups[2] == groups[5]
+    assert groups[1] == groups[10]
+    # Réponses vides hors groupes
+    assert groups[4] == groups[8] == -1
+
+
+def test_distinct_texts_are_not_grouped():
+    groups = NearDuplicates(TEXTS).groups
+    distinct = [0, 1, 7, 9]
+    assert len(set(groups[distinct])) == len(distinct)
+    # Mêmes mots en partie, sens différent : sous le seuil de similarité
+    assert groups[6] != groups[0]
+
+
+def test_summary_counts_variants_within_rows():
+    duplicates = NearDuplicates(TEXTS)
+    summary = duplicates.summary()
+    top = summary.iloc[0]
+    assert top["representant"] == TEXTS[0]
+    assert (top["taille"], top["variantes"]) == (4, 2)
+    # Toutes les réponses non vides
+    assert summary["taille"].sum() == 9
+
+    restricted = duplicates.summary(rows=[2, 7])
+    assert restricted["taille"].tolist() == [1, 1]
+    assert restricted["variantes"].tolist() == [1, 1]
+
+
+def test_similar_pairs_follow_signature_similarity():
+    signatures = minhash_signatures(
+        ["commentaires utiles", "commentaires utiles", "aucun rapport"]
+    )
+    np.testing.assert_array_equal(signatures[0], signatures[1])
+    first, member = similar_pairs(signatures)
+    assert list(zip(first, member)) == [(0, 1)]
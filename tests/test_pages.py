@@ -0,0 +1,42 @@
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import data_loader
+import sections
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Page, et case à cocher qui vide la sélection de la barre latérale
+PAGES = [
+    ("pages/1_📊_Données_Professeurs.py", "Sélectionner tous les départements"),
+    ("pages/2_📊_Données_Elèves.py", "Tout désélectionner"),
+]
+
+
+@pytest.fixture
+def all_sections(tmp_path, monkeypatch):
+    """
+    Instantanés écrits dans un dossier temporaire, et tous les onglets
+    exécutés (AppTest ne suit pas l'onglet ouvert).
+    """
+    monkeypatch.setattr(data_loader, "SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    monkeypatch.setattr(data_loader, "EMBEDDING_DIR", str(tmp_path / "embeddings"))
+
+    def render_all(self):
+        for _, render in self._sections:
+            render()
+
+    monkeypatch.setattr(sections.SectionRegistry, "render", render_all)
+
+
+@pytest.mark.parametrize("page, checkbox", PAGES)
+def test_page_renders_with_empty_selection(all_sections, page, checkbox):
+    app = AppTest.from_file(os.path.join(ROOT, page), default_timeout=300).run()
+    assert not app.exception
+    box = next(box for box in app.sidebar.checkbox if box.label == checkbox)
+    box.set_value(not box.value).run()
+    assert not app.exception, app.exception[0].value
+    assert app.sidebar.metric[0].value == "0"
+    assert "Aucune réponse pour ces filtres." in [info.value for info in app.info]
@@ -0,0 +1,37 @@
+import threading
+import tracemalloc
+
+import profiler
+from profiler import RenderProfiler
+
+
+def test_stop_is_idempotent_and_stops_tracing():
+    run = RenderProfiler("test")
+    assert tracemalloc.is_tracing()
+    run.stop()
+    run.stop()
+    assert not tracemalloc.is_tracing()
+    assert run.peak_exact
+    assert profiler._tracing_users == 0
+
+
+def test_overlapping_runs_share_tracing():
+    first = RenderProfiler("a")
+    second = RenderProfiler("b")
+    first.stop()
+    assert tracemalloc.is_tracing()
+    second.stop()
+    assert not tracemalloc.is_tracing()
+    assert not first.peak_exact and not second.peak_exact
+
+
+def test_interrupted_run_is_released_with_its_thread():
+    # Exécution interrompue avant render_profiler_panel : profileur jamais arrêté
+    def interrupted_run():
+        profiler._local.profiler = RenderProfiler("interrompue")
+
+    thread = threading.Thread(target=interrupted_run)
+    thread.start()
+    thread.join()
+    assert profiler._tracing_users == 0
+    assert not tracemalloc.is_tracing()
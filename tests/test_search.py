@@ -0,0 +1,127 @@
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from search import SearchIndex, _clause_pattern, highlight, parse_query
+from text_analysis import clean_texts
+
+TEXTS = pd.DataFrame(
+    {
+        "Pref": [
+            "C'est plus personnel à l'oral",
+            "À l'écrit, c'est plus clair et plus précis",
+            None,
+            "Plus personnel, mais je préfère l'écrit",
+            "C'est plus personnel à l'oral",
+            "Les commentaires écrits sont personnalisés",
+            "",
+        ],
+        "Libre": [
+            "Rien à ajouter",
+            "Des commentaires plus personnels",
+            "Commenter à l'oral prend du temps",
+            None,
+            "Personnel",
+            "Plus de conseils",
+            "Écrit",
+        ],
+    }
+)
+QUERIES = [
+    "personnel",
+    "perso*",
+    "comment*",
+    '"plus personnel"',
+    '"plus perso*"',
+    '"personnel plus"',
+    "plus ecrit",
+    "l'oral",
+    "oral",
+    "ECRIT",
+    '"à l\'oral" c*',
+    "absent",
+]
+
+
+def brute_force(column, query, rows=None):
+    """
+    Lignes dont le texte normalisé contient toutes les clauses.
+    """
+    texts = clean_texts(TEXTS[column])
+    patterns = [re.compile(_clause_pattern(*clause)) for clause in parse_query(query)]
+    lines = [
+        line
+        for line, text in enumerate(texts)
+        if patterns and all(pattern.search(text) for pattern in patterns)
+    ]
+    if rows is not None:
+        lines = [line for line in lines if line in set(rows)]
+    return lines
+
+
+@pytest.fixture(scope="module")
+def index():
+    return SearchIndex(TEXTS)
+
+
+def test_parse_query():
+    assert parse_query('Écrit "plus  Personnel" perso* "" *') == [
+        (("ecrit",), False),
+        (("plus", "personnel"), False),
+        (("perso",), True),
+    ]
+    assert parse_query(None) == []
+
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("rows", [None, [1, 3, 4, 6], []])
+def test_search_matches_brute_force(index, query, rows):
+    found = index.search(
+        query, rows=None if rows is None else np.array(rows, dtype=np.int64)
+    )
+    for column in TEXTS.columns:
+        lines = found.loc[found["colonne"] == column, "ligne"].tolist()
+        assert lines == brute_force(column, query, rows)
+
+
+def test_phrase_requires_consecutive_words(index):
+    found = index.search('"plus personnel"', columns=["Pref"])
+    assert found["ligne"].tolist() == [0, 3, 4]
+    assert index.search('"personnel plus"').empty
+
+
+def test_prefix_and_apostrophe_terms(index):
+    assert index.search("personnali*", columns=["Pref"])["ligne"].tolist() == [5]
+    # l'oral est indexé comme l'oral, l et oral
+    assert index.search("oral", columns=["Libre"])["ligne"].tolist() == [2]
+
+
+def test_empty_query_finds_nothing(index):
+    found = index.search("  ")
+    assert found.empty
+    assert list(found.columns) == ["colonne", "ligne"]
+
+
+def test_text_returns_original_answer(index):
+    assert index.text("Pref", 1) == "À l'écrit, c'est plus clair et plus précis"
+
+
+def test_highlight_keeps_accents():
+    text = "À l'écrit, c'est plus clair"
+    assert highlight(text, "ecrit") == "À l'**écrit**, c'est plus clair"
+    assert (
+        highlight(text, "plus cl*", mark=("[", "]"))
+        == "À l'écrit, c'est [plus] [clair]"
+    )
+    assert highlight(None, "ecrit") == ""
+
+
+def test_highlight_window_and_escape():
+    text = "a" * 100 + " cible " + "b" * 100
+    excerpt = highlight(text, "cible", width=40, escape=str.upper)
+    assert excerpt.startswith("…") and excerpt.endswith("…")
+    # Le texte marqué est échappé, pas les marques
+    assert "**CIBLE**" in excerpt
+    assert not any(char.islower() for char in excerpt)
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from aggregation import Aggregator
+from multi_answers import MultiAnswerIndex
+from significance import SignificanceScan, benjamini_hochberg
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_benjamini_hochberg_matches_scipy(seed):
+    rng = np.random.default_rng(seed)
+    p = np.concatenate([rng.uniform(size=40), rng.uniform(0, 1e-3, size=10)])
+    # Ex aequo
+    p[::7] = p[0]
+    np.testing.assert_allclose(
+        benjamini_hochberg(p), stats.false_discovery_control(p, method="bh")
+    )
+
+
+def test_benjamini_hochberg_ignores_missing_p_values():
+    p = np.array([0.01, np.nan, 0.04, 0.03, np.nan, 0.5])
+    adjusted = benjamini_hochberg(p)
+    valid = ~np.isnan(p)
+    assert np.isnan(adjusted[~valid]).all()
+    np.testing.assert_allclose(
+        adjusted[valid], stats.false_discovery_control(p[valid], method="bh")
+    )
+
+
+def test_benjamini_hochberg_empty():
+    assert benjamini_hochberg([]).shape == (0,)
+
+
+def test_scan_matches_scipy_chi_square():
+    rng = np.random.default_rng(0)
+    n = 400
+    df = pd.DataFrame(
+        {
+            "groupe": rng.choice(["A", "B"], size=n),
+            "q1": rng.choice(["oui", "non", "parfois"], size=n),
+            "q2": rng.choice(["x", "y"], size=n, p=[0.3, 0.7]),
+        }
+    )
+    # q1 dépend du groupe
+    df.loc[df["groupe"] == "A", "q1"] = rng.choice(
+        ["oui", "non"], size=(df["groupe"] == "A").sum()
+    )
+    aggregator = Aggregator(df, ["q1", "q2"])
+    group_a = aggregator.aggregate(np.flatnonzero(df["groupe"] == "A"))
+    group_b = aggregator.aggregate(np.flatnonzero(df["groupe"] == "B"))
+    result = SignificanceScan(["q1", "q2"]).scan(group_a, group_b)
+
+    for question in ["q1", "q2"]:
+        table = pd.crosstab(df["groupe"], df[question])
+        statistic, p, dof, _ = stats.chi2_contingency(table, correction=False)
+        row = result.loc[question]
+        assert row["ddl"] == dof
+        np.testing.assert_allclose(row["statistique"], statistic)
+        np.testing.assert_allclose(row["p"], p)
+
+
+def test_multi_answer_options_are_tested_per_respondent():
+    rng = np.random.default_rng(1)
+    n = 300
+    groups = rng.choice(["A", "B"], size=n)
+    # Le groupe A coche plus souvent "oral" ; chaque répondant coche 0 à 3 options
+    chosen = {
+        "oral": rng.uniform(size=n) < np.where(groups == "A", 0.6, 0.3),
+        "écrit": rng.uniform(size=n) < 0.5,
+        "aucun": rng.uniform(size=n) < 0.02,
+    }
+    df = pd.DataFrame(
+        {
+            "groupe": groups,
+            "q": [
+                ", ".join(option for option in chosen if chosen[option][i]) or None
+                for i in range(n)
+            ],
+        }
+    )
+    answers = MultiAnswerIndex.from_frame(df, ["q"], options={"q": list(chosen)})
+    aggregator = Aggregator(df, [], answers=answers)
+    rows_a, rows_b = np.flatnonzero(groups == "A"), np.flatnonzero(groups == "B")
+    result = SignificanceScan(["q"], multi=["q"]).scan(
+        aggregator.aggregate(rows_a), aggregator.aggregate(rows_b)
+    )
+
+    assert sorted(result["option"]) == sorted(chosen)
+    assert (result["n_a"] == len(rows_a)).all() and (result["n_b"] == len(rows_b)).all()
+    result = result.set_index("option")
+    for option, selected in chosen.items():
+        table = pd.crosstab(groups, selected)
+        row = result.loc[option]
+        assert row["ddl"] == 1
+        if row["test"] == "Fisher":
+            np.testing.assert_allclose(row["p"], stats.fisher_exact(table)[1])
+        else:
+            statistic, p, _, _ = stats.chi2_contingency(table, correction=False)
+            np.testing.assert_allclose(row["statistique"], statistic)
+            np.testing.assert_allclose(row["p"], p)
+    assert result.loc["oral", "significatif"]
+    assert result.index[0] == "oral"
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from clustering import ClusterEngine
+from embeddings import EmbeddingSet
+from text_analysis import TextAnalyzer
+from text_summary import SUMMARY_COLUMNS, TextSummaryIndex, summary_table
+
+COLUMN = "Commentaire_libre"
+
+
+def make_index():
+    """
+    Deux thèmes de 12 réponses (dont 6 identiques) et deux lignes vides.
+    """
+    rng = np.random.default_rng(0)
+    themes = np.repeat([0, 1], 12)
+    texts = [
+        ["plus personnel à l'oral", "des conseils pour progresser"][theme]
+        + ("" if i % 12 < 6 else f" exemple {i}")
+        for i, theme in enumerate(themes)
+    ]
+    texts = pd.DataFrame({COLUMN: texts + ["", None]})
+    vectors = np.eye(2, 4, dtype=np.float32)[themes] * 10
+    vectors += rng.normal(scale=0.1, size=vectors.shape)
+    engine = ClusterEngine(
+        EmbeddingSet(np.arange(24), vectors, texts[COLUMN][:24], "test"),
+        TextAnalyzer(texts[COLUMN], use_nltk=False),
+        k_range=[2],
+    )
+    table = summary_table({COLUMN: engine})
+    return TextSummaryIndex(table, texts), table, engine
+
+
+def test_table_keeps_one_row_per_clustered_answer():
+    _, table, engine = make_index()
+    assert list(table.columns) == SUMMARY_COLUMNS
+    assert len(table) == 24
+    np.testing.assert_array_equal(table["ligne"], engine.cluster().rows)
+    assert summary_table({}).empty
+
+
+def test_summary_matches_the_clustering():
+    index, _, engine = make_index()
+    summary = index.summary(COLUMN)
+    clusters = engine.cluster().clusters
+    assert summary["taille"].tolist() == clusters["taille"].tolist()
+    assert summary["termes"].tolist() == clusters["termes"].tolist()
+    # Citations les plus proches du centre, une par variante
+    for examples in summary["exemples"]:
+        assert len(examples) == 3
+        assert len(set(examples)) == 3
+
+
+def test_summary_is_restricted_to_rows():
+    index, _, _ = make_index()
+    summary = index.summary(COLUMN, rows=[0, 1, 2, 20, 24])
+    assert sorted(summary["taille"]) == [1, 3]
+    np.testing.assert_allclose(summary["part"], [0.75, 0.25])
+    # Réponses identiques : une seule citation
+    assert summary["exemples"].iloc[0] == ["plus personnel à l'oral"]
+    assert index.summary(COLUMN, rows=[24, 25]).empty
+    assert index.summary("Autre_colonne").empty
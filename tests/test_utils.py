@@ -0,0 +1,18 @@
+import pandas as pd
+
+from utils import format_share, join_labels
+
+
+def test_join_labels():
+    assert join_labels([]) == ""
+    assert join_labels(["a"]) == "a"
+    assert join_labels(["a", "b"]) == "a et b"
+    assert join_labels(iter(["a", "b", "c"])) == "a, b et c"
+
+
+def test_format_share():
+    counts = pd.Series({"Oui": 30, "Non": 60, "Parfois": 10})
+    assert format_share(counts, ["Oui", "Parfois"]) == "40,0 %"
+    assert format_share(counts, ["Absent"]) == "0,0 %"
+    assert format_share(counts.iloc[:0], ["Oui"]) == "– %"
+    assert format_share(counts, ["Oui"], "wilson") == "30,0 % [21,9 ; 39,6]"
@@ -0,0 +1,283 @@
+"""
+Analyse des réponses libres : nettoyage, mots vides et fréquences de termes.
+
+Reprend AnalyseurTexte (Analyse_textuelle.ipynb) sous une forme utilisable
+par les pages : le nettoyage est vectorisé et ne traite que les réponses
+distinctes, les mots vides sont construits une fois par processus et le
+vocabulaire est ajusté une fois par colonne (data_loader.load_text_analyzer).
+"""
+
+import functools
+import logging
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+
+logger = logging.getLogger(__name__)
+
+# fmt: off
+# Mots vides français utilisés si NLTK n'est pas disponible
+BASIC_STOPWORDS = [
+    # Articles
+    "le", "la", "les", "un", "une", "des", "de", "du",
+    # Conjonctions
+    "et", "ou", "mais", "donc", "or", "ni", "car", "parce",
+    # Verbes être et avoir
+    "est", "sont", "ete", "être", "etre", "suis", "es", "sommes", "etes",
+    "etait", "était", "etaient", "étaient", "sera", "seront", "a", "ont", "ai",
+    "as", "avons", "avez", "avoir", "eu", "eus", "eut", "avait", "avaient",
+    "aura", "auront",
+    # Prépositions
+    "pour", "dans", "sur", "avec", "par", "sans", "sous", "vers", "chez",
+    "entre", "parmi", "selon", "malgre", "malgré",
+    # Pronoms
+    "ce", "ces", "je", "tu", "il", "elle", "nous", "vous", "ils", "elles", "me",
+    "te", "se", "leur", "lui", "moi", "toi", "soi", "eux", "mon", "ma", "mes",
+    "ton", "ta", "tes", "son", "sa", "ses", "notre", "nos", "votre", "vos",
+    "leurs", "celui", "celle", "ceux", "celles", "ceci", "cela", "ça", "ca",
+    # Autres mots courants
+    "au", "aux", "qui", "que", "quoi", "dont", "où", "très", "tres", "plus",
+    "moins", "bien", "mal", "ne", "pas", "non", "oui", "tout", "tous", "toute",
+    "toutes", "faire", "fait", "faite", "faits", "faites", "ayant", "eue",
+    "eues", "comme", "ainsi", "alors", "cependant", "néanmoins", "aussi",
+    "encore", "deja", "déjà", "jamais", "toujours", "souvent", "parfois",
+    "quelques", "plusieurs", "autre", "autres",
+]
+
+# Mots vides propres au questionnaire, ajoutés à NLTK ou à la liste de base
+EXTRA_STOPWORDS = [
+    "si", "ça", "ca", "peut", "doit", "etre", "avoir", "faire", "va", "fait",
+    "faut", "deux", "trois", "aussi", "beaucoup", "lia", "dia", "l'ia",
+    "eleves", "eleve", "comme", "car", "parce", "donc", "alors", "cela",
+    "celui", "celle", "ceux", "celles", "quand", "avant", "apres", "après",
+    "pendant", "depuis",
+]
+# fmt: on
+
+# Mots simples et n-grammes, apostrophe interne comprise (l'oral, d'accord)
+TOKEN_PATTERN = r"\b\w+(?:'\w+)?\b"
+
+# Apostrophes et guillemets typographiques ramenés à "'" ou à une espace
+_QUOTES = str.maketrans({"‘": "'", "’": "'", "ʼ": "'", "`": "'", "“": " ", "”": " "})
+
+
+def normalize_word(word):
+    """
+    Minuscules, sans accents.
+    """
+    word = unicodedata.normalize("NFKD", word.lower())
+    return word.encode("ascii", "ignore").decode("ascii")
+
+
+@functools.lru_cache(maxsize=2)
+def stopwords(use_nltk=True):
+    """
+    Mots vides normalisés (sans accents), construits une fois par processus.
+
+    La liste NLTK n'est téléchargée que si elle manque ; sans NLTK, la liste
+    de base est utilisée.
+    """
+    words = None
+    if use_nltk:
+        try:
+            import nltk
+            from nltk.corpus import stopwords as nltk_stopwords
+
+            try:
+                words = set(nltk_stopwords.words("french"))
+            except LookupError:
+                nltk.download("stopwords", quiet=True)
+                words = set(nltk_stopwords.words("french"))
+        except (ImportError, LookupError, OSError):
+            logger.warning("NLTK non disponible : liste de mots vides de base")
+    if words is None:
+        words = set(BASIC_STOPWORDS)
+    words.update(EXTRA_STOPWORDS)
+    # Formes normalisées et formes d'origine
+    return frozenset(words | {normalize_word(word) for word in words})
+
+
+def clean_texts(texts):
+    """
+    Nettoie une série de réponses : minuscules, apostrophes unifiées, sans
+    accents ni ponctuation (apostrophes internes conservées), espaces réduits.
+
+    Seules les réponses distinctes sont traitées, par opérations de chaînes
+    vectorisées ; une réponse manquante devient "".
+    """
+    texts = pd.Series(texts, dtype=object)
+    codes, uniques = pd.factorize(texts)
+    cleaned = (
+        pd.Series(uniques, dtype=object)
+        .astype(str)
+        .str.lower()
+        .str.translate(_QUOTES)
+        .str.normalize("NFKD")
+        .str.encode("ascii", "ignore")
+        .str.decode("ascii")
+        .str.replace(r"[^\w\s']", " ", regex=True)
+        # Apostrophes isolées ou en bord de mot
+        .str.replace(r"(?<!\w)'+|'+(?!\w)", " ", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+        .to_numpy()
+    )
+    return pd.Series(np.append(cleaned, "")[codes], index=texts.index, dtype=object)
+
+
+def clean_text(text):
+    """
+    Nettoie une seule réponse (même normalisation que clean_texts), sans
+    passer par pandas : utilisé pour les requêtes de recherche.
+    """
+    if pd.isna(text):
+        return ""
+    text = unicodedata.normalize("NFKD", str(text).lower().translate(_QUOTES))
+    text = text.encode("ascii", "ignore").decode("ascii")
+    text = re.sub(r"[^\w\s']", " ", text)
+    text = re.sub(r"(?<!\w)'+|'+(?!\w)", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def fold_text(text):
+    """
+    Normalise text caractère par caractère comme clean_texts, sans réduire les
+    espaces, et retourne (texte normalisé, position dans text de chaque
+    caractère obtenu) pour reporter une correspondance sur le texte d'origine.
+    """
+    folded, origin = [], []
+    for i, char in enumerate(text):
+        char = unicodedata.normalize("NFKD", char.lower().translate(_QUOTES))
+        char = char.encode("ascii", "ignore").decode("ascii")
+        for c in re.sub(r"[^\w\s']", " ", char):
+            folded.append(c)
+            origin.append(i)
+    return "".join(folded), origin
+
+
+class TextAnalyzer:
+    """
+    Fréquences de termes d'une colonne de réponses libres.
+
+    Le CountVectorizer est ajusté une fois sur les réponses distinctes ; la
+    matrice réponses distinctes x termes est conservée, si bien que les
+    fréquences d'un état des filtres se réduisent à un produit par le nombre
+    de lignes retenues de chaque réponse distincte.
+    Remplace AnalyseurTexte du notebook.
+    """
+
+    def __init__(
+        self,
+        texts,
+        min_df=2,
+        max_features=200,
+        ngram_range=(1, 2),
+        use_nltk=True,
+        version=None,
+    ):
+        texts = pd.Series(texts, dtype=object)
+        self.n_rows = len(texts)
+        self.version = version
+        self.cleaned = clean_texts(texts).to_numpy()
+        raw = texts.fillna("").astype(str)
+        self._lengths = raw.str.len().to_numpy()
+        self._n_words = raw.str.count(r"\S+").to_numpy()
+        # Réponses distinctes, pondérées par leur nombre de lignes
+        self._codes, documents = pd.factorize(self.cleaned)
+        weights = np.bincount(self._codes, minlength=len(documents))
+
+        words = stopwords(use_nltk)
+        vectorizer = CountVectorizer(
+            ngram_range=ngram_range,
+            stop_words=sorted(words),
+            token_pattern=TOKEN_PATTERN,
+        )
+        try:
+            matrix = vectorizer.fit_transform(documents).tocsc()
+            terms = vectorizer.get_feature_names_out()
+        except ValueError:
+            # Aucun terme retenu (colonne vide ou trop peu de réponses)
+            matrix, terms = None, np.array([], dtype=object)
+
+        selected = np.arange(len(terms))
+        if matrix is not None:
+            # min_df et max_features comptés sur les lignes, comme le ferait
+            # CountVectorizer sur toutes les réponses
+            if isinstance(min_df, float):
+                min_df = min_df * self.n_rows
+            document_frequency = (matrix > 0).T @ weights
+            selected = np.flatnonzero(document_frequency >= min_df)
+            if max_features is not None:
+                term_frequency = (matrix.T @ weights)[selected]
+                # Même tri que CountVectorizer, ex aequo compris
+                order = (-term_frequency).argsort()
+                selected = np.sort(selected[order[:max_features]])
+
+        # Termes d'au moins 3 lettres, sans mot vide dans les n-grammes
+        keep = np.array(
+            [
+                len(term) >= 3
+                and not any(word in words for word in term.split())
+                and all(len(word) >= 3 for word in term.split())
+                for term in terms[selected]
+            ],
+            dtype=bool,
+        )
+        self.terms = pd.Index(terms[selected][keep], name="terme")
+        # Matrice réponses distinctes x termes
+        self._matrix = matrix[:, selected[keep]].tocsr() if matrix is not None else None
+
+    def _weights(self, rows):
+        """
+        Nombre de lignes de rows (toutes si None) par réponse distincte.
+        """
+        codes = self._codes if rows is None else self._codes[rows]
+        return np.bincount(codes, minlength=self._matrix.shape[0])
+
+    def statistics(self, rows=None):
+        """
+        Statistiques descriptives des réponses des lignes rows (toutes si None).
+        """
+        lengths = self._lengths if rows is None else self._lengths[rows]
+        n_words = self._n_words if rows is None else self._n_words[rows]
+        return {
+            "nb_reponses": len(lengths),
+            "longueur_moyenne": float(lengths.mean()) if len(lengths) else 0.0,
+            "longueur_mediane": float(np.median(lengths)) if len(lengths) else 0.0,
+            "nb_mots_moyen": float(n_words.mean()) if len(n_words) else 0.0,
+            "reponses_vides": int((lengths == 0).sum()),
+        }
+
+    def term_frequencies(self, rows=None, min_count=1, n_top=None):
+        """
+        Fréquence de chaque terme dans les réponses des lignes rows, triée par
+        ordre décroissant ; seuls les termes vus au moins min_count fois.
+        """
+        if self._matrix is None or not len(self.terms):
+            return pd.Series([], index=self.terms, dtype=np.int64, name="frequence")
+        counts = (self._matrix.T @ self._weights(rows)).astype(np.int64)
+        frequencies = pd.Series(counts, index=self.terms, name="frequence")
+        frequencies = frequencies[frequencies >= min_count].sort_values(
+            ascending=False, kind="stable"
+        )
+        return frequencies if n_top is None else frequencies.iloc[:n_top]
+
+    def distinctive_terms(self, rows, reference=None, min_count=2, n_top=5):
+        """
+        Termes caractéristiques des lignes rows par rapport aux lignes
+        reference (toutes si None) : écart entre la part des réponses de rows
+        qui contiennent le terme et cette part dans reference.
+        """
+        if self._matrix is None or not len(self.terms) or not len(rows):
+            return pd.Series([], index=self.terms[:0], dtype=float, name="ecart")
+        present = (self._matrix > 0).T
+        inside = present @ self._weights(rows)
+        outside = present @ self._weights(reference)
+        n_reference = self.n_rows if reference is None else len(reference)
+        score = inside / len(rows) - outside / max(n_reference, 1)
+        scores = pd.Series(score, index=self.terms, name="ecart")
+        scores = scores[(inside >= min_count) & (score > 0)]
+        return scores.sort_values(ascending=False, kind="stable").iloc[:n_top]
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+# Colonnes de la table de résumé (une ligne par réponse regroupée)
+SUMMARY_COLUMNS = ["colonne", "ligne", "groupe", "distance", "variante", "termes"]
+
+
+def summary_table(engines):
+    """
+    Table de résumé des colonnes de texte libre, calculée à l'ingestion.
+
+    engines : {colonne: clustering.ClusterEngine}. Chaque colonne est regroupée
+    une fois sur toutes ses réponses ; la table garde, pour chaque réponse,
+    son groupe, sa distance au centre, sa variante (groupe de quasi-doublons)
+    et les termes caractéristiques du groupe.
+    """
+    parts = []
+    for column, engine in engines.items():
+        result = engine.cluster()
+        terms = result.clusters["termes"].to_numpy()
+        parts.append(
+            pd.DataFrame(
+                {
+                    "colonne": column,
+                    "ligne": result.rows.astype(np.int32),
+                    "groupe": result.labels.astype(np.int16),
+                    "distance": result.distances.astype(np.float32),
+                    "variante": result.variants.astype(np.int32),
+                    "termes": terms[result.labels] if len(terms) else "",
+                }
+            )
+        )
+    table = pd.concat(parts, ignore_index=True) if parts else None
+    if table is None:
+        table = pd.DataFrame(columns=SUMMARY_COLUMNS)
+    return table.astype({"colonne": "category", "termes": "category"})
+
+
+class TextSummaryIndex:
+    """
+    Résumés précalculés des réponses libres (groupes, citations
+    représentatives), restreints à l'état des filtres sans nouveau calcul.
+
+    Pour chaque colonne, les réponses sont triées une fois par groupe puis par
+    distance au centre : les citations d'un état des filtres sont les
+    premières réponses retenues de chaque groupe, une par variante.
+    """
+
+    def __init__(self, table, texts, version=None):
+        self.version = version
+        self.n_rows = len(texts)
+        self._columns = {}
+        for column, part in table.groupby("colonne", observed=True, sort=False):
+            part = part.sort_values(["groupe", "distance"], kind="stable")
+            rows = part["ligne"].to_numpy(dtype=np.int64)
+            raw = texts[column].to_numpy(dtype=object)[rows]
+            self._columns[column] = {
+                "rows": rows,
+                "groups": part["groupe"].to_numpy(dtype=np.int64),
+                "terms": part.groupby("groupe", sort=True)["termes"]
+                .first()
+                .astype(str),
+                "texts": raw,
+                "variants": part["variante"].to_numpy(),
+            }
+
+    def __contains__(self, column):
+        return column in self._columns
+
+    def summary(self, column, rows=None, n_examples=3):
+        """
+        Groupes d'une colonne pour les lignes rows (toutes si None) : nombre de
+        réponses retenues, part, termes caractéristiques et citations les plus
+        proches du centre (sans doublon), par taille décroissante.
+        """
+        columns = ["taille", "part", "termes", "exemples"]
+        if column not in self._columns:
+            return pd.DataFrame(columns=columns)
+        data = self._columns[column]
+        if rows is None:
+            keep = np.ones(len(data["rows"]), dtype=bool)
+        else:
+            mask = np.zeros(self.n_rows, dtype=bool)
+            mask[rows] = True
+            keep = mask[data["rows"]]
+        groups = data["groups"][keep]
+        texts = data["texts"][keep]
+        variants = data["variants"][keep]
+        sizes = np.bincount(groups, minlength=len(data["terms"]))
+        # Début de chaque groupe dans les réponses retenues (triées par groupe)
+        starts = np.concatenate([[0], np.cumsum(sizes)])
+
+        summary = []
+        for group in np.flatnonzero(sizes):
+            examples, seen = [], set()
+            for i in range(starts[group], starts[group + 1]):
+                if variants[i] not in seen:
+                    seen.add(variants[i])
+                    examples.append(str(texts[i]))
+                    if len(examples) == n_examples:
+                        break
+            summary.append(
+                {
+                    "taille": int(sizes[group]),
+                    "part": sizes[group] / len(groups),
+                    "termes": data["terms"].get(group, ""),
+                    "exemples": examples,
+                }
+            )
+        result = pd.DataFrame(summary, columns=columns).sort_values(
+            "taille", ascending=False, kind="stable"
+        )
+        result.index = pd.Index(
+            [f"Groupe {i + 1}" for i in range(len(result))], name="groupe"
+        )
+        return result
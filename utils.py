@@ -1,14 +1,296 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+
+from comparison import POPULATIONS
+from filters import filter_state_hash
+from intervals import CONFIDENCE, proportion_intervals
+from multi_answers import split_answers
+from profiler import profile
+
+
+class FigureCache:
+    """
+    Cache LRU de figures Plotly, partagé par toutes les sessions du processus.
+
+    Les figures retournées sont partagées : elles ne doivent pas être modifiées.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key, build):
+        """
+        Retourne la figure associée à key, ou la construit avec build().
+        """
+        if key is None:
+            return build()
+        with self._lock:
+            if key in self._figures:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return self._figures[key]
+            self.misses += 1
+
+        fig = build()
+        with self._lock:
+            self._figures[key] = fig
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.maxsize:
+                self._figures.popitem(last=False)
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Compteurs du cache (succès, échecs, taille).
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._figures),
+                "maxsize": self.maxsize,
+            }
+
+
+FIGURE_CACHE = FigureCache()
+
+
+def figure_cache_key(df, rows, *params, aggregate=None):
+    """
+    Clé de cache d'une figure : (version des données, filtres, paramètres du graphique).
+
+    Retourne None (pas de cache) si les données ne portent pas de version
+    (df.attrs["version"], renseigné par data_loader).
+    """
+    if aggregate is not None:
+        version, filter_key = aggregate.version, aggregate.filter_key
+    else:
+        version = df.attrs.get("version")
+        if rows is None and not isinstance(df.index, pd.RangeIndex):
+            rows = df.index.to_numpy()
+        filter_key = filter_state_hash(rows, len(df))
+    if version is None:
+        return None
+    return (version, filter_key) + params
+
+
+def count_values(df, column_name, rows=None, aggregate=None):
+    """
+    Compte les modalités d'une colonne, restreintes aux positions rows (toutes si None).
+
+    aggregate : AggregateCounts déjà calculé pour l'état des filtres (prioritaire).
+    """
+    if aggregate is not None and column_name in aggregate:
+        return aggregate.counts(column_name)
+    column = df[column_name]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        codes = column.cat.codes.to_numpy()
+        if rows is not None:
+            codes = codes[rows]
+        counts = np.bincount(codes[codes >= 0], minlength=len(column.cat.categories))
+        value_counts = pd.Series(counts, index=column.cat.categories, name="count")
+        value_counts = value_counts.sort_values(ascending=False, kind="stable")
+    else:
+        if rows is not None:
+            column = column.iloc[rows]
+        value_counts = column.value_counts()
+    # Les colonnes catégorielles listent aussi les modalités absentes du filtre
+    return value_counts[value_counts > 0]
+
+
+def count_multi_answers(
+    df, column_name, separator=",", answers=None, rows=None, aggregate=None
+):
+    """
+    Compte les options d'une question à réponses multiples pour les lignes de df
+    (ou ses positions rows). L'index answers porte sur les mêmes lignes que df :
+    rows sont des positions, jamais des étiquettes d'index.
+    """
+    if aggregate is not None and column_name in aggregate:
+        return aggregate.counts(column_name)
+    if answers is not None and column_name in answers:
+        return answers.counts(column_name, rows)
+    column = df[column_name] if rows is None else df[column_name].iloc[rows]
+    return split_answers(column, separator).value_counts()
+
+
+def _format_percent(value):
+    return f"{value:.1f}".replace(".", ",")
+
+
+def join_labels(labels):
+    """
+    Énumération française : « a », « a et b », « a, b et c ».
+    """
+    labels = list(labels)
+    if len(labels) < 2:
+        return "".join(labels)
+    return f"{', '.join(labels[:-1])} et {labels[-1]}"
+
+
+def format_share(value_counts, options, intervals=None):
+    """
+    Part cumulée des modalités options dans value_counts, mise en forme pour les
+    commentaires : « 38,3 % », suivie de son intervalle de confiance
+    « [35,4 ; 41,3] » si intervals vaut "wilson" ou "bootstrap".
+
+    Pour une question à réponses multiples, la part et son intervalle portent
+    sur les sélections, comme l'intervalle de Wilson des graphiques.
+    """
+    total = int(value_counts.sum())
+    if total == 0:
+        return "– %"
+    count = int(value_counts.reindex(list(options)).fillna(0).sum())
+    text = f"{_format_percent(count / total * 100)} %"
+    if intervals is None:
+        return text
+    ci = proportion_intervals(pd.Series([count, total - count]), intervals) * 100
+    low, high = ci.iloc[0]
+    return f"{text} [{_format_percent(low)} ; {_format_percent(high)}]"
+
+
+def _is_ordered(df, column_name):
+    return (
+        column_name in df.columns
+        and isinstance(df[column_name].dtype, pd.CategoricalDtype)
+        and df[column_name].cat.ordered
+    )
+
+
+def _interval_percent(value_counts, intervals, answers=None, rows=None):
+    """
+    Bornes (en %) des intervalles de confiance des parts affichées, ou None.
+    """
+    if intervals is None or not len(value_counts):
+        return None
+    return proportion_intervals(value_counts, intervals, answers, rows) * 100
+
+
+def _interval_hover(first):
+    """
+    Ligne d'infobulle de l'intervalle, lu dans customdata[first] et [first + 1].
+    """
+    return (
+        f"<br>IC {CONFIDENCE:.0%} : [%{{customdata[{first}]:.1f}} % ; "
+        f"%{{customdata[{first + 1}]:.1f}} %]"
+    )
+
+
+def _add_pie_intervals(fig, ci):
+    """
+    Ajoute les intervalles de confiance à l'infobulle des secteurs.
+    """
+    if ci is None:
+        return
+    fig.update_traces(
+        customdata=ci.to_numpy(),
+        hovertemplate="<b>%{label}</b><br>Nombre: %{value}<br>Pourcentage: %{percent}"
+        + _interval_hover(0)
+        + "<extra></extra>",
+    )
+
+
+def _add_bar_intervals(fig, ci, total):
+    """
+    Ajoute les intervalles de confiance en barres d'erreur (en nombre de
+    réponses) et dans l'infobulle ; une trace par modalité (px.bar, color).
+    """
+    if ci is None:
+        return
+    bounds = {str(label): row for label, row in zip(ci.index, ci.to_numpy())}
+    for trace in fig.data:
+        low, high = bounds[str(trace.name)]
+        count = trace.y[0]
+        trace.error_y = dict(
+            type="data",
+            array=[high * total / 100 - count],
+            arrayminus=[count - low * total / 100],
+        )
+        trace.customdata = np.column_stack(
+            [trace.customdata, [[low, high]] * len(trace.y)]
+        )
+        trace.hovertemplate = trace.hovertemplate.replace(
+            "<extra>", _interval_hover(1) + "<extra>"
+        )
 
 
 def create_pie_chart(
-    df, column_name, title=None, color_scheme="Set2", height=500, chart_type="pie"
+    df,
+    column_name,
+    title=None,
+    color_scheme="Set2",
+    height=500,
+    chart_type="pie",
+    rows=None,
+    aggregate=None,
+    intervals=None,
 ):
     """
     Crée un diagramme circulaire ou en barres pour une variable donnée (sans split).
+
+    rows : positions des lignes retenues par les filtres (toutes si None).
+    aggregate : comptages déjà agrégés pour l'état des filtres (aggregation).
+    intervals : intervalles de confiance des parts ("wilson", "bootstrap" ou
+    None), en barres d'erreur ou dans l'infobulle des secteurs.
+    La figure est servie depuis FIGURE_CACHE pour un même état des filtres.
     """
-    value_counts = df[column_name].value_counts()
+    key = figure_cache_key(
+        df,
+        rows,
+        "pie",
+        column_name,
+        chart_type,
+        color_scheme,
+        title,
+        height,
+        intervals,
+        aggregate=aggregate,
+    )
+    with profile("figure", column_name):
+        return FIGURE_CACHE.get_or_create(
+            key,
+            lambda: _build_pie_chart(
+                df,
+                column_name,
+                title,
+                color_scheme,
+                height,
+                chart_type,
+                rows,
+                aggregate,
+                intervals,
+            ),
+        )
+
+
+def _build_pie_chart(
+    df, column_name, title, color_scheme, height, chart_type, rows, aggregate, intervals
+):
+    value_counts = count_values(df, column_name, rows, aggregate)
+    ordered = _is_ordered(df, column_name)
+    if ordered:
+        # Échelle ordinale : modalités dans l'ordre de l'échelle
+        categories = df[column_name].cat.categories
+        value_counts = value_counts.reindex(
+            categories[categories.isin(value_counts.index)]
+        )
+
+    ci = _interval_percent(value_counts, intervals)
 
     if title is None:
         title = f"Répartition par {column_name.replace('_', ' ').lower()}"
@@ -26,7 +308,9 @@ def create_pie_chart(
             textposition="inside",
             textinfo="percent+label",
             hovertemplate="<b>%{label}</b><br>Nombre: %{value}<br>Pourcentage: %{percent}<extra></extra>",
+            sort=not ordered,
         )
+        _add_pie_intervals(fig, ci)
 
         fig.update_layout(
             showlegend=True,
@@ -63,6 +347,7 @@ def create_pie_chart(
             textposition="outside",
             hovertemplate="<b>%{x}</b><br>Nombre: %{y}<br>Pourcentage: %{customdata[0]:.1f}%<extra></extra>",
         )
+        _add_bar_intervals(fig, ci, total)
 
         fig.update_layout(
             showlegend=False,
@@ -84,16 +369,73 @@ def create_pie_chart_split(
     height=500,
     separator=",",
     chart_type="pie",
+    answers=None,
+    rows=None,
+    aggregate=None,
+    intervals=None,
 ):
     """
     Crée un diagramme pour une variable avec réponses multiples séparées.
+
+    answers : MultiAnswerIndex déjà éclaté (data_loader.load_multi_answers) ;
+    les comptages sont alors restreints aux lignes de df sans retraiter le texte.
+    rows : positions des lignes retenues par les filtres (toutes si None).
+    aggregate : comptages déjà agrégés pour l'état des filtres (aggregation).
+    intervals : comme pour create_pie_chart ; le bootstrap rééchantillonne
+    les répondants via answers.
+    La figure est servie depuis FIGURE_CACHE pour un même état des filtres.
     """
-    values_list = []
-    for value in df[column_name].dropna():
-        split_values = [val.strip() for val in str(value).split(separator)]
-        values_list.extend(split_values)
+    key = figure_cache_key(
+        df,
+        rows,
+        "split",
+        column_name,
+        chart_type,
+        color_scheme,
+        title,
+        height,
+        separator,
+        answers is not None,
+        intervals,
+        aggregate=aggregate,
+    )
+    with profile("figure", column_name):
+        return FIGURE_CACHE.get_or_create(
+            key,
+            lambda: _build_pie_chart_split(
+                df,
+                column_name,
+                title,
+                color_scheme,
+                height,
+                separator,
+                chart_type,
+                answers,
+                rows,
+                aggregate,
+                intervals,
+            ),
+        )
+
 
-    value_counts = pd.Series(values_list).value_counts()
+def _build_pie_chart_split(
+    df,
+    column_name,
+    title,
+    color_scheme,
+    height,
+    separator,
+    chart_type,
+    answers,
+    rows,
+    aggregate,
+    intervals,
+):
+    value_counts = count_multi_answers(
+        df, column_name, separator, answers, rows, aggregate
+    )
+    total = value_counts.values.sum()
+    ci = _interval_percent(value_counts, intervals, answers, rows)
 
     if title is None:
         title = f"Répartition par {column_name.replace('_', ' ').lower()} (réponses multiples)"
@@ -112,6 +454,7 @@ def create_pie_chart_split(
             textinfo="percent+label",
             hovertemplate="<b>%{label}</b><br>Nombre: %{value}<br>Pourcentage: %{percent}<extra></extra>",
         )
+        _add_pie_intervals(fig, ci)
 
         fig.update_layout(
             showlegend=True,
@@ -125,7 +468,7 @@ def create_pie_chart_split(
             {
                 "Catégorie": value_counts.index,
                 "Nombre": value_counts.values,
-                "Pourcentage": (value_counts.values / len(values_list) * 100).round(1),
+                "Pourcentage": (value_counts.values / total * 100).round(1),
             }
         )
 
@@ -145,6 +488,7 @@ def create_pie_chart_split(
             textposition="outside",
             hovertemplate="<b>%{x}</b><br>Nombre: %{y}<br>Pourcentage: %{customdata[0]:.1f}%<extra></extra>",
         )
+        _add_bar_intervals(fig, ci, total)
 
         fig.update_layout(
             showlegend=False,
@@ -156,7 +500,7 @@ def create_pie_chart_split(
         )
 
         fig.add_annotation(
-            text=f"Total: {len(values_list)} réponses (multiples possibles)",
+            text=f"Total: {total} réponses (multiples possibles)",
             xref="paper",
             yref="paper",
             x=0,
@@ -166,3 +510,188 @@ def create_pie_chart_split(
         )
 
     return fig
+
+
+def create_likert_chart(scales, aggregate, questions=None, title=None, labels=None):
+    """
+    Barres empilées divergentes : une ligne par échelle de Likert.
+
+    Les niveaux bas partent vers la gauche, les niveaux hauts vers la droite,
+    le niveau central (échelle impaire) est partagé de part et d'autre de 0.
+    Les parts sont calculées sur les réponses de l'échelle (hors exclues).
+    labels : libellés des lignes {question: libellé}.
+    """
+    questions = scales.questions if questions is None else list(questions)
+    labels = labels or {}
+    key = figure_cache_key(
+        None,
+        None,
+        "likert",
+        tuple(questions),
+        title,
+        tuple(sorted(labels.items())),
+        aggregate=aggregate,
+    )
+    with profile("figure", "likert"):
+        return FIGURE_CACHE.get_or_create(
+            key,
+            lambda: _build_likert_chart(scales, aggregate, questions, title, labels),
+        )
+
+
+def _build_likert_chart(scales, aggregate, questions, title, labels):
+    counts = scales.level_counts(aggregate, questions)
+    n = counts.sum(axis=1, keepdims=True)
+    shares = np.divide(counts * 100.0, n, out=np.zeros(counts.shape), where=n > 0)
+    rows = [labels.get(q, q.replace("_", " ")) for q in questions]
+    n_levels = np.array([len(scales.levels(q)) for q in questions])
+
+    # Segments (niveau, côté, fraction) ajoutés du centre vers l'extérieur
+    segments = []
+    for rank in range(scales.width):
+        is_middle = (n_levels % 2 == 1) & (rank == n_levels // 2)
+        is_low = rank < n_levels // 2
+        is_high = (rank >= (n_levels + 1) // 2) & (rank < n_levels)
+        segments.append((rank, -1, np.where(is_low, 1.0, np.where(is_middle, 0.5, 0))))
+        segments.append((rank, 1, np.where(is_high, 1.0, np.where(is_middle, 0.5, 0))))
+    negative = sorted((s for s in segments if s[1] < 0), key=lambda s: -s[0])
+    positive = sorted((s for s in segments if s[1] > 0), key=lambda s: s[0])
+
+    fig = go.Figure()
+    for rank, side, fraction in negative + positive:
+        if not fraction.any():
+            continue
+        position = np.clip(rank / np.maximum(n_levels - 1, 1), 0, 1)
+        fig.add_trace(
+            go.Bar(
+                y=rows,
+                x=side * shares[:, rank] * fraction,
+                orientation="h",
+                marker_color=px.colors.sample_colorscale("RdYlBu", list(position)),
+                customdata=np.column_stack(
+                    [
+                        [
+                            scales.levels(q)[rank] if rank < k else ""
+                            for q, k in zip(questions, n_levels)
+                        ],
+                        shares[:, rank].round(1),
+                        counts[:, rank],
+                    ]
+                ),
+                hovertemplate="<b>%{y}</b><br>%{customdata[0]}<br>%{customdata[1]}% (%{customdata[2]})<extra></extra>",
+                showlegend=False,
+            )
+        )
+
+    fig.update_layout(
+        barmode="relative",
+        title=title,
+        xaxis=dict(title="Part des réponses (%)", range=[-100, 100], ticksuffix="%"),
+        yaxis=dict(autorange="reversed"),
+        height=120 + 45 * len(questions),
+        margin=dict(l=200),
+    )
+    fig.add_vline(x=0, line_width=1, line_color="grey")
+    return fig
+
+
+def create_comparison_chart(comparison, aggregates, question, title=None, height=400):
+    """
+    Barres horizontales appariées : part de chaque modalité commune d'une
+    question pour chaque population (comparison.PopulationComparison).
+
+    aggregates : {population: AggregateCounts}, chacun pour ses filtres.
+    """
+    key = tuple(
+        (aggregate.version, aggregate.filter_key) for aggregate in aggregates.values()
+    )
+    if any(version is None for version, _ in key):
+        key = None
+    else:
+        key += ("comparison", question, title, height)
+    with profile("figure", question):
+        return FIGURE_CACHE.get_or_create(
+            key,
+            lambda: _build_comparison_chart(
+                comparison, aggregates, question, title, height
+            ),
+        )
+
+
+def _build_comparison_chart(comparison, aggregates, question, title, height):
+    result = comparison.compare(aggregates)
+    result = result[result["question"] == question]
+    if title is None:
+        title = comparison.questions[question]["title"]
+
+    fig = go.Figure()
+    for population, colour in zip(comparison.populations, px.colors.qualitative.Set2):
+        part = result[result["population"] == population]
+        fig.add_trace(
+            go.Bar(
+                y=part["groupe"],
+                x=(part["share"] * 100).round(1),
+                name=f"{POPULATIONS.get(population, population)} "
+                f"(n={aggregates[population].n_respondents})",
+                orientation="h",
+                marker_color=colour,
+                customdata=part["count"],
+                text=(part["share"] * 100).round(1).astype(str) + "%",
+                textposition="outside",
+                hovertemplate="<b>%{y}</b><br>%{x}% (%{customdata})<extra></extra>",
+            )
+        )
+
+    fig.update_layout(
+        barmode="group",
+        title=title,
+        xaxis=dict(title="Part des réponses comparées (%)", range=[0, 110]),
+        yaxis=dict(autorange="reversed"),
+        legend=dict(orientation="h", yanchor="bottom", y=-0.3, x=0),
+        height=height,
+        margin=dict(l=200),
+    )
+    return fig
+
+
+def create_term_chart(analyzer, rows=None, title=None, n_top=20, height=500):
+    """
+    Barres horizontales des termes les plus fréquents d'une colonne de texte
+    libre (text_analysis.TextAnalyzer), restreints aux positions rows.
+    """
+    key = None
+    if analyzer.version is not None:
+        key = (
+            analyzer.version,
+            filter_state_hash(rows, analyzer.n_rows),
+            "terms",
+            title,
+            n_top,
+            height,
+        )
+    with profile("figure", title):
+        return FIGURE_CACHE.get_or_create(
+            key, lambda: _build_term_chart(analyzer, rows, title, n_top, height)
+        )
+
+
+def _build_term_chart(analyzer, rows, title, n_top, height):
+    frequencies = analyzer.term_frequencies(rows, n_top=n_top)
+    df_plot = pd.DataFrame(
+        {"Terme": frequencies.index.astype(str), "Fréquence": frequencies.values}
+    )
+    fig = px.bar(
+        df_plot,
+        x="Fréquence",
+        y="Terme",
+        orientation="h",
+        title=title,
+        color_discrete_sequence=px.colors.qualitative.Set2,
+    )
+    fig.update_traces(hovertemplate="<b>%{y}</b><br>Fréquence: %{x}<extra></extra>")
+    fig.update_layout(
+        yaxis=dict(autorange="reversed"),
+        height=height,
+        margin=dict(l=200),
+    )
+    return fig
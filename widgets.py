@@ -0,0 +1,305 @@
+import re
+
+import pydeck as pdk
+import streamlit as st
+
+from profiler import profile, profiling
+from search import highlight
+from utils import create_pie_chart, create_pie_chart_split, create_term_chart
+
+
+def show_figure(fig):
+    """
+    Envoie une figure Plotly au navigateur (st.plotly_chart), en mesurant la
+    sérialisation et la taille de la figure lorsque le profilage est actif.
+    """
+    with profile("serialization", fig.layout.title.text) as record:
+        if profiling():
+            record["bytes"] = len(fig.to_json())
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def show_map(points, max_radius=40, zoom=7):
+    """
+    Carte à bulles (pydeck) : une bulle par point, rayon proportionnel au nombre
+    de réponses. points : colonnes latitude, longitude, count et label.
+    """
+    max_count = max(int(points["count"].max()), 1) if len(points) else 1
+    deck = pdk.Deck(
+        layers=[
+            pdk.Layer(
+                "ScatterplotLayer",
+                data=points,
+                get_position=["longitude", "latitude"],
+                get_radius="count",
+                radius_units="pixels",
+                radius_scale=max_radius / max_count,
+                radius_min_pixels=4,
+                get_fill_color=[31, 119, 180, 160],
+                pickable=True,
+            )
+        ],
+        initial_view_state=pdk.ViewState(
+            latitude=points["latitude"].mean() if len(points) else 47.4,
+            longitude=points["longitude"].mean() if len(points) else 1.7,
+            zoom=zoom,
+        ),
+        tooltip={"text": "{label}\n{count} réponse(s)"},
+    )
+    with profile("serialization", "Carte") as record:
+        if profiling():
+            record["bytes"] = len(deck.to_json())
+        st.pydeck_chart(deck, use_container_width=True)
+
+
+@st.fragment
+def chart_with_toggle(
+    df,
+    column_name,
+    title=None,
+    bar=False,
+    key=None,
+    split=False,
+    rows=None,
+    answers=None,
+    aggregate=None,
+    **chart_kwargs,
+):
+    """
+    Affiche un graphique et son interrupteur barre / secteurs dans un fragment.
+
+    Basculer l'interrupteur ne relance que ce fragment : une seule figure est
+    reconstruite, sans réexécuter le chargement, les filtres ni les autres
+    graphiques de la page.
+
+    bar : valeur initiale de l'interrupteur « Diagramme en barre ».
+    split : question à réponses multiples (create_pie_chart_split).
+    """
+    bar = st.toggle("Diagramme en barre", value=bar, key=key or f"bar_{column_name}")
+    chart_type = "bar" if bar else "pie"
+    if split:
+        fig = create_pie_chart_split(
+            df,
+            column_name,
+            title,
+            chart_type=chart_type,
+            answers=answers,
+            rows=rows,
+            aggregate=aggregate,
+            **chart_kwargs,
+        )
+    else:
+        fig = create_pie_chart(
+            df,
+            column_name,
+            title,
+            chart_type=chart_type,
+            rows=rows,
+            aggregate=aggregate,
+            **chart_kwargs,
+        )
+    show_figure(fig)
+
+
+def significance_panel(filters, selections, cube, scan, key):
+    """
+    Compare deux groupes définis sur une dimension de la barre latérale et
+    teste toutes les questions d'un coup (significance.SignificanceScan).
+
+    Les deux groupes restent restreints aux autres filtres de la barre latérale.
+    """
+    column = st.selectbox("Dimension", filters.columns, key=f"{key}_dimension")
+    others = {c: values for c, values in selections.items() if c != column}
+    available = filters.values(column, others)
+    available = [v for v in available if v in selections.get(column, available)]
+    col1, col2 = st.columns(2)
+    with col1:
+        group_a = st.multiselect("Groupe A", available, key=f"{key}_a")
+    with col2:
+        group_b = st.multiselect(
+            "Groupe B",
+            [v for v in available if v not in group_a],
+            key=f"{key}_b",
+        )
+    if not group_a or not group_b:
+        st.info("Choisissez au moins une valeur pour chaque groupe.")
+        return
+
+    with profile("significance", column):
+        result = scan.scan(
+            cube.query(dict(selections, **{column: group_a})),
+            cube.query(dict(selections, **{column: group_b})),
+            exclude=[column],
+        )
+    st.dataframe(
+        result,
+        column_config={
+            "option": st.column_config.TextColumn("Option"),
+            "test": st.column_config.TextColumn("Test"),
+            "n_a": st.column_config.NumberColumn("Réponses A"),
+            "n_b": st.column_config.NumberColumn("Réponses B"),
+            "statistique": st.column_config.NumberColumn("Statistique", format="%.2f"),
+            "ddl": st.column_config.NumberColumn("ddl"),
+            "p": st.column_config.NumberColumn("p", format="%.4f"),
+            "p_ajustee": st.column_config.NumberColumn("p ajustée", format="%.4f"),
+            "v_cramer": st.column_config.NumberColumn("V de Cramér", format="%.2f"),
+            "significatif": st.column_config.CheckboxColumn("Significatif"),
+        },
+        use_container_width=True,
+    )
+    st.caption(
+        "Questions classées par taille d'effet (V de Cramér). Khi-deux, ou test "
+        "exact de Fisher pour les tableaux 2 x 2 à faibles effectifs ; p-valeurs "
+        "ajustées par Benjamini-Hochberg (seuil 5 %). Réponses multiples "
+        "testées option par option (répondants qui l'ont cochée ou non)."
+    )
+
+
+def show_term_frequencies(analyzer, rows=None, title=None, n_top=20):
+    """
+    Statistiques et termes les plus fréquents d'une colonne de texte libre,
+    pour les lignes retenues par les filtres.
+    """
+    stats = analyzer.statistics(rows)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Réponses non vides", stats["nb_reponses"] - stats["reponses_vides"])
+    col2.metric("Longueur moyenne", f"{stats['longueur_moyenne']:.0f} car.")
+    col3.metric("Mots par réponse", f"{stats['nb_mots_moyen']:.1f}")
+    show_figure(create_term_chart(analyzer, rows, title, n_top))
+
+
+def _cluster_table(clusters):
+    """
+    Tableau des groupes de réponses (taille, part, termes, exemples).
+    """
+    st.dataframe(
+        clusters,
+        column_config={
+            "taille": st.column_config.NumberColumn("Réponses"),
+            "part": st.column_config.ProgressColumn(
+                "Part", format="percent", min_value=0, max_value=1
+            ),
+            "termes": st.column_config.TextColumn("Termes caractéristiques"),
+            "exemples": st.column_config.ListColumn("Réponses représentatives"),
+        },
+        use_container_width=True,
+    )
+
+
+def show_clusters(engine, rows=None, key="groupes"):
+    """
+    Groupes de réponses libres proches (clustering.ClusterEngine) pour les
+    lignes retenues par les filtres, avec termes caractéristiques et exemples.
+    """
+    choice = st.selectbox(
+        "Nombre de groupes",
+        ["Automatique", *engine.k_range],
+        key=f"{key}_k",
+    )
+    k = None if choice == "Automatique" else choice
+    with profile("clustering", key), st.spinner("Regroupement des réponses..."):
+        result = engine.cluster(rows, k=k)
+    if result.clusters.empty:
+        st.info("Pas assez de réponses pour former des groupes.")
+        return
+    _cluster_table(result.clusters)
+    if len(result.scores):
+        st.caption(
+            f"{result.k} groupes (silhouette {result.scores.max():.2f}). Exemples : "
+            "réponses les plus proches du centre de chaque groupe."
+        )
+
+
+def show_comment(text, counts):
+    """
+    Affiche le commentaire (Markdown) d'un graphique, ou un message si les
+    filtres ne retiennent aucune réponse à la question commentée.
+    """
+    if not counts.sum():
+        st.info("Aucune réponse pour ces filtres.")
+        return
+    st.markdown(text)
+
+
+def show_duplicates(duplicates, rows=None, n_top=10):
+    """
+    Réponses les plus fréquentes des lignes retenues, variantes quasi
+    identiques regroupées (near_duplicates.NearDuplicates).
+    """
+    with profile("near_duplicates"):
+        summary = duplicates.summary(rows, n_top=n_top)
+    if summary.empty:
+        st.info("Aucune réponse pour ces filtres.")
+        return
+    st.dataframe(
+        summary,
+        column_config={
+            "representant": st.column_config.TextColumn("Réponse"),
+            "taille": st.column_config.NumberColumn("Réponses"),
+            "variantes": st.column_config.NumberColumn("Variantes"),
+        },
+        hide_index=True,
+        use_container_width=True,
+    )
+
+
+def show_text_summary(index, column, rows=None, title=None, n_examples=3):
+    """
+    Groupes précalculés des réponses libres d'une colonne
+    (text_summary.TextSummaryIndex), restreints aux lignes retenues.
+    """
+    with profile("text_summary", column):
+        summary = index.summary(column, rows, n_examples=n_examples)
+    if summary.empty:
+        st.info(f"{title or column} : aucune réponse pour ces filtres.")
+        return
+    st.write(f"'{title or column}' : {len(summary)} groupes de réponses")
+    _cluster_table(summary)
+
+
+def _escape_markdown(text):
+    """
+    Échappe les caractères interprétés par le Markdown de Streamlit.
+    """
+    return re.sub(r"([\\`*_{}\[\]()#+\-.!|~<>$:])", r"\\\1", text).replace("\n", " ")
+
+
+def search_panel(index, questions, rows=None, key="recherche", limit=50):
+    """
+    Recherche plein texte (search.SearchIndex) dans les réponses libres des
+    lignes retenues par les filtres, correspondances surlignées.
+    """
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        query = st.text_input(
+            "Rechercher dans les réponses",
+            key=f"{key}_requete",
+            help='Mots combinés par ET ; "expression exacte" ; préfixe*.',
+        )
+    with col2:
+        scope = st.selectbox(
+            "Questions",
+            [None, *questions],
+            format_func=lambda column: (
+                "Toutes" if column is None else questions[column]
+            ),
+            key=f"{key}_questions",
+        )
+    if not query:
+        return
+    with profile("search", query):
+        hits = index.search(query, None if scope is None else [scope], rows)
+    st.caption(f"{len(hits)} réponses trouvées")
+    lines = [
+        f"- *{_escape_markdown(questions.get(column, column))}* : "
+        + highlight(
+            index.text(column, row),
+            query,
+            mark=(":orange-background[", "]"),
+            escape=_escape_markdown,
+        )
+        for column, row in hits.iloc[:limit].itertuples(index=False)
+    ]
+    st.markdown("\n".join(lines))
+    if len(hits) > limit:
+        st.caption(f"{limit} premières réponses affichées.")